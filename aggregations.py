@@ -0,0 +1,357 @@
+"""
+Однопроходные агрегаты над выходом генераторов
+"""
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+import random
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from generators import GeneratorException
+
+
+class Reducer(ABC):
+    """
+    Потоковый агрегат: add по одному элементу, merge с агрегатом соседнего шарда.
+
+    Память агрегата ограничена и не зависит от длины входа. merge(other)
+    считает, что элементы other идут после элементов self, поэтому
+    агрегаты шардов объединяются в порядке шардов. Подкласс без add, merge
+    или result нельзя создать (TypeError при создании, а не посреди потока).
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def add(self, item: Any) -> None:
+        """Добавление одного элемента"""
+
+    @abstractmethod
+    def merge(self, other: "Reducer") -> "Reducer":
+        """Объединение с агрегатом следующего шарда (возвращает self)"""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Текущее значение агрегата"""
+
+    def update(self, iterable: Iterable) -> "Reducer":
+        """Добавление всех элементов итератора"""
+        add = self.add
+        for item in iterable:
+            add(item)
+        return self
+
+    def _check_merge(self, other: "Reducer") -> None:
+        if type(other) is not type(self):
+            raise GeneratorException(f"Нельзя объединить {type(self).__name__} и {type(other).__name__}")
+
+
+class Count(Reducer):
+    """Число элементов"""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, item: Any) -> None:
+        self.count += 1
+
+    def update(self, iterable: Iterable) -> "Count":
+        self.count += sum(1 for _ in iterable)
+        return self
+
+    def merge(self, other: "Count") -> "Count":
+        self._check_merge(other)
+        self.count += other.count
+        return self
+
+    def result(self) -> int:
+        return self.count
+
+
+class FirstK(Reducer):
+    """Первые k элементов"""
+
+    __slots__ = ("k", "items")
+
+    def __init__(self, k: int):
+        if k < 0:
+            raise GeneratorException("k не может быть отрицательным")
+        self.k = k
+        self.items: List[Any] = []
+
+    def add(self, item: Any) -> None:
+        if len(self.items) < self.k:
+            self.items.append(item)
+
+    def merge(self, other: "FirstK") -> "FirstK":
+        self._check_merge(other)
+        self.items.extend(other.items[:self.k - len(self.items)])
+        return self
+
+    def result(self) -> List[Any]:
+        return list(self.items)
+
+
+class TopK(Reducer):
+    """
+    k наибольших элементов по ключу (при равенстве — раньше встретившиеся).
+
+    Хранится куча из k элементов: O(log k) на элемент.
+    """
+
+    __slots__ = ("k", "key", "_heap", "_seen")
+
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None):
+        if k < 0:
+            raise GeneratorException("k не может быть отрицательным")
+        self.k = k
+        self.key = key
+        self._heap: list = []
+        self._seen = 0
+
+    def add(self, item: Any) -> None:
+        value = self.key(item) if self.key is not None else item
+        entry = (value, -self._seen, item)
+        self._seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopK") -> "TopK":
+        self._check_merge(other)
+        offset = self._seen
+        shifted = [(value, order - offset, item) for value, order, item in other._heap]
+        self._heap = heapq.nlargest(self.k, self._heap + shifted, key=lambda e: e[:2])
+        heapq.heapify(self._heap)
+        self._seen += other._seen
+        return self
+
+    def result(self) -> List[Any]:
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class Summary(Reducer):
+    """
+    Число, минимум, максимум, среднее и дисперсия значений key(item).
+
+    Среднее и дисперсия считаются по Уэлфорду, объединение шардов —
+    по формуле Чана, без хранения значений.
+    """
+
+    __slots__ = ("key", "count", "min", "max", "mean", "_m2")
+
+    def __init__(self, key: Optional[Callable[[Any], float]] = None):
+        self.key = key
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, item: Any) -> None:
+        value = self.key(item) if self.key is not None else item
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "Summary") -> "Summary":
+        self._check_merge(other)
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    def result(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0, "min": None, "max": None, "mean": None, "std": None}
+        return {"count": self.count, "min": self.min, "max": self.max,
+                "mean": self.mean, "std": math.sqrt(self.variance)}
+
+
+class Histogram(Reducer):
+    """
+    Гистограмма значений key(item) (по умолчанию — длины элементов).
+
+    Без bin_width считается каждое значение, иначе — корзины
+    [n*bin_width, (n+1)*bin_width), подписанные левой границей.
+    """
+
+    __slots__ = ("key", "bin_width", "counts")
+
+    def __init__(self, key: Callable[[Any], float] = len, bin_width: Optional[float] = None):
+        if bin_width is not None and bin_width <= 0:
+            raise GeneratorException("Ширина корзины должна быть положительной")
+        self.key = key
+        self.bin_width = bin_width
+        self.counts: Counter = Counter()
+
+    def add(self, item: Any) -> None:
+        value = self.key(item)
+        if self.bin_width is not None:
+            value = math.floor(value / self.bin_width) * self.bin_width
+        self.counts[value] += 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        self._check_merge(other)
+        self.counts.update(other.counts)
+        return self
+
+    def result(self) -> Dict[Any, int]:
+        return dict(sorted(self.counts.items()))
+
+
+class QuantileSketch(Reducer):
+    """
+    Приближенные квантили в ограниченной памяти (компакторы в духе KLL).
+
+    Значения накапливаются на уровне 0; переполненный уровень сортируется,
+    и каждое второе значение (со случайным сдвигом) переходит на уровень
+    выше с удвоенным весом. Память — O(k·log(n/k)), ошибка ранга — порядка 1/k.
+    """
+
+    __slots__ = ("k", "key", "quantiles", "count", "_levels", "_rng")
+
+    def __init__(self, k: int = 256, key: Optional[Callable[[Any], float]] = None,
+                 quantiles: Sequence[float] = (0.25, 0.5, 0.75), seed: Optional[int] = 0):
+        if k < 2:
+            raise GeneratorException("Размер компактора должен быть не меньше 2")
+        if any(not 0 <= q <= 1 for q in quantiles):
+            raise GeneratorException("Квантили должны лежать в [0, 1]")
+        self.k = k
+        self.key = key
+        self.quantiles = tuple(quantiles)
+        self.count = 0
+        self._levels: List[list] = [[]]
+        self._rng = random.Random(seed)
+
+    def add(self, item: Any) -> None:
+        level = self._levels[0]
+        level.append(self.key(item) if self.key is not None else item)
+        self.count += 1
+        if len(level) >= self.k:
+            self._compress()
+
+    def _compress(self) -> None:
+        levels = self._levels
+        for height in range(len(levels)):
+            level = levels[height]
+            if len(level) < self.k:
+                continue
+            level.sort()
+            kept = [level.pop()] if len(level) % 2 else []
+            promoted = level[self._rng.randint(0, 1)::2]
+            levels[height] = kept
+            if height + 1 == len(levels):
+                levels.append([])
+            levels[height + 1].extend(promoted)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        self._check_merge(other)
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for height, level in enumerate(other._levels):
+            self._levels[height].extend(level)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Значение, ниже которого примерно доля q элементов"""
+        if not 0 <= q <= 1:
+            raise GeneratorException("Квантиль должен лежать в [0, 1]")
+        weighted = sorted((value, 1 << height)
+                          for height, level in enumerate(self._levels) for value in level)
+        if not weighted:
+            return None
+        target = q * self.count
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def result(self) -> Dict[float, Optional[float]]:
+        return {q: self.quantile(q) for q in self.quantiles}
+
+
+class Aggregate(Reducer):
+    """Несколько агрегатов за один проход по данным"""
+
+    __slots__ = ("reducers",)
+
+    def __init__(self, **reducers: Reducer):
+        if not reducers:
+            raise GeneratorException("Нужен хотя бы один агрегат")
+        self.reducers = reducers
+
+    def add(self, item: Any) -> None:
+        for reducer in self.reducers.values():
+            reducer.add(item)
+
+    def update(self, iterable: Iterable) -> "Aggregate":
+        adds = [reducer.add for reducer in self.reducers.values()]
+        for item in iterable:
+            for add in adds:
+                add(item)
+        return self
+
+    def merge(self, other: "Aggregate") -> "Aggregate":
+        self._check_merge(other)
+        if self.reducers.keys() != other.reducers.keys():
+            raise GeneratorException("Наборы агрегатов не совпадают")
+        for name, reducer in self.reducers.items():
+            reducer.merge(other.reducers[name])
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        return {name: reducer.result() for name, reducer in self.reducers.items()}
+
+
+def aggregate(iterable: Iterable, **reducers: Reducer) -> Dict[str, Any]:
+    """
+    Вычисление агрегатов за один проход.
+
+    Args:
+        iterable: любой итератор (например, генератор из generators.py)
+        **reducers: агрегаты по именам
+
+    Returns:
+        Результаты агрегатов по тем же именам
+
+    Пример:
+        aggregate(filter_long_cities(text), count=Count(), longest=TopK(3, key=len))
+    """
+    return Aggregate(**reducers).update(iterable).result()
+
+
+def merge_all(reducers: Iterable[Reducer]) -> Reducer:
+    """Объединение агрегатов шардов в порядке шардов"""
+    iterator = iter(reducers)
+    try:
+        merged = next(iterator)
+    except StopIteration:
+        raise GeneratorException("Нет агрегатов для объединения") from None
+    for reducer in iterator:
+        merged.merge(reducer)
+    return merged
@@ -0,0 +1,150 @@
+"""
+Асинхронные (asyncio) версии генераторов
+"""
+
+import asyncio
+from concurrent.futures import Executor
+from itertools import islice
+from typing import AsyncGenerator, Iterable, Iterator, List, Optional
+
+from generators import (
+    GeneratorException,
+    letter_combinations,
+    function_generator,
+    filter_long_cities,
+)
+
+
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_MAX_PENDING = 2
+
+_DONE = object()
+
+
+class _Failure:
+    """Исключение из генератора, переданное через очередь"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _next_batch(iterator: Iterator, batch_size: int) -> list:
+    return list(islice(iterator, batch_size))
+
+
+async def _produce(iterator: Iterator, batch_size: int, queue: asyncio.Queue,
+                   executor: Optional[Executor], offload: bool) -> None:
+    """Чтение пакетов из синхронного итератора в очередь"""
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            if offload:
+                future = loop.run_in_executor(executor, _next_batch, iterator, batch_size)
+                try:
+                    batch = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # Генератор нельзя закрыть, пока пакет вычисляется в потоке
+                    await asyncio.wait([future])
+                    raise
+            else:
+                batch = _next_batch(iterator, batch_size)
+                await asyncio.sleep(0)
+            if not batch:
+                break
+            await queue.put(batch)
+        await queue.put(_DONE)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await queue.put(_Failure(e))
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+async def aiterate_batches(iterable: Iterable, batch_size: int = DEFAULT_BATCH_SIZE,
+                           max_pending: int = DEFAULT_MAX_PENDING,
+                           executor: Optional[Executor] = None,
+                           offload: bool = True) -> AsyncGenerator[List, None]:
+    """
+    Асинхронное чтение синхронного генератора пакетами.
+
+    Пакеты вычисляются в фоновой задаче (при offload=True — в пуле потоков
+    executor, иначе прямо в цикле событий с передачей управления после
+    каждого пакета) и складываются в очередь размером max_pending: пока
+    потребитель не забрал готовые пакеты, следующие не вычисляются.
+    Закрытие или отмена потребителя останавливает фоновую задачу и
+    закрывает исходный генератор.
+
+    Args:
+        iterable: любой генератор или итератор
+        batch_size: размер пакета
+        max_pending: максимум готовых, но не забранных пакетов
+        executor: пул потоков (по умолчанию — пул цикла событий)
+        offload: вычислять пакеты вне цикла событий
+
+    Yields:
+        Списки длиной не более batch_size
+    """
+    if batch_size <= 0:
+        raise GeneratorException("Размер пакета должен быть положительным")
+    if max_pending <= 0:
+        raise GeneratorException("Размер очереди должен быть положительным")
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+    producer = asyncio.create_task(_produce(iter(iterable), batch_size, queue, executor, offload))
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            if isinstance(batch, _Failure):
+                raise batch.error
+            yield batch
+    finally:
+        if not producer.done():
+            producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+
+
+async def aiterate(iterable: Iterable, batch_size: int = DEFAULT_BATCH_SIZE,
+                   max_pending: int = DEFAULT_MAX_PENDING,
+                   executor: Optional[Executor] = None,
+                   offload: bool = True) -> AsyncGenerator:
+    """
+    Асинхронное поэлементное чтение синхронного генератора.
+
+    Параметры те же, что у aiterate_batches; элементы выдаются по одному.
+    """
+    batches = aiterate_batches(iterable, batch_size, max_pending, executor, offload)
+    try:
+        async for batch in batches:
+            for item in batch:
+                yield item
+    finally:
+        await batches.aclose()
+
+
+def async_letter_combinations(batch_size: int = DEFAULT_BATCH_SIZE, **options) -> AsyncGenerator[str, None]:
+    """Асинхронный аналог letter_combinations"""
+    return aiterate(letter_combinations(), batch_size, **options)
+
+
+def async_function_generator(a: float, b: float, step: float = 0.01,
+                             expression: Optional[str] = None,
+                             batch_size: int = DEFAULT_BATCH_SIZE,
+                             **options) -> AsyncGenerator[float, None]:
+    """Асинхронный аналог function_generator"""
+    return aiterate(function_generator(a, b, step, expression), batch_size, **options)
+
+
+def async_filter_long_cities(cities_str: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                             **options) -> AsyncGenerator[str, None]:
+    """Асинхронный аналог filter_long_cities"""
+    return aiterate(filter_long_cities(cities_str), batch_size, **options)
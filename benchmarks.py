@@ -0,0 +1,227 @@
+"""
+Тестирование производительности генераторов с сохранением базовых результатов
+
+Запуск:
+    python benchmarks.py                      # измерение и сравнение с baseline
+    python benchmarks.py --save               # сохранение текущих результатов как baseline
+    python benchmarks.py --threshold 0.25     # допустимое замедление 25%
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from generators import (
+    letter_combinations,
+    letter_combinations_threaded,
+    function_generator,
+    filter_long_cities,
+    get_first_n_items,
+    GeneratorException,
+)
+
+
+DEFAULT_BASELINE = "benchmarks_baseline.json"
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 5
+
+CITY_WORDS = "Москва Казань Санкт-Петербург Уфа Владивосток Сочи Омск Екатеринбург Самара Тула".split()
+
+
+def _cities_text(size: int) -> str:
+    return " ".join(CITY_WORDS[i % len(CITY_WORDS)] for i in range(size))
+
+
+def _consume(iterable) -> int:
+    count = 0
+    for _ in iterable:
+        count += 1
+    return count
+
+
+def _function_values(size: int) -> int:
+    from vectorized import function_values
+    return len(function_values(0, size * 0.01 - 0.01, 0.01))
+
+
+def benchmark_cases() -> Dict[str, Dict[int, Callable[[], int]]]:
+    """
+    Набор измерений: имя -> {размер входа: функция, возвращающая число элементов}.
+
+    Входные данные готовятся заранее, чтобы в замер попадала только обработка.
+    """
+    cases: Dict[str, Dict[int, Callable[[], int]]] = {
+        "letter_combinations": {676: lambda: _consume(letter_combinations())},
+        "letter_combinations_threaded": {676: lambda: len(letter_combinations_threaded(676))},
+        "function_generator": {},
+        "function_values": {},
+        "filter_long_cities": {},
+        "get_first_n_items": {},
+    }
+    for size in (1_000, 100_000, 1_000_000):
+        b = size * 0.01 - 0.01
+        cases["function_generator"][size] = lambda b=b: _consume(function_generator(0, b, 0.01))
+        cases["function_values"][size] = lambda size=size: _function_values(size)
+    for size in (1_000, 100_000, 1_000_000):
+        text = _cities_text(size)
+        cases["filter_long_cities"][size] = lambda text=text: _consume(filter_long_cities(text))
+    for size in (100, 10_000, 1_000_000):
+        cases["get_first_n_items"][size] = lambda size=size: len(
+            get_first_n_items(function_generator(0, size * 0.01, 0.01), size))
+    return cases
+
+
+def measure(func: Callable[[], int], repeat: int = DEFAULT_REPEAT) -> Dict[str, float]:
+    """
+    Измерение одной функции.
+
+    Returns:
+        Словарь: items (число элементов), best и median (время вызова, с),
+        items_per_sec (пропускная способность по лучшему времени)
+    """
+    func()  # прогрев: импорты и кэши не попадают в замер
+    times: List[float] = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    best = times[0]
+    return {
+        "items": items,
+        "best": best,
+        "median": times[len(times) // 2],
+        "items_per_sec": items / best if best > 0 else float("inf"),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+                   max_size: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Запуск измерений.
+
+    Args:
+        names: имена измерений (по умолчанию все)
+        repeat: число повторов каждого замера
+        max_size: пропускать входы больше этого размера
+
+    Returns:
+        {имя: {размер (строкой): результат measure}}
+    """
+    cases = benchmark_cases()
+    unknown = set(names or ()) - set(cases)
+    if unknown:
+        raise GeneratorException(f"Неизвестные измерения: {', '.join(sorted(unknown))}")
+    results = {}
+    for name, sizes in cases.items():
+        if names and name not in names:
+            continue
+        results[name] = {
+            str(size): measure(func, repeat)
+            for size, func in sizes.items()
+            if max_size is None or size <= max_size
+        }
+    return results
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    """Загрузка сохраненных результатов (None, если файла нет)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        raise GeneratorException(f"Ошибка чтения baseline: {e}")
+
+
+def save_baseline(path: str, results: dict) -> None:
+    """Сохранение результатов вместе с описанием окружения"""
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнение с baseline по лучшему времени.
+
+    Args:
+        results: результат run_benchmarks
+        baseline: содержимое файла baseline
+        threshold: допустимое относительное замедление (0.2 = 20%)
+
+    Returns:
+        Список описаний регрессий (пустой, если регрессий нет)
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            base = base_results.get(name, {}).get(size)
+            if not base or base["best"] <= 0:
+                continue
+            slowdown = result["best"] / base["best"] - 1
+            if slowdown > threshold:
+                regressions.append(
+                    f"{name}[{size}]: {base['best'] * 1000:.3f} мс -> "
+                    f"{result['best'] * 1000:.3f} мс (+{slowdown:.0%})"
+                )
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """Таблица результатов для вывода в консоль"""
+    lines = [f"{'измерение':<30} {'размер':>10} {'лучшее, мс':>12} {'медиана, мс':>12} {'элементов/с':>14}"]
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            lines.append(
+                f"{name:<30} {size:>10} {result['best'] * 1000:>12.3f} "
+                f"{result['median'] * 1000:>12.3f} {result['items_per_sec']:>14,.0f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Тестирование производительности генераторов")
+    parser.add_argument("names", nargs="*", help="имена измерений (по умолчанию все)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="файл с базовыми результатами")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое замедление (доля, по умолчанию 0.2)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="число повторов")
+    parser.add_argument("--max-size", type=int, default=None, help="максимальный размер входа")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.repeat, args.max_size)
+    print(format_results(results))
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\nBaseline сохранен: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nBaseline {args.baseline} не найден, сравнение пропущено (используйте --save)")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\nРегрессии производительности:")
+        print("\n".join(regressions))
+        return 1
+    print("\nРегрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
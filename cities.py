@@ -0,0 +1,221 @@
+"""
+Потоковая фильтрация названий городов из больших файлов и stdin
+"""
+
+import io
+import mmap
+import re
+import sys
+from typing import Generator, IO, Iterator, List, Optional, Tuple, Union
+
+from generators import GeneratorException
+from parallel import ordered_map, resolve_workers
+
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+DEFAULT_RANGE_SIZE = 8 << 20
+MIN_CITY_LENGTH = 5
+
+# Однобайтовые разделители str.split(): ASCII-пробелы и \x1c-\x1f.
+# Остальные пробельные символы Unicode (U+00A0, U+2003 и т.д.) в UTF-8
+# многобайтовые и разделяются уже после декодирования слова
+_TOKEN_RE = re.compile(rb"[^\s\x1c-\x1f]+")
+_SPACE_RE = re.compile(rb"[\s\x1c-\x1f]")
+
+CitySource = Union[str, IO[str], None]
+
+
+def _read_buffers(stream: IO[str], buffer_size: int) -> Iterator[str]:
+    """Чтение потока блоками фиксированного размера"""
+    read = stream.read
+    while True:
+        try:
+            buffer = read(buffer_size)
+        except UnicodeDecodeError as e:
+            raise GeneratorException(f"Файл городов не в кодировке UTF-8: {e}")
+        if not buffer:
+            return
+        yield buffer
+
+
+def iter_city_tokens(source: CitySource = None,
+                     buffer_size: int = DEFAULT_BUFFER_SIZE) -> Generator[str, None, None]:
+    """
+    Ленивое разбиение текста на названия городов (по пробельным символам).
+
+    Текст читается блоками; слово, разрезанное границей блока, склеивается
+    с продолжением из следующего блока.
+
+    Args:
+        source: путь к файлу, текстовый файловый объект или None (stdin)
+        buffer_size: размер блока чтения в символах
+
+    Yields:
+        Названия городов в порядке следования
+    """
+    if buffer_size <= 0:
+        raise GeneratorException("Размер буфера должен быть положительным")
+    if source is None:
+        yield from iter_city_tokens(sys.stdin, buffer_size)
+        return
+    if isinstance(source, str):
+        try:
+            with open(source, encoding="utf-8") as stream:
+                yield from iter_city_tokens(stream, buffer_size)
+        except OSError as e:
+            raise GeneratorException(f"Ошибка чтения файла городов: {e}")
+        return
+
+    tail = ""
+    for buffer in _read_buffers(source, buffer_size):
+        tokens = buffer.split()
+        if not tokens:
+            if tail:
+                yield tail
+                tail = ""
+            continue
+        if tail:
+            if buffer[0].isspace():
+                yield tail
+            else:
+                tokens[0] = tail + tokens[0]
+        if buffer[-1].isspace():
+            tail = ""
+        else:
+            tail = tokens.pop()
+        yield from tokens
+    if tail:
+        yield tail
+
+
+def filter_long_cities_stream(source: CitySource = None, min_length: int = MIN_CITY_LENGTH,
+                              buffer_size: int = DEFAULT_BUFFER_SIZE) -> Generator[str, None, None]:
+    """
+    Потоковый аналог filter_long_cities для файлов, файловых объектов и stdin.
+
+    В памяти одновременно находится только один блок чтения.
+
+    Args:
+        source: путь к файлу, текстовый файловый объект или None (stdin)
+        min_length: города длиной более min_length символов проходят фильтр
+        buffer_size: размер блока чтения в символах
+
+    Yields:
+        Названия городов длиной более min_length символов
+    """
+    for city in iter_city_tokens(source, buffer_size):
+        if len(city) > min_length:
+            yield city
+
+
+def filter_long_cities_mmap(path: str, min_length: int = MIN_CITY_LENGTH) -> Generator[str, None, None]:
+    """
+    Фильтрация городов из UTF-8 файла через отображение в память.
+
+    Слова ищутся прямо в байтах отображенного файла; строка создается только
+    для кандидатов, у которых число байт больше min_length (в UTF-8 символ
+    занимает не меньше одного байта, поэтому короткие слова отсекаются
+    без декодирования). Разделители те же, что у str.split(), включая
+    пробельные символы Unicode.
+
+    Args:
+        path: путь к файлу в кодировке UTF-8
+        min_length: города длиной более min_length символов проходят фильтр
+
+    Yields:
+        Названия городов длиной более min_length символов
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield from _filter_bytes(data, 0, len(data), min_length)
+    except OSError as e:
+        raise GeneratorException(f"Ошибка чтения файла городов: {e}")
+
+
+def _filter_bytes(data, start: int, stop: int, min_length: int) -> Iterator[str]:
+    """Фильтрация слов в байтовом диапазоне [start, stop) буфера data"""
+    for match in _TOKEN_RE.finditer(data, start, stop):
+        if match.end() - match.start() > min_length:
+            try:
+                token = match.group().decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise GeneratorException(f"Файл городов не в кодировке UTF-8: {e}")
+            # Слово с не-ASCII символами может содержать пробелы Unicode
+            for city in ((token,) if token.isascii() else token.split()):
+                if len(city) > min_length:
+                    yield city
+
+
+def split_byte_ranges(data, range_size: int) -> List[Tuple[int, int]]:
+    """
+    Разбиение буфера на диапазоны байт, выровненные по пробельным символам.
+
+    Каждая граница сдвигается вперед до ближайшего пробельного символа,
+    поэтому ни одно слово не попадает в два диапазона.
+
+    Args:
+        data: байтовый буфер (bytes или mmap)
+        range_size: желаемый размер диапазона в байтах
+
+    Returns:
+        Список пар (start, stop)
+    """
+    if range_size <= 0:
+        raise GeneratorException("Размер диапазона должен быть положительным")
+    size = len(data)
+    ranges = []
+    start = 0
+    while start < size:
+        stop = start + range_size
+        if stop >= size:
+            stop = size
+        else:
+            match = _SPACE_RE.search(data, stop)
+            stop = match.start() if match else size
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _filter_range(path: str, start: int, stop: int, min_length: int) -> List[str]:
+    """Фильтрация одного диапазона файла (выполняется в процессе-исполнителе)"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return list(_filter_bytes(data, start, stop, min_length))
+
+
+def filter_long_cities_parallel(path: str, min_length: int = MIN_CITY_LENGTH,
+                                workers: Optional[int] = None,
+                                range_size: int = DEFAULT_RANGE_SIZE) -> Generator[str, None, None]:
+    """
+    Параллельная фильтрация городов из UTF-8 файла в пуле процессов.
+
+    Файл делится на диапазоны байт по пробельным символам, каждый диапазон
+    фильтруется отдельным процессом. Результаты сливаются в исходном порядке
+    по мере готовности: первые города выдаются, как только готов первый
+    диапазон, а в работе одновременно не больше 2*workers диапазонов.
+
+    Args:
+        path: путь к файлу в кодировке UTF-8
+        min_length: города длиной более min_length символов проходят фильтр
+        workers: число процессов (по умолчанию os.cpu_count())
+        range_size: размер диапазона в байтах
+
+    Yields:
+        Названия городов длиной более min_length символов в исходном порядке
+    """
+    workers = resolve_workers(workers)
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = split_byte_ranges(data, range_size)
+    except OSError as e:
+        raise GeneratorException(f"Ошибка чтения файла городов: {e}")
+
+    arguments = [(path, start, stop, min_length) for start, stop in ranges]
+    for cities in ordered_map(_filter_range, arguments, workers):
+        yield from cities
@@ -0,0 +1,139 @@
+"""
+Индекс названий городов по длине для повторных запросов с разными порогами
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Generator, Iterable, List, Optional
+
+from generators import GeneratorException
+
+
+_ENCODING = "utf-32-le"
+_CHAR_SIZE = 4
+
+
+class CityLengthIndex:
+    """
+    Названия городов, сгруппированные по длине.
+
+    Города одной длины L хранятся подряд в одном bytearray в кодировке
+    UTF-32 (ровно 4*L байт на название), без отдельного объекта str на
+    каждое название; строки создаются только при выдаче результата.
+    Запросы перебирают лишь подходящие группы, поэтому их время зависит
+    от числа найденных городов (и числа различных длин), а не от размера
+    корпуса. Внутри группы сохраняется порядок добавления.
+    """
+
+    __slots__ = ("_buckets", "_lengths", "_size")
+
+    def __init__(self, cities: Optional[Iterable[str]] = None):
+        """
+        Args:
+            cities: начальный набор названий
+        """
+        self._buckets: Dict[int, bytearray] = {}
+        self._lengths: List[int] = []
+        self._size = 0
+        if cities is not None:
+            self.update(cities)
+
+    @classmethod
+    def from_text(cls, cities_str: str) -> "CityLengthIndex":
+        """Индекс по строке с названиями городов через пробел"""
+        return cls(cities_str.split())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, city) -> bool:
+        return isinstance(city, str) and self._find(city) is not None
+
+    def __iter__(self) -> Generator[str, None, None]:
+        return self.longer_than(-1)
+
+    def add(self, city: str) -> None:
+        """Добавление одного названия"""
+        if not city or city != city.strip() or len(city.split()) != 1:
+            raise GeneratorException(f"Некорректное название города: {city!r}")
+        length = len(city)
+        bucket = self._buckets.get(length)
+        if bucket is None:
+            bucket = self._buckets[length] = bytearray()
+            self._lengths.insert(bisect_left(self._lengths, length), length)
+        bucket += city.encode(_ENCODING)
+        self._size += 1
+
+    def update(self, cities: Iterable[str]) -> None:
+        """Добавление нескольких названий"""
+        for city in cities:
+            self.add(city)
+
+    def _find(self, city: str) -> Optional[int]:
+        """Смещение первого вхождения названия в его группе"""
+        bucket = self._buckets.get(len(city))
+        if bucket is None:
+            return None
+        encoded = city.encode(_ENCODING)
+        width = len(encoded)
+        pos = bucket.find(encoded)
+        while pos != -1 and pos % width:
+            pos = bucket.find(encoded, pos + 1)
+        return None if pos == -1 else pos
+
+    def remove(self, city: str) -> None:
+        """Удаление одного вхождения названия"""
+        pos = self._find(city)
+        if pos is None:
+            raise GeneratorException(f"Город {city!r} отсутствует в индексе")
+        length = len(city)
+        bucket = self._buckets[length]
+        del bucket[pos:pos + length * _CHAR_SIZE]
+        if not bucket:
+            del self._buckets[length]
+            self._lengths.remove(length)
+        self._size -= 1
+
+    def _bucket_count(self, length: int) -> int:
+        return len(self._buckets[length]) // (length * _CHAR_SIZE)
+
+    def _lengths_between(self, low: int, high: Optional[int]) -> List[int]:
+        """Различные длины из отрезка [low, high]"""
+        start = bisect_left(self._lengths, low)
+        stop = len(self._lengths) if high is None else bisect_right(self._lengths, high)
+        return self._lengths[start:stop]
+
+    def _iter_lengths(self, lengths: List[int]) -> Generator[str, None, None]:
+        for length in lengths:
+            data = self._buckets[length].decode(_ENCODING)
+            for start in range(0, len(data), length):
+                yield data[start:start + length]
+
+    def longer_than(self, n: int) -> Generator[str, None, None]:
+        """
+        Города длиной более n символов.
+
+        Yields:
+            Названия в порядке возрастания длины
+        """
+        return self._iter_lengths(self._lengths_between(n + 1, None))
+
+    def between(self, n: int, m: int) -> Generator[str, None, None]:
+        """
+        Города длиной от n до m символов включительно.
+
+        Yields:
+            Названия в порядке возрастания длины
+        """
+        return self._iter_lengths(self._lengths_between(n, m))
+
+    def count_longer_than(self, n: int) -> int:
+        """Количество городов длиной более n символов"""
+        return sum(self._bucket_count(length) for length in self._lengths_between(n + 1, None))
+
+    def count_between(self, n: int, m: int) -> int:
+        """Количество городов длиной от n до m символов включительно"""
+        return sum(self._bucket_count(length) for length in self._lengths_between(n, m))
+
+    def histogram(self) -> Dict[int, int]:
+        """Количество городов для каждой длины"""
+        return {length: self._bucket_count(length) for length in self._lengths}
@@ -0,0 +1,158 @@
+"""
+Консольный режим без графического интерфейса (PySide6 не загружается)
+
+Примеры:
+    python main.py letters --count 100
+    python main.py letters --alphabet abc --length 5 --format csv -o combos.csv
+    python main.py function -a -5 -b 7 --step 0.001 --expression "sin(x)" --format binary -o f.bin
+    python main.py cities --input places.txt --min-length 7
+    cat places.txt | python main.py cities --unique
+    python main.py serve --port 8765
+"""
+
+import argparse
+import csv
+import io
+import sys
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from generators import GeneratorException
+
+
+FORMATS = ("text", "csv", "binary")
+WRITE_BATCH = 4096
+
+
+def _batches(iterable: Iterable, size: int = WRITE_BATCH) -> Iterator[list]:
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _write_strings(items: Iterable[str], fmt: str, out: BinaryIO, header: str) -> int:
+    """
+    Запись строк пакетами.
+
+    text — по одной строке, csv — "index,<header>", binary — UTF-8 строки,
+    разделенные нулевым байтом.
+    """
+    count = 0
+    if fmt == "csv":
+        out.write(f"index,{header}\r\n".encode("utf-8"))
+    for batch in _batches(items):
+        if fmt == "text":
+            out.write(("\n".join(batch) + "\n").encode("utf-8"))
+        elif fmt == "csv":
+            rows = _csv_rows(enumerate(batch, count))
+            out.write(rows.encode("utf-8"))
+        else:
+            out.write(b"\0".join(item.encode("utf-8") for item in batch) + b"\0")
+        count += len(batch)
+    return count
+
+
+def _csv_rows(rows: Iterable) -> str:
+    """Строки CSV с экранированием по правилам модуля csv"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def run_letters(args: argparse.Namespace, out: BinaryIO) -> int:
+    from combinations import CombinationSpace
+
+    space = CombinationSpace(args.alphabet, args.length)
+    items = space if args.count is None else space[:max(args.count, 0)]
+    return _write_strings(items, args.format, out, "combination")
+
+
+def run_function(args: argparse.Namespace, out: BinaryIO) -> int:
+    from vectorized import function_chunks, function_x
+
+    count = 0
+    for chunk in function_chunks(args.a, args.b, args.step, args.chunk_size, args.expression):
+        if args.format == "binary":
+            out.write(chunk.astype("<f8", copy=False).tobytes())
+        elif args.format == "csv":
+            if count == 0:
+                out.write(b"x,y\r\n")
+            x = function_x(args.a, args.step, count, count + len(chunk))
+            out.write(_csv_rows(zip(x.tolist(), chunk.tolist())).encode("ascii"))
+        else:
+            out.write(("\n".join(map(repr, chunk.tolist())) + "\n").encode("ascii"))
+        count += len(chunk)
+    return count
+
+
+def run_cities(args: argparse.Namespace, out: BinaryIO) -> int:
+    from cities import filter_long_cities_stream
+
+    source = None if args.input in (None, "-") else args.input
+    cities = filter_long_cities_stream(source, args.min_length)
+    if args.unique:
+        from dedup import deduplicate
+        cities = deduplicate(cities)
+    return _write_strings(cities, args.format, out, "city")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="Генераторы Python - Вариант 2 (консольный режим)")
+    subparsers = parser.add_subparsers(dest="task", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=FORMATS, default="text", help="формат вывода")
+    common.add_argument("-o", "--output", default="-", help="файл вывода (по умолчанию stdout)")
+
+    letters = subparsers.add_parser("letters", parents=[common], help="сочетания букв")
+    letters.add_argument("--count", type=int, default=None, help="количество (по умолчанию все)")
+    letters.add_argument("--alphabet", default="abcdefghijklmnopqrstuvwxyz", help="алфавит")
+    letters.add_argument("--length", type=int, default=2, help="длина сочетания")
+    letters.set_defaults(run=run_letters)
+
+    function = subparsers.add_parser("function", parents=[common], help="значения функции")
+    function.add_argument("-a", type=float, default=-5.0, help="начальное значение x")
+    function.add_argument("-b", type=float, default=7.0, help="конечное значение x")
+    function.add_argument("--step", type=float, default=0.01, help="шаг")
+    function.add_argument("--expression", default=None, help="выражение от x (по умолчанию 0.1x² + 5x - 2)")
+    function.add_argument("--chunk-size", type=int, default=65536, help="размер блока вычислений")
+    function.set_defaults(run=run_function)
+
+    cities = subparsers.add_parser("cities", parents=[common], help="фильтр городов")
+    cities.add_argument("--input", default=None, help="файл с названиями (по умолчанию stdin)")
+    cities.add_argument("--min-length", type=int, default=5, help="города длиннее этого числа символов")
+    cities.add_argument("--unique", action="store_true", help="выводить каждое название один раз")
+    cities.set_defaults(run=run_cities)
+
+    serve = subparsers.add_parser("serve", help="локальный HTTP-сервис (см. server.py)")
+    serve.add_argument("--host", default="127.0.0.1", help="адрес")
+    serve.add_argument("--port", type=int, default=8765, help="порт")
+    serve.add_argument("--max-concurrent", type=int, default=8, help="максимум одновременных запросов")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Точка входа консольного режима; возвращает код завершения"""
+    args = build_parser().parse_args(argv)
+    if args.task == "serve":
+        from server import serve
+        return serve(args.host, args.port, args.max_concurrent)
+
+    try:
+        if args.output == "-":
+            out = sys.stdout.buffer
+            args.run(args, out)
+            out.flush()
+        else:
+            with open(args.output, "wb") as out:
+                args.run(args, out)
+    except BrokenPipeError:
+        return 0
+    except (GeneratorException, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Пространство k-буквенных сочетаний с произвольным алфавитом
+"""
+
+from string import ascii_lowercase
+import random
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Union
+
+from generators import GeneratorException
+from parallel import ordered_map, resolve_workers
+
+
+class CombinationSpace(Sequence):
+    """
+    Ленивая последовательность всех сочетаний длины k из заданного алфавита.
+
+    Элементы не хранятся в памяти: i-й элемент вычисляется по индексу
+    (разложение i в системе счисления с основанием len(alphabet)), поэтому
+    доступ, срез и поиск ранга не зависят от размера пространства.
+    Порядок элементов лексикографический относительно порядка алфавита.
+
+    len() ограничен размером ssize_t (2**63 - 1) и для больших пространств
+    (например, 26 букв при k >= 14) вызывает OverflowError. Размер таких
+    пространств дают total и size, а итерация, срезы, доступ по индексу
+    и sample с len() не связаны и работают при любом k.
+    """
+
+    __slots__ = ("alphabet", "length", "_base", "_positions", "_indices")
+
+    def __init__(self, alphabet: str = ascii_lowercase, length: int = 2,
+                 _indices: Optional[range] = None):
+        """
+        Args:
+            alphabet: строка с уникальными символами алфавита
+            length: длина сочетания k
+        """
+        if not alphabet:
+            raise GeneratorException("Алфавит не может быть пустым")
+        if len(set(alphabet)) != len(alphabet):
+            raise GeneratorException("Символы алфавита должны быть уникальными")
+        if length < 1:
+            raise GeneratorException("Длина сочетания должна быть положительной")
+
+        self.alphabet = alphabet
+        self.length = length
+        self._base = len(alphabet)
+        self._positions = {char: pos for pos, char in enumerate(alphabet)}
+        self._indices = _indices if _indices is not None else range(self._base ** length)
+
+    @property
+    def total(self) -> int:
+        """Размер полного пространства (без учета среза)"""
+        return self._base ** self.length
+
+    @property
+    def size(self) -> int:
+        """Число элементов текущей последовательности (с учетом среза), без ограничения ssize_t"""
+        indices = self._indices
+        if indices.step > 0:
+            return max(0, (indices.stop - indices.start + indices.step - 1) // indices.step)
+        return max(0, (indices.start - indices.stop - indices.step - 1) // -indices.step)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, "CombinationSpace"]:
+        if isinstance(item, slice):
+            return CombinationSpace(self.alphabet, self.length, self._indices[item])
+        try:
+            return self.unrank(self._indices[item])
+        except IndexError:
+            raise IndexError("Индекс сочетания вне диапазона") from None
+
+    def __iter__(self) -> Iterator[str]:
+        indices = self._indices
+        size = self.size
+        if not size:
+            return
+        if indices.step != 1:
+            yield from map(self.unrank, indices)
+            return
+
+        # Счетчик-одометр: от стартового индекса без повторного разложения
+        alphabet = self.alphabet
+        base = self._base
+        digits = self._digits(indices.start)
+        chars = [alphabet[d] for d in digits]
+        last = self.length - 1
+        for _ in range(size):
+            yield "".join(chars)
+            pos = last
+            while pos >= 0:
+                digits[pos] += 1
+                if digits[pos] < base:
+                    chars[pos] = alphabet[digits[pos]]
+                    break
+                digits[pos] = 0
+                chars[pos] = alphabet[0]
+                pos -= 1
+
+    def __contains__(self, value) -> bool:
+        try:
+            return self.rank(value) in self._indices
+        except GeneratorException:
+            return False
+
+    def __repr__(self) -> str:
+        return (f"CombinationSpace(alphabet={self.alphabet!r}, length={self.length}, "
+                f"indices={self._indices!r})")
+
+    def _digits(self, rank: int) -> List[int]:
+        """Разложение ранга на позиции символов"""
+        digits = [0] * self.length
+        for pos in range(self.length - 1, -1, -1):
+            rank, digits[pos] = divmod(rank, self._base)
+        return digits
+
+    def unrank(self, rank: int) -> str:
+        """
+        Сочетание по его рангу в полном пространстве.
+
+        Args:
+            rank: номер сочетания от 0 до total - 1
+
+        Returns:
+            Строка-сочетание
+        """
+        if not 0 <= rank < self.total:
+            raise IndexError("Ранг сочетания вне диапазона")
+        alphabet = self.alphabet
+        return "".join(alphabet[d] for d in self._digits(rank))
+
+    def rank(self, combination: str) -> int:
+        """
+        Ранг сочетания в полном пространстве (обратная операция к unrank).
+
+        Args:
+            combination: строка длины k из символов алфавита
+
+        Returns:
+            Номер сочетания
+        """
+        if not isinstance(combination, str) or len(combination) != self.length:
+            raise GeneratorException(f"Ожидается строка длины {self.length}")
+        result = 0
+        positions = self._positions
+        for char in combination:
+            pos = positions.get(char)
+            if pos is None:
+                raise GeneratorException(f"Символ {char!r} не входит в алфавит")
+            result = result * self._base + pos
+        return result
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        """Позиция сочетания в текущей последовательности (с учетом среза)"""
+        try:
+            pos = self._indices.index(self.rank(value))
+        except (GeneratorException, ValueError):
+            raise ValueError(f"{value!r} нет в последовательности") from None
+        stop = self.size if stop is None else stop
+        if not start <= pos < stop:
+            raise ValueError(f"{value!r} нет в последовательности")
+        return pos
+
+    def count(self, value) -> int:
+        return 1 if value in self else 0
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Равномерная выборка k сочетаний без повторений.
+
+        Выбираются только индексы (randrange и множество уже выбранных),
+        поэтому память пропорциональна k, а не размеру пространства,
+        и выборка работает для пространств больше 2**63.
+
+        Args:
+            k: размер выборки
+            rng: генератор случайных чисел (по умолчанию модуль random)
+
+        Returns:
+            Список из k различных сочетаний
+        """
+        size = self.size
+        if k < 0 or k > size:
+            raise GeneratorException("Размер выборки вне диапазона")
+        chooser = rng if rng is not None else random
+        chosen = set()
+        result = []
+        while len(result) < k:
+            position = chooser.randrange(size)
+            if position not in chosen:
+                chosen.add(position)
+                result.append(self.unrank(self._indices[position]))
+        return result
+
+
+def _generate_shard(alphabet: str, length: int, start: int, stop: int) -> List[str]:
+    """Генерация одного шарда (выполняется в процессе-исполнителе)"""
+    return list(CombinationSpace(alphabet, length)[start:stop])
+
+
+def letter_combinations_parallel(count: int = 50, alphabet: str = ascii_lowercase,
+                                 length: int = 2, workers: Optional[int] = None,
+                                 shard_size: Optional[int] = None) -> List[str]:
+    """
+    Многопроцессная генерация первых count сочетаний в лексикографическом порядке.
+
+    Вычисляются только шарды, покрывающие первые count элементов;
+    результаты собираются в порядке шардов, а не в порядке завершения.
+
+    Args:
+        count: количество сочетаний
+        alphabet: алфавит
+        length: длина сочетания
+        workers: число процессов (по умолчанию os.cpu_count())
+        shard_size: размер шарда (по умолчанию count делится поровну между процессами)
+
+    Returns:
+        Список сочетаний
+    """
+    if count <= 0:
+        return []
+
+    space = CombinationSpace(alphabet, length)
+    count = min(count, space.size)
+    workers = resolve_workers(workers)
+    if shard_size is None:
+        shard_size = -(-count // workers)
+    if shard_size < 1:
+        raise GeneratorException("Размер шарда должен быть положительным")
+
+    starts = range(0, count, shard_size)
+    if workers == 1 or len(starts) == 1:
+        return list(space[:count])
+
+    arguments = [(alphabet, length, start, min(start + shard_size, count)) for start in starts]
+    results: List[str] = []
+    for shard in ordered_map(_generate_shard, arguments, workers):
+        results.extend(shard)
+    return results
@@ -0,0 +1,235 @@
+"""
+Разбор и компиляция пользовательских выражений от x для генератора функции
+"""
+
+import ast
+import math
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from generators import GeneratorException
+
+
+DEFAULT_EXPRESSION = "0.1 * x ** 2 + 5 * x - 2"
+MAX_EXPRESSION_LENGTH = 1000
+KERNEL_CACHE_SIZE = 128
+
+# имя в выражении -> (функция math, имя функции numpy)
+FUNCTIONS: Dict[str, Tuple[Callable, str]] = {
+    "sin": (math.sin, "sin"),
+    "cos": (math.cos, "cos"),
+    "tan": (math.tan, "tan"),
+    "asin": (math.asin, "arcsin"),
+    "acos": (math.acos, "arccos"),
+    "atan": (math.atan, "arctan"),
+    "sinh": (math.sinh, "sinh"),
+    "cosh": (math.cosh, "cosh"),
+    "tanh": (math.tanh, "tanh"),
+    "exp": (math.exp, "exp"),
+    "log": (math.log, "log"),
+    "log10": (math.log10, "log10"),
+    "log2": (math.log2, "log2"),
+    "sqrt": (math.sqrt, "sqrt"),
+    "abs": (abs, "abs"),
+    # math.floor/ceil возвращают int: без float возведение в степень их
+    # результатов шло бы в длинной арифметике целых чисел
+    "floor": (lambda v: float(math.floor(v)), "floor"),
+    "ceil": (lambda v: float(math.ceil(v)), "ceil"),
+}
+
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+    ast.UAdd, ast.USub,
+)
+
+
+_BINARY_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Pow: lambda a, b: a ** b,
+    ast.Mod: lambda a, b: a % b,
+    ast.FloorDiv: lambda a, b: a // b,
+}
+
+
+def _constant_value(node: ast.AST) -> Optional[float]:
+    """
+    Значение поддерева без x в арифметике float (None — поддерево зависит от x
+    или не вычисляется). OverflowError пробрасывается.
+    """
+    if isinstance(node, ast.Constant):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        return CONSTANTS.get(node.id)
+    if isinstance(node, ast.UnaryOp):
+        value = _constant_value(node.operand)
+        if value is None:
+            return None
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp):
+        left, right = _constant_value(node.left), _constant_value(node.right)
+        if left is None or right is None:
+            return None
+        try:
+            value = _BINARY_OPS[type(node.op)](left, right)
+        except ZeroDivisionError:
+            return None
+        return value if isinstance(value, float) else None
+    return None
+
+
+def _validate(tree: ast.Expression) -> None:
+    """Проверка, что дерево содержит только арифметику от x"""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise GeneratorException(f"Недопустимая конструкция в выражении: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+            raise GeneratorException(f"Недопустимая константа в выражении: {node.value!r}")
+        # Константы вычисляются как float (см. CompiledExpression), поэтому
+        # 9**9**9 не приводит к бесконечному возведению в степень целых чисел,
+        # а отклоняется здесь как переполнение
+        if isinstance(node, ast.Constant) or (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow)):
+            try:
+                _constant_value(node)
+            except OverflowError:
+                raise GeneratorException("Слишком большое число в выражении") from None
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise GeneratorException("Неизвестная функция в выражении")
+            if node.keywords or len(node.args) != 1:
+                raise GeneratorException(f"Функция {node.func.id} принимает один аргумент")
+        if isinstance(node, ast.Name) and node.id != "x" \
+                and node.id not in CONSTANTS and node.id not in FUNCTIONS:
+            raise GeneratorException(f"Неизвестное имя в выражении: {node.id}")
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def normalize_expression(text: str) -> str:
+    """
+    Разбор, проверка и нормализация текста выражения.
+
+    Разные записи одного выражения ("x*2" и "x * 2") приводятся к одной строке,
+    которая служит ключом кэша скомпилированных ядер.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise GeneratorException("Выражение не может быть пустым")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise GeneratorException("Выражение слишком длинное")
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise GeneratorException(f"Синтаксическая ошибка в выражении: {e.msg}")
+    _validate(tree)
+    return ast.unparse(tree)
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """Числовые константы -> float: арифметика только над числами фиксированного размера"""
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+class CompiledExpression:
+    """
+    Скомпилированное выражение: скалярное и векторное (NumPy) ядра.
+
+    Оба ядра ведут себя одинаково вне области определения: результат —
+    NaN или ±inf, как у NumPy (log(0) = -inf, sqrt(-1) = NaN, 1/0 = inf),
+    а не исключение. Скалярное ядро вычисляет обычные точки через math,
+    а точки, где math выбрасывает ошибку или дает комплексное число,
+    пересчитывает векторным ядром. Аргумент и результаты функций приводятся
+    к float, поэтому арифметика целых чисел неограниченной длины невозможна.
+    """
+
+    __slots__ = ("text", "scalar", "_code", "_vector")
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: нормализованный текст выражения
+        """
+        self.text = text
+        tree = ast.parse(text, mode="eval")
+        lambda_tree = ast.Expression(body=ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[ast.arg(arg="x")], kwonlyargs=[],
+                               kw_defaults=[], defaults=[]),
+            body=_FloatConstants().visit(tree.body),
+        ))
+        ast.fix_missing_locations(lambda_tree)
+        self._code = compile(lambda_tree, "<expression>", "eval")
+        namespace = {"__builtins__": {}, **CONSTANTS}
+        namespace.update({name: funcs[0] for name, funcs in FUNCTIONS.items()})
+        raw = eval(self._code, namespace)
+        self._vector = None
+
+        def scalar(x):
+            try:
+                result = raw(float(x))
+            except (ArithmeticError, ValueError):
+                return self._scalar_fallback(x)
+            return self._scalar_fallback(x) if isinstance(result, complex) else result
+
+        self.scalar: Callable[[float], float] = scalar
+
+    def _scalar_fallback(self, x: float) -> float:
+        """Значение в точке вне области определения math (NaN или ±inf)"""
+        import numpy as np
+
+        return float(self.vector(np.asarray(x, dtype=np.float64)))
+
+    @property
+    def vector(self) -> Callable:
+        """Векторное ядро над массивами NumPy (NumPy загружается при первом обращении)"""
+        if self._vector is None:
+            import numpy as np
+
+            namespace = {"__builtins__": {}, **CONSTANTS}
+            namespace.update({name: getattr(np, funcs[1]) for name, funcs in FUNCTIONS.items()})
+            raw = eval(self._code, namespace)
+
+            def vector(x):
+                with np.errstate(all="ignore"):
+                    result = raw(x)
+                # Выражение без x дает скаляр — растягиваем до формы x
+                return np.broadcast_to(np.asarray(result, dtype=np.float64), np.shape(x)).copy() \
+                    if np.ndim(result) == 0 else np.asarray(result, dtype=np.float64)
+
+            self._vector = vector
+        return self._vector
+
+    def __call__(self, x: float) -> float:
+        return self.scalar(x)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _compile_normalized(text: str) -> CompiledExpression:
+    return CompiledExpression(text)
+
+
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Скомпилированное выражение из кэша (разбор и компиляция выполняются один раз).
+
+    Args:
+        text: выражение от x, например "sin(x) / (1 + x**2)"
+
+    Returns:
+        Объект CompiledExpression
+    """
+    return _compile_normalized(normalize_expression(text))
+
+
+def clear_expression_cache() -> None:
+    """Очистка кэшей нормализации и компиляции"""
+    normalize_expression.cache_clear()
+    _compile_normalized.cache_clear()
@@ -4,8 +4,10 @@
 
 from string import ascii_lowercase
 import random
-from typing import Generator, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Generator, Optional, Sequence
+
+from instrumentation import instrumented
 
 
 class GeneratorException(Exception):
@@ -13,6 +15,7 @@ class GeneratorException(Exception):
     pass
 
 
+@instrumented
 def letter_combinations() -> Generator[str, None, None]:
     """
     Генератор всех сочетаний из двух латинских букв.
@@ -26,7 +29,8 @@ def letter_combinations() -> Generator[str, None, None]:
         raise GeneratorException(f"Ошибка в генераторе сочетаний: {e}")
 
 
-def letter_combinations_threaded(count: int = 50) -> List[str]:
+@instrumented
+def letter_combinations_threaded(count: int = 50) -> Sequence[str]:
     """
     Многопоточная версия генератора сочетаний букв.
     
@@ -34,28 +38,31 @@ def letter_combinations_threaded(count: int = 50) -> List[str]:
         count: количество сочетаний для генерации
         
     Returns:
-        Список сочетаний букв
+        Последовательность сочетаний букв (PackedStrings: все сочетания
+        в одном буфере по 2 байта, строки создаются при чтении)
     """
+    # Пул потоков и упакованный контейнер загружаются только при первом вызове
+    from concurrent.futures import ThreadPoolExecutor
+    from packed import PackedStrings
+    
     if count <= 0:
-        return []  # Возвращаем пустой список вместо исключения
+        return PackedStrings(b"", 2)  # Пустая последовательность вместо исключения
     
     if count > 676:  # 26*26
         count = 676
     
-    def generate_chunk(start_idx: int, end_idx: int) -> List[str]:
-        """Генерация части сочетаний"""
-        chunk = []
-        for i in range(start_idx, end_idx):
-            first = ascii_lowercase[i // 26]
-            second = ascii_lowercase[i % 26]
-            chunk.append(f"{first}{second}")
-        return chunk
+    letters = ascii_lowercase.encode("ascii")
+    
+    def generate_chunk(start_idx: int, end_idx: int) -> bytes:
+        """Генерация части сочетаний (по 2 байта на сочетание)"""
+        chunk = bytearray(2 * (end_idx - start_idx))
+        chunk[0::2] = bytes(letters[i // 26] for i in range(start_idx, end_idx))
+        chunk[1::2] = bytes(letters[i % 26] for i in range(start_idx, end_idx))
+        return bytes(chunk)
     
     total_combinations = 26 * 26
     chunk_size = total_combinations // 4  # 4 потока
     
-    results = []
-    
     with ThreadPoolExecutor(max_workers=4) as executor:
         futures = []
         
@@ -63,13 +70,15 @@ def letter_combinations_threaded(count: int = 50) -> List[str]:
             end = min(start + chunk_size, total_combinations)
             futures.append(executor.submit(generate_chunk, start, end))
         
-        for future in as_completed(futures):
-            results.extend(future.result())
+        # Части собираются в порядке запуска, поэтому порядок сочетаний постоянный
+        buffer = b"".join(future.result() for future in futures)
     
-    return results[:count]
+    return PackedStrings(buffer[:2 * count], 2)
 
 
-def function_generator(a: float, b: float, step: float = 0.01) -> Generator[float, None, None]:
+@instrumented
+def function_generator(a: float, b: float, step: float = 0.01,
+                       expression: Optional[str] = None) -> Generator[float, None, None]:
     """
     Генератор значений функции f(x) = 0.1*x^2 + 5*x - 2
     
@@ -77,6 +86,7 @@ def function_generator(a: float, b: float, step: float = 0.01) -> Generator[floa
         a: начальное значение x
         b: конечное значение x
         step: шаг изменения x
+        expression: пользовательское выражение от x вместо f(x) по умолчанию
         
     Yields:
         Значения функции f(x) для каждого x
@@ -88,17 +98,29 @@ def function_generator(a: float, b: float, step: float = 0.01) -> Generator[floa
         if step <= 0:
             raise ValueError("Шаг должен быть положительным")
         
+        if expression is not None:
+            from expressions import compile_expression
+            f = compile_expression(expression).scalar
+            x = a
+            while x <= b + step/2:
+                yield f(x)
+                x += step
+            return
+        
         x = a
         while x <= b + step/2:  # Добавляем половину шага для учета погрешности float
             yield 0.1 * x**2 + 5 * x - 2
             x += step
             
+    except GeneratorException:
+        raise
     except ValueError as e:
         raise GeneratorException(f"Некорректные параметры: {e}")
     except Exception as e:
         raise GeneratorException(f"Ошибка в генераторе функции: {e}")
 
 
+@instrumented
 def filter_long_cities(cities_str: str) -> Generator[str, None, None]:
     """
     Фильтр названий городов длиной более 5 символов.
@@ -122,6 +144,7 @@ def filter_long_cities(cities_str: str) -> Generator[str, None, None]:
         raise GeneratorException(f"Ошибка в фильтре городов: {e}")
 
 
+@instrumented
 def get_first_n_items(generator, n: int):
     """
     Получение первых n элементов из генератора
@@ -131,37 +154,12 @@ def get_first_n_items(generator, n: int):
         n: количество элементов
         
     Returns:
-        Список из n элементов
-    """
-    try:
-        return [next(generator) for _ in range(n)]
-    except StopIteration:
-        return []
-    except Exception as e:
-        raise GeneratorException(f"Ошибка при получении элементов: {e}")
-
-def get_first_n_items(generator, n: int):
-    """
-    Получение первых n элементов из генератора
-    
-    Args:
-        generator: любой генератор или итератор
-        n: количество элементов
-        
-    Returns:
-        Список из n элементов
+        Список из n элементов (или меньше, если генератор закончился раньше)
     """
     try:
         if n <= 0:
             return []
-        
-        result = []
-        for _ in range(n):
-            try:
-                result.append(next(generator))
-            except StopIteration:
-                break
-        return result
+        return list(islice(generator, n))
         
     except Exception as e:
-        raise GeneratorException(f"Ошибка при получении элементов: {e}")
\ No newline at end of file
+        raise GeneratorException(f"Ошибка при получении элементов: {e}")
@@ -0,0 +1,216 @@
+"""
+Необязательные счетчики и замеры времени для генераторов
+
+Включение: instrumentation.enable() или переменная окружения
+GENERATORS_INSTRUMENTATION=1. В выключенном состоянии обертка добавляет
+одну проверку флага на вызов функции и ничего не добавляет на элемент.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+_enabled = os.environ.get("GENERATORS_INSTRUMENTATION", "") not in ("", "0")
+_lock = threading.Lock()
+_stats: Dict[str, "GeneratorStats"] = {}
+_timings: Dict[str, float] = {}
+
+
+class GeneratorStats:
+    """Накопленная статистика одного генератора"""
+
+    __slots__ = ("name", "calls", "items", "wall_time", "active_time", "cpu_time",
+                 "first_item_time", "errors")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.items = 0
+        self.wall_time = 0.0        # от вызова до завершения, включая время потребителя
+        self.active_time = 0.0      # время внутри генератора
+        self.cpu_time = 0.0         # процессорное время потока внутри генератора
+        self.first_item_time = 0.0  # суммарное время до первого элемента
+        self.errors = 0
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.items / self.active_time if self.active_time > 0 else 0.0
+
+    @property
+    def mean_first_item_time(self) -> float:
+        return self.first_item_time / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "wall_time": self.wall_time,
+            "active_time": self.active_time,
+            "cpu_time": self.cpu_time,
+            "mean_first_item_time": self.mean_first_item_time,
+            "items_per_sec": self.items_per_sec,
+            "errors": self.errors,
+        }
+
+
+def enable() -> None:
+    """Включение сбора статистики"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Выключение сбора статистики (накопленные данные сохраняются)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _record(name: str, items: int, wall: float, active: float, cpu: float,
+            first: Optional[float], error: bool) -> None:
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = GeneratorStats(name)
+        stats.calls += 1
+        stats.items += items
+        stats.wall_time += wall
+        stats.active_time += active
+        stats.cpu_time += cpu
+        stats.first_item_time += first if first is not None else wall
+        stats.errors += error
+
+
+def _measure_generator(name: str, generator, started: float):
+    """Проход по генератору с замером времени каждого шага"""
+    perf_counter = time.perf_counter
+    thread_time = time.thread_time
+    items = 0
+    active = 0.0
+    cpu = 0.0
+    first = None
+    error = False
+    try:
+        while True:
+            t0 = perf_counter()
+            c0 = thread_time()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            except BaseException:
+                error = True
+                raise
+            finally:
+                t1 = perf_counter()
+                active += t1 - t0
+                cpu += thread_time() - c0
+            if first is None:
+                first = t1 - started
+            items += 1
+            yield item
+    finally:
+        generator.close()
+        _record(name, items, perf_counter() - started, active, cpu, first, error)
+
+
+def instrumented(func: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Декоратор для функций модуля generators.
+
+    Для генераторных функций считает элементы, время внутри генератора,
+    процессорное время и время до первого элемента; для обычных функций,
+    возвращающих коллекцию, — размер результата и время вызова.
+    """
+    def decorate(func: Callable) -> Callable:
+        stats_name = name or func.__name__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _measure_generator(stats_name, func(*args, **kwargs), time.perf_counter())
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                cpu_started = time.thread_time()
+                error = True
+                result = None
+                try:
+                    result = func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    wall = time.perf_counter() - started
+                    items = len(result) if hasattr(result, "__len__") else 0
+                    _record(stats_name, items, wall, wall, time.thread_time() - cpu_started, wall, error)
+
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """
+    Запись разового замера (например, времени запуска окна).
+
+    Разовые замеры сохраняются всегда, независимо от enable()/disable().
+    """
+    with _lock:
+        _timings[name] = seconds
+
+
+def get_timings() -> Dict[str, float]:
+    """Снимок разовых замеров: {имя: секунды}"""
+    with _lock:
+        return dict(_timings)
+
+
+def get_stats() -> Dict[str, dict]:
+    """Снимок статистики: {имя функции: словарь показателей}"""
+    with _lock:
+        return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+def reset_stats() -> None:
+    """Сброс накопленной статистики"""
+    with _lock:
+        _stats.clear()
+
+
+def dump_stats(path: Optional[str] = None) -> str:
+    """
+    Статистика в формате JSON.
+
+    Args:
+        path: если задан, JSON также записывается в файл
+
+    Returns:
+        Строка JSON
+    """
+    data = {"enabled": _enabled, "stats": get_stats(), "timings": get_timings()}
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return text
+
+
+def format_summary() -> str:
+    """Краткая строка для строки состояния"""
+    parts = []
+    for name, stats in sorted(get_stats().items()):
+        parts.append(f"{name}: {stats['items']} эл., {stats['items_per_sec']:,.0f} эл/с")
+    return "; ".join(parts) if parts else "нет данных"
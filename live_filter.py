@@ -0,0 +1,153 @@
+"""
+Инкрементальная фильтрация городов при редактировании текста
+"""
+
+import re
+from os.path import commonprefix
+from typing import Iterator, List
+
+import numpy as np
+
+from cities import MIN_CITY_LENGTH
+from generators import GeneratorException
+
+
+_TOKEN_RE = re.compile(r"\S+")
+_BLOCK = 4096
+
+
+def _common_prefix_length(a: str, b: str, limit: int) -> int:
+    """Длина общего префикса (сравнение блоками растущего размера)"""
+    pos, block = 0, _BLOCK
+    while pos + block <= limit and a[pos:pos + block] == b[pos:pos + block]:
+        pos += block
+        block *= 2
+    while block > _BLOCK and pos + _BLOCK <= limit and a[pos:pos + _BLOCK] == b[pos:pos + _BLOCK]:
+        pos += _BLOCK
+    tail = min(limit, pos + _BLOCK)
+    return pos + len(commonprefix([a[pos:tail], b[pos:tail]]))
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Длина общего суффикса не длиннее limit"""
+    pos, block = 0, _BLOCK
+    len_a, len_b = len(a), len(b)
+    while pos + block <= limit and a[len_a - pos - block:len_a - pos] == b[len_b - pos - block:len_b - pos]:
+        pos += block
+        block *= 2
+    while block > _BLOCK and pos + _BLOCK <= limit and \
+            a[len_a - pos - _BLOCK:len_a - pos] == b[len_b - pos - _BLOCK:len_b - pos]:
+        pos += _BLOCK
+    size = min(limit - pos, _BLOCK)
+    tail_a = a[len_a - pos - size:len_a - pos][::-1]
+    tail_b = b[len_b - pos - size:len_b - pos][::-1]
+    return pos + len(commonprefix([tail_a, tail_b]))
+
+
+class IncrementalCityFilter:
+    """
+    Фильтр городов длиннее min_length символов для редактируемого текста.
+
+    Границы всех названий хранятся в массивах NumPy. При правке
+    заново разбирается только измененный участок (вместе с задетыми
+    правкой названиями), границы остальных названий сдвигаются одной
+    векторной операцией, а число подходящих городов обновляется на
+    разницу. Разбиение совпадает с str.split() в generators.filter_long_cities.
+    """
+
+    __slots__ = ("min_length", "_text", "_starts", "_ends", "_count")
+
+    def __init__(self, text: str = "", min_length: int = MIN_CITY_LENGTH):
+        """
+        Args:
+            text: исходный текст с названиями через пробельные символы
+            min_length: в результат попадают названия длиннее min_length
+        """
+        self.min_length = min_length
+        self._text = ""
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._count = 0
+        if text:
+            self.edit(0, 0, text)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def count(self) -> int:
+        """Число подходящих городов"""
+        return self._count
+
+    @property
+    def token_count(self) -> int:
+        """Число всех названий в тексте"""
+        return len(self._starts)
+
+    def _matched(self, starts: np.ndarray, ends: np.ndarray) -> int:
+        return int(np.count_nonzero(ends - starts > self.min_length))
+
+    def edit(self, position: int, removed: int, inserted: str) -> None:
+        """
+        Правка текста: removed символов с позиции position заменяются на inserted
+        (как в сигнале QTextDocument.contentsChange).
+        """
+        text = self._text
+        end = position + removed
+        if not 0 <= position <= end <= len(text):
+            raise GeneratorException("Правка вне текста")
+        delta = len(inserted) - removed
+        new_text = text[:position] + inserted + text[end:]
+
+        # Названия, пересекающие правку или касающиеся ее границ, разбираются заново
+        starts, ends = self._starts, self._ends
+        first = int(np.searchsorted(ends, position, side="left"))
+        last = int(np.searchsorted(starts, end, side="right"))
+        span_start, span_end = position, end
+        if first < last:
+            span_start = min(span_start, int(starts[first]))
+            span_end = max(span_end, int(ends[last - 1]))
+
+        spans = [m.span() for m in _TOKEN_RE.finditer(new_text, span_start, span_end + delta)]
+        new_spans = np.array(spans, dtype=np.int64).reshape(-1, 2)
+        new_starts, new_ends = new_spans[:, 0], new_spans[:, 1]
+
+        self._count += self._matched(new_starts, new_ends) - \
+            self._matched(starts[first:last], ends[first:last])
+        self._starts = np.concatenate((starts[:first], new_starts, starts[last:] + delta))
+        self._ends = np.concatenate((ends[:first], new_ends, ends[last:] + delta))
+        self._text = new_text
+
+    def set_text(self, text: str) -> None:
+        """Новый текст: правка вычисляется по общему префиксу и суффиксу"""
+        old = self._text
+        if text == old:
+            return
+        limit = min(len(old), len(text))
+        prefix = _common_prefix_length(old, text, limit)
+        suffix = _common_suffix_length(old, text, limit - prefix)
+        self.edit(prefix, len(old) - prefix - suffix, text[prefix:len(text) - suffix])
+
+    def iter_matches(self) -> Iterator[str]:
+        """
+        Подходящие названия по порядку.
+
+        Итератор работает со снимком текущего состояния, поэтому
+        последующие правки его не затрагивают.
+        """
+        text = self._text
+        starts, ends = self._starts, self._ends
+        for index in np.flatnonzero(ends - starts > self.min_length).tolist():
+            yield text[starts[index]:ends[index]]
+
+    def first(self, k: int) -> List[str]:
+        """Первые k подходящих названий (просматривается только начало текста)"""
+        text = self._text
+        starts, ends = self._starts, self._ends
+        window = max(4 * k, 1024)
+        while True:
+            found = np.flatnonzero(ends[:window] - starts[:window] > self.min_length)[:k]
+            if len(found) == k or window >= len(starts):
+                return [text[starts[i]:ends[i]] for i in found.tolist()]
+            window *= 2
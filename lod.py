@@ -0,0 +1,210 @@
+"""
+Многоуровневое прореживание (min/max) значений функции для построения графиков
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from generators import GeneratorException
+from vectorized import function_point_count, function_x, _kernel
+
+
+TILE_BUCKETS = 1024
+MAX_TILES = 512
+EVAL_CHUNK = 1 << 20
+
+Tile = Tuple[np.ndarray, np.ndarray]
+
+
+def minmax_decimate(values: np.ndarray, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Минимум и максимум значений в каждом из columns равных по числу точек столбцов.
+
+    Args:
+        values: одномерный массив
+        columns: число столбцов (пикселей по ширине)
+
+    Returns:
+        Пара массивов (mins, maxs) длиной min(columns, len(values))
+    """
+    if columns <= 0:
+        raise GeneratorException("Число столбцов должно быть положительным")
+    values = np.asarray(values, dtype=np.float64)
+    columns = min(columns, len(values))
+    if columns == 0:
+        return np.empty(0), np.empty(0)
+    bounds = (np.arange(columns) * len(values)) // columns
+    with np.errstate(invalid="ignore"):
+        return np.fmin.reduceat(values, bounds), np.fmax.reduceat(values, bounds)
+
+
+class FunctionTileCache:
+    """
+    Пирамида min/max-тайлов для значений функции на [a, b].
+
+    Уровень L делит точки x_i = a + i*step на корзины по 2**L точек; тайл —
+    TILE_BUCKETS подряд идущих корзин. Тайл уровня L строится из двух
+    тайлов уровня L-1, если они уже есть в кэше, иначе вычисляется по
+    исходным точкам блоками. Для окна шириной W пикселей выбирается
+    уровень, у которого корзина не шире пикселя, поэтому число
+    обрабатываемых корзин ~W независимо от длины диапазона. Недавно
+    использованные тайлы хранятся в LRU-кэше (MAX_TILES штук).
+
+    Тайлы можно вычислять в рабочем потоке, а запрашивать из потока
+    интерфейса: доступ к кэшу защищен блокировкой.
+    """
+
+    def __init__(self, a: float, b: float, step: float = 0.01,
+                 expression: Optional[str] = None, max_tiles: int = MAX_TILES):
+        self.a = a
+        self.b = b
+        self.step = step
+        self.expression = expression
+        self.count = function_point_count(a, b, step)
+        self.max_tiles = max_tiles
+        self._kernel = _kernel(expression)
+        self._tiles: "OrderedDict[Tuple[int, int], Tile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_level = max(0, math.ceil(math.log2(max(self.count / TILE_BUCKETS, 1))))
+
+    def x_at(self, index: float) -> float:
+        return self.a + index * self.step
+
+    def level_for(self, x0: float, x1: float, width: int) -> int:
+        """Уровень, у которого корзина покрывает не больше одного пикселя"""
+        samples_per_pixel = (x1 - x0) / self.step / max(width, 1)
+        if samples_per_pixel <= 1:
+            return 0
+        return min(int(math.floor(math.log2(samples_per_pixel))), self.max_level)
+
+    def tile_range(self, level: int, x0: float, x1: float) -> range:
+        """Номера тайлов уровня level, покрывающих [x0, x1]"""
+        span = TILE_BUCKETS << level
+        first = max(int(math.floor((x0 - self.a) / self.step)), 0)
+        last = min(int(math.ceil((x1 - self.a) / self.step)), self.count - 1)
+        if last < first:
+            return range(0)
+        return range(first // span, last // span + 1)
+
+    def cached_tile(self, level: int, index: int) -> Optional[Tile]:
+        with self._lock:
+            tile = self._tiles.get((level, index))
+            if tile is not None:
+                self._tiles.move_to_end((level, index))
+            return tile
+
+    def _store(self, level: int, index: int, tile: Tile) -> Tile:
+        with self._lock:
+            self._tiles[(level, index)] = tile
+            self._tiles.move_to_end((level, index))
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def compute_tile(self, level: int, index: int, token=None) -> Tile:
+        """
+        Тайл (mins, maxs) уровня level с номером index.
+
+        Args:
+            token: CancelToken (см. tasks.py), проверяется между блоками вычислений
+        """
+        tile = self.cached_tile(level, index)
+        if tile is not None:
+            return tile
+
+        if level > 0:
+            children = [self.cached_tile(level - 1, 2 * index + k) for k in (0, 1)]
+            if children[0] is not None and (children[1] is not None or self._tile_empty(level - 1, 2 * index + 1)):
+                return self._store(level, index, self._merge_children(children))
+
+        bucket = 1 << level
+        start = (index * TILE_BUCKETS) << level
+        stop = min(start + (TILE_BUCKETS << level), self.count)
+        if start >= stop:
+            raise GeneratorException("Тайл вне диапазона")
+        chunk = max(EVAL_CHUNK // bucket, 1) * bucket
+        mins, maxs = [], []
+        for chunk_start in range(start, stop, chunk):
+            if token is not None:
+                token.raise_if_cancelled()
+            chunk_stop = min(chunk_start + chunk, stop)
+            values = self._kernel(function_x(self.a, self.step, chunk_start, chunk_stop))
+            bounds = np.arange(0, len(values), bucket)
+            with np.errstate(invalid="ignore"):
+                mins.append(np.fmin.reduceat(values, bounds))
+                maxs.append(np.fmax.reduceat(values, bounds))
+        return self._store(level, index, (np.concatenate(mins), np.concatenate(maxs)))
+
+    def _tile_empty(self, level: int, index: int) -> bool:
+        return (index * TILE_BUCKETS) << level >= self.count
+
+    @staticmethod
+    def _merge_children(children: List[Optional[Tile]]) -> Tile:
+        """Тайл уровня L из двух тайлов уровня L-1 (попарный min/max корзин)"""
+        mins = np.concatenate([c[0] for c in children if c is not None])
+        maxs = np.concatenate([c[1] for c in children if c is not None])
+        bounds = np.arange(0, len(mins), 2)
+        with np.errstate(invalid="ignore"):
+            return np.fmin.reduceat(mins, bounds), np.fmax.reduceat(maxs, bounds)
+
+    def _best_available(self, level: int, index: int):
+        """Тайл нужного уровня или более грубый предок из кэша: (уровень, номер, тайл)"""
+        for up in range(0, self.max_level - level + 1):
+            tile = self.cached_tile(level + up, index >> up)
+            if tile is not None:
+                return level + up, index >> up, tile
+        return None
+
+    def query(self, x0: float, x1: float, width: int,
+              compute: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[int, int]]]:
+        """
+        Значения для отрисовки окна [x0, x1] шириной width пикселей.
+
+        Args:
+            compute: вычислять недостающие тайлы; если False, вместо них
+                используются более грубые тайлы из кэша или пропуски
+
+        Returns:
+            (xs, mins, maxs, missing): x центра каждого столбца, минимум и
+            максимум в столбце (NaN — нет данных) и список недостающих
+            тайлов (уровень, номер) для постепенного уточнения
+        """
+        if width <= 0 or x1 <= x0:
+            raise GeneratorException("Некорректное окно графика")
+        level = self.level_for(x0, x1, width)
+        centers, mins, maxs, missing = [], [], [], []
+        for index in self.tile_range(level, x0, x1):
+            if compute:
+                found = (level, index, self.compute_tile(level, index))
+            else:
+                found = self._best_available(level, index)
+                if found is None or found[0] != level:
+                    missing.append((level, index))
+                if found is None:
+                    continue
+            tile_level, tile_index, (tile_mins, tile_maxs) = found
+            bucket = 1 << tile_level
+            first = (tile_index * TILE_BUCKETS) << tile_level
+            bucket_centers = first + np.arange(len(tile_mins)) * bucket + (bucket - 1) / 2
+            centers.append(self.a + bucket_centers * self.step)
+            mins.append(tile_mins)
+            maxs.append(tile_maxs)
+
+        xs = x0 + (np.arange(width) + 0.5) * (x1 - x0) / width
+        column_mins = np.full(width, np.nan)
+        column_maxs = np.full(width, np.nan)
+        if centers:
+            centers = np.concatenate(centers)
+            mins = np.concatenate(mins)
+            maxs = np.concatenate(maxs)
+            columns = np.floor((centers - x0) / (x1 - x0) * width).astype(np.int64)
+            inside = (columns >= 0) & (columns < width)
+            columns, mins, maxs = columns[inside], mins[inside], maxs[inside]
+            if len(columns):
+                np.fmin.at(column_mins, columns, mins)
+                np.fmax.at(column_maxs, columns, maxs)
+        return xs, column_mins, column_maxs, missing
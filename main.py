@@ -1,22 +1,33 @@
 """
 Точка входа в приложение
+
+Без аргументов запускается графический интерфейс; с аргументами —
+консольный режим (см. cli.py), в котором PySide6 не загружается.
 """
 
 import sys
-from PySide6.QtWidgets import QApplication
-from ui.main_window import GeneratorApp
+import time
+
+STARTED_AT = time.perf_counter()
 
 
 def main():
     """Основная функция запуска приложения"""
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        return cli_main(sys.argv[1:])
+    
     try:
+        from PySide6.QtWidgets import QApplication
+        from ui.main_window import GeneratorApp
+        
         # Создание приложения
         app = QApplication(sys.argv)
         app.setApplicationName("Генераторы Python - Вариант 2")
         app.setOrganizationName("Python Lab")
         
         # Создание и отображение главного окна
-        window = GeneratorApp()
+        window = GeneratorApp(started_at=STARTED_AT)
         window.show()
         
         # Запуск цикла обработки событий
@@ -28,4 +39,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
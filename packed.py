@@ -0,0 +1,157 @@
+"""
+Компактное хранение строк одинаковой длины в одном буфере
+"""
+
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Optional, Union
+
+from generators import GeneratorException
+
+
+# Кодировки с фиксированным числом байт на символ
+CHAR_SIZES = {"ascii": 1, "latin-1": 1, "utf-32-le": 4}
+
+
+class PackedStrings(Sequence):
+    """
+    Неизменяемая последовательность строк одинаковой длины.
+
+    Все элементы лежат подряд в одном буфере bytes по width байт, поэтому
+    на элемент не тратится отдельный объект str (~50 байт для строки из
+    двух символов против 2 байт в буфере). Строка создается только при
+    чтении элемента; срезы с шагом 1 разделяют буфер через memoryview без
+    копирования. Передача между потоками — передача одной ссылки.
+    """
+
+    __slots__ = ("_view", "width", "encoding")
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview], width: int,
+                 encoding: str = "ascii"):
+        """
+        Args:
+            buffer: элементы подряд, по width байт
+            width: размер элемента в байтах
+            encoding: кодировка с фиксированным размером символа (см. CHAR_SIZES)
+        """
+        char_size = CHAR_SIZES.get(encoding)
+        if char_size is None:
+            raise GeneratorException(f"Неподдерживаемая кодировка: {encoding}")
+        if width < 1 or width % char_size:
+            raise GeneratorException("Размер элемента должен быть кратен размеру символа")
+        view = memoryview(buffer).cast("B")
+        if len(view) % width:
+            raise GeneratorException("Размер буфера не кратен размеру элемента")
+        self._view = view.toreadonly()
+        self.width = width
+        self.encoding = encoding
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str], length: Optional[int] = None,
+                     encoding: str = "ascii") -> "PackedStrings":
+        """
+        Упаковка строк одинаковой длины.
+
+        Args:
+            strings: исходные строки
+            length: длина строки в символах (по умолчанию — длина первой строки)
+            encoding: кодировка буфера
+
+        Returns:
+            Последовательность с общим буфером
+        """
+        char_size = CHAR_SIZES.get(encoding)
+        if char_size is None:
+            raise GeneratorException(f"Неподдерживаемая кодировка: {encoding}")
+        buffer = bytearray()
+        for string in strings:
+            if length is None:
+                length = len(string)
+            if len(string) != length:
+                raise GeneratorException(f"Ожидается строка длины {length}: {string!r}")
+            buffer += string.encode(encoding)
+        return cls(bytes(buffer), max(length or 1, 1) * char_size, encoding)
+
+    @property
+    def nbytes(self) -> int:
+        """Размер буфера в байтах"""
+        return len(self._view)
+
+    def tobytes(self) -> bytes:
+        return self._view.tobytes()
+
+    def __len__(self) -> int:
+        return len(self._view) // self.width
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, "PackedStrings"]:
+        width = self.width
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:
+                return PackedStrings(self._view[start * width:max(stop, start) * width], width, self.encoding)
+            view = self._view
+            data = b"".join(view[i * width:(i + 1) * width] for i in range(start, stop, step))
+            return PackedStrings(data, width, self.encoding)
+        size = len(self)
+        if item < 0:
+            item += size
+        if not 0 <= item < size:
+            raise IndexError("Индекс вне диапазона")
+        return str(self._view[item * width:(item + 1) * width], self.encoding)
+
+    def __iter__(self) -> Iterator[str]:
+        # Один вызов decode на весь буфер, затем нарезка готовой строки
+        text = str(self._view, self.encoding)
+        length = self.width // CHAR_SIZES[self.encoding]
+        for start in range(0, len(text), length):
+            yield text[start:start + length]
+
+    def __contains__(self, value) -> bool:
+        try:
+            self.index(value)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        """Позиция строки: поиск подстроки в буфере с выравниванием по элементам"""
+        if isinstance(value, str):
+            try:
+                needle = value.encode(self.encoding)
+            except UnicodeEncodeError:
+                needle = b""
+            if len(needle) == self.width:
+                width = self.width
+                data = self._view.obj if self._is_whole() else self._view.tobytes()
+                stop = len(self) if stop is None else min(stop, len(self))
+                pos = data.find(needle, max(start, 0) * width, stop * width)
+                while pos != -1:
+                    if pos % width == 0:
+                        return pos // width
+                    pos = data.find(needle, pos + 1, stop * width)
+        raise ValueError(f"{value!r} нет в последовательности")
+
+    def count(self, value) -> int:
+        return sum(1 for item in self if item == value) if value in self else 0
+
+    def _is_whole(self) -> bool:
+        """Буфер совпадает с исходным объектом bytes целиком"""
+        obj = self._view.obj
+        return isinstance(obj, bytes) and len(obj) == len(self._view)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedStrings):
+            if self.encoding == other.encoding and self.width == other.width:
+                return self._view == other._view
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return PackedStrings, (self.tobytes(), self.width, self.encoding)
+
+    def __repr__(self) -> str:
+        preview = ", ".join(repr(item) for item in self[:5])
+        more = ", ..." if len(self) > 5 else ""
+        return f"PackedStrings([{preview}{more}], len={len(self)}, width={self.width})"
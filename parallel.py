@@ -0,0 +1,67 @@
+"""
+Упорядоченное выполнение шардов в пуле процессов
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Generator, Optional, Sequence
+
+from generators import GeneratorException
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Число процессов: None — os.cpu_count(), иначе положительное число.
+
+    Raises:
+        GeneratorException: если workers меньше 1 (в том числе 0)
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise GeneratorException("Число процессов должно быть положительным")
+    return workers
+
+
+def ordered_map(func: Callable[..., Any], arguments: Sequence[tuple],
+                workers: Optional[int] = None) -> Generator[Any, None, None]:
+    """
+    func(*args) для каждого набора аргументов; результаты — в порядке arguments.
+
+    В работе одновременно не больше 2*workers заданий, чтобы медленный
+    потребитель не накапливал готовые результаты в памяти; при досрочном
+    закрытии генератора незапущенные задания отменяются. При одном
+    процессе или одном задании пул не создается.
+
+    Args:
+        func: функция уровня модуля (передается в процессы через pickle)
+        arguments: наборы позиционных аргументов
+        workers: число процессов (по умолчанию os.cpu_count())
+
+    Yields:
+        Результаты func в порядке arguments
+    """
+    workers = resolve_workers(workers)
+    if workers == 1 or len(arguments) <= 1:
+        for args in arguments:
+            yield func(*args)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(arguments))) as executor:
+        pending = deque()
+        remaining = iter(arguments)
+        try:
+            for args in remaining:
+                pending.append(executor.submit(func, *args))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for args in remaining:
+                    pending.append(executor.submit(func, *args))
+                    break
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,128 @@
+"""
+Ленивые конвейеры обработки поверх генераторов
+"""
+
+from collections import deque
+from functools import reduce as _reduce
+from itertools import islice
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from generators import GeneratorException
+
+
+T = TypeVar("T")
+_MISSING = object()
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Разбиение на списки по size элементов (последний может быть короче)"""
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+class Stream(Generic[T]):
+    """
+    Ленивый конвейер: map/filter/skip/take/batch над любым итерируемым объектом.
+
+    Методы не выполняют вычислений, а возвращают новый Stream с добавленной
+    стадией. При запуске каждая стадия превращается во встроенный итератор
+    (map, filter, itertools.islice), так что элементы проходят по цепочке
+    на уровне C, без Python-кадра на каждую стадию. Соседние skip/take
+    сливаются в один islice.
+
+    Пример:
+        Stream(letter_combinations()).filter(str.isalpha).skip(10).take(5).to_list()
+    """
+
+    __slots__ = ("_source", "_stages")
+
+    def __init__(self, source: Iterable[T], _stages: Tuple = ()):
+        """
+        Args:
+            source: генератор, итератор или коллекция
+        """
+        self._source = source
+        self._stages = _stages
+
+    def _with(self, stage: tuple) -> "Stream":
+        stages = self._stages
+        if stage[0] == "slice" and stages and stages[-1][0] == "slice":
+            _, start1, stop1 = stages[-1]
+            _, start2, stop2 = stage
+            start = start1 + start2
+            stop = stop1 if stop2 is None else start1 + stop2
+            if stop1 is not None and stop is not None:
+                stop = min(stop, stop1)
+            return Stream(self._source, stages[:-1] + (("slice", start, stop),))
+        return Stream(self._source, stages + (stage,))
+
+    def map(self, func: Callable[[T], Any]) -> "Stream":
+        """Преобразование каждого элемента"""
+        return self._with(("map", func))
+
+    def filter(self, predicate: Optional[Callable[[T], Any]] = None) -> "Stream[T]":
+        """Отбор элементов по условию (None — истинные элементы)"""
+        return self._with(("filter", predicate))
+
+    def skip(self, n: int) -> "Stream[T]":
+        """Пропуск первых n элементов"""
+        return self._with(("slice", max(n, 0), None))
+
+    def take(self, n: int) -> "Stream[T]":
+        """Не более n первых элементов"""
+        return self._with(("slice", 0, max(n, 0)))
+
+    def batch(self, size: int) -> "Stream[List[T]]":
+        """Группировка в списки по size элементов"""
+        if size <= 0:
+            raise GeneratorException("Размер пакета должен быть положительным")
+        return self._with(("batch", size))
+
+    chunk = batch
+
+    def distinct(self, **options) -> "Stream[T]":
+        """Только первые вхождения элементов (параметры — как у dedup.deduplicate)"""
+        return self._with(("distinct", options))
+
+    def __iter__(self) -> Iterator[T]:
+        iterator = iter(self._source)
+        for stage in self._stages:
+            kind = stage[0]
+            if kind == "map":
+                iterator = map(stage[1], iterator)
+            elif kind == "filter":
+                iterator = filter(stage[1], iterator)
+            elif kind == "slice":
+                iterator = islice(iterator, stage[1], stage[2])
+            elif kind == "distinct":
+                from dedup import deduplicate
+                iterator = deduplicate(iterator, **stage[1])
+            else:
+                iterator = _batched(iterator, stage[1])
+        return iterator
+
+    def reduce(self, func: Callable[[Any, T], Any], initial: Any = _MISSING) -> Any:
+        """Свертка элементов функцией func"""
+        iterator = iter(self)
+        if initial is _MISSING:
+            initial = next(iterator, _MISSING)
+            if initial is _MISSING:
+                raise GeneratorException("Свертка пустого потока без начального значения")
+        return _reduce(func, iterator, initial)
+
+    def to_list(self) -> List[T]:
+        """Материализация в список"""
+        return list(self)
+
+    def count(self) -> int:
+        """Количество элементов (без хранения элементов)"""
+        counter = deque(enumerate(self, 1), maxlen=1)
+        return counter[0][0] if counter else 0
+
+    def first(self, default: Any = _MISSING) -> T:
+        """Первый элемент потока"""
+        for item in self.take(1):
+            return item
+        if default is _MISSING:
+            raise GeneratorException("Поток пуст")
+        return default
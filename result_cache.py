@@ -0,0 +1,297 @@
+"""
+Постоянный кэш результатов генераторов на диске (SQLite)
+
+Ключ записи — имя генератора, параметры и версия кода (хэш исходного
+текста функции), поэтому изменение параметров или самой функции дает
+новый ключ, а старые записи вытесняются по мере заполнения кэша.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from generators import GeneratorException
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT = 30.0
+
+KIND_FLOATS = "f8"
+KIND_STRINGS = "str"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def default_cache_path() -> str:
+    """Путь к файлу кэша: $GENERATORS_CACHE_DIR или ~/.cache/generators"""
+    directory = os.environ.get("GENERATORS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "generators")
+    return os.path.join(directory, "results.sqlite")
+
+
+@lru_cache(maxsize=None)
+def code_version(func: Callable) -> str:
+    """
+    Версия кода: хэш исходного текста модуля, в котором определена функция.
+
+    Берется весь модуль, а не только функция, чтобы учитывались изменения
+    во вспомогательных функциях (например, в ядре вычисления f(x)).
+    """
+    target = inspect.unwrap(func)
+    try:
+        source = inspect.getsource(inspect.getmodule(target))
+    except (OSError, TypeError):
+        source = f"{target.__module__}.{target.__qualname__}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def make_key(name: str, params: Dict[str, Any], version: str) -> str:
+    """Ключ записи по имени, параметрам и версии кода"""
+    payload = json.dumps([name, params, version], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Короткий хэш большого текстового параметра (вместо самого текста в ключе)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _encode(values) -> tuple:
+    """Компактное двоичное представление: float64 или UTF-8 строки через нулевой байт"""
+    if isinstance(values, (list, tuple)) and all(isinstance(v, str) for v in values):
+        return KIND_STRINGS, zlib.compress("\0".join(values).encode("utf-8"))
+    import numpy as np
+    return KIND_FLOATS, zlib.compress(np.asarray(values, dtype="<f8").tobytes())
+
+
+def _decode(kind: str, data: bytes):
+    raw = zlib.decompress(data)
+    if kind == KIND_STRINGS:
+        return raw.decode("utf-8").split("\0") if raw else []
+    import numpy as np
+    return np.frombuffer(raw, dtype="<f8")
+
+
+class ResultCache:
+    """
+    Кэш результатов в файле SQLite.
+
+    Безопасен для нескольких процессов: журнал WAL, ожидание блокировок
+    до BUSY_TIMEOUT секунд, запись и вытеснение — в одной транзакции
+    BEGIN IMMEDIATE. Суммарный размер данных ограничен max_bytes; при
+    переполнении удаляются записи, к которым дольше всего не обращались.
+    Ошибки базы не прерывают вычисления: get_or_compute в этом случае
+    просто вычисляет результат заново.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: путь к файлу базы (по умолчанию default_cache_path())
+            max_bytes: предельный суммарный размер сжатых данных
+        """
+        if max_bytes <= 0:
+            raise GeneratorException("Размер кэша должен быть положительным")
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Соединение текущего потока (sqlite3 не разрешает общие соединения)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def get(self, name: str, params: Dict[str, Any], version: str = ""):
+        """Сохраненный результат или None"""
+        key = make_key(name, params, version)
+        connection = self._connect()
+        row = connection.execute("SELECT kind, data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        return _decode(*row)
+
+    def put(self, name: str, params: Dict[str, Any], values, version: str = "") -> None:
+        """Сохранение результата (список строк или последовательность чисел)"""
+        key = make_key(name, params, version)
+        kind, data = _encode(values)
+        if len(data) > self.max_bytes:
+            return
+        now = time.time()
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, name, kind, data, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, name, kind, data, len(data), now, now),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Удаление давно не использованных записей сверх max_bytes"""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT key, size FROM results ORDER BY accessed").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def invalidate(self, name: Optional[str] = None) -> int:
+        """Удаление записей генератора name (или всех); возвращает число записей"""
+        connection = self._connect()
+        if name is None:
+            cursor = connection.execute("DELETE FROM results")
+        else:
+            cursor = connection.execute("DELETE FROM results WHERE name = ?", (name,))
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Количество записей и их суммарный размер"""
+        count, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": size}
+
+    def get_or_compute(self, name: str, params: Dict[str, Any], compute: Callable[[], Any],
+                       version: str = ""):
+        """
+        Результат из кэша или вычисленный compute() и сохраненный.
+
+        Args:
+            name: имя генератора
+            params: параметры (сериализуемые в JSON)
+            compute: функция без аргументов, возвращающая результат
+            version: версия кода (см. code_version)
+        """
+        try:
+            cached = self.get(name, params, version)
+        except sqlite3.Error:
+            return compute()
+        if cached is not None:
+            return cached
+        values = compute()
+        try:
+            self.put(name, params, values, version)
+        except sqlite3.Error:
+            pass
+        return values
+
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> ResultCache:
+    """Общий кэш процесса в default_cache_path()"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
+
+
+def _cached(name: str, params: Dict[str, Any], compute: Callable[[], Any], version: str,
+            cache: Optional[ResultCache]):
+    """get_or_compute; если кэш недоступен (нет прав на каталог и т.п.) — просто compute()"""
+    try:
+        cache = cache or get_default_cache()
+    except (OSError, sqlite3.Error):
+        return compute()
+    return cache.get_or_compute(name, params, compute, version)
+
+
+def cached_function_values(a: float, b: float, step: float = 0.01,
+                           expression: Optional[str] = None,
+                           cache: Optional[ResultCache] = None,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           chunk_size: Optional[int] = None):
+    """
+    Значения функции на [a, b] (массив float64) с постоянным кэшированием.
+
+    Версия кода учитывает и модуль выражений, если задано expression.
+    При промахе кэша значения вычисляются блоками, и после каждого блока
+    вызывается progress(done, total); исключение из progress (например,
+    отмена задачи) прерывает вычисление, и в кэш ничего не записывается.
+
+    Args:
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        expression: пользовательское выражение от x
+        cache: кэш (по умолчанию get_default_cache())
+        progress: обратный вызов прогресса вычисления
+        chunk_size: размер блока (по умолчанию vectorized.DEFAULT_CHUNK_SIZE)
+    """
+    import numpy as np
+    from vectorized import DEFAULT_CHUNK_SIZE, function_chunks, function_point_count, function_values
+    from expressions import compile_expression, normalize_expression
+
+    params = {"a": a, "b": b, "step": step,
+              "expression": normalize_expression(expression) if expression is not None else None}
+    version = code_version(function_values)
+    if expression is not None:
+        version += code_version(compile_expression)
+
+    def compute():
+        if progress is None:
+            return function_values(a, b, step, expression)
+        total = function_point_count(a, b, step)
+        values = np.empty(total, dtype=np.float64)
+        done = 0
+        for chunk in function_chunks(a, b, step, chunk_size or DEFAULT_CHUNK_SIZE, expression):
+            values[done:done + len(chunk)] = chunk
+            done += len(chunk)
+            progress(done, total)
+        return values
+
+    return _cached("function_values", params, compute, version, cache)
+
+
+def cached_filter_long_cities(cities_str: str, cache: Optional[ResultCache] = None) -> List[str]:
+    """Результат filter_long_cities (список) с постоянным кэшированием"""
+    from generators import filter_long_cities
+
+    return _cached("filter_long_cities", {"text": text_digest(cities_str)},
+                   lambda: list(filter_long_cities(cities_str)), code_version(filter_long_cities), cache)
@@ -0,0 +1,366 @@
+"""
+Локальный HTTP-сервис генераторов на asyncio (без внешних зависимостей)
+
+Запуск:
+    python server.py --port 8765
+    python main.py serve --port 8765
+
+Запросы (GET, ответ — chunked, по умолчанию NDJSON, ?format=binary — двоичный):
+    /letters?count=100&alphabet=abc&length=3
+    /function?a=-5&b=7&step=0.01&expression=sin(x)
+    /cities?text=Москва+Казань&min_length=5   (или POST с текстом в теле)
+    /stats                                     (статистика instrumentation)
+
+Двоичный формат совпадает с консольным режимом: значения функции — float64
+little-endian, строки — UTF-8, завершенные нулевым байтом.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import sys
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from generators import GeneratorException
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_BATCH_SIZE = 4096
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 64 * 1024 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+# Границы параметров: обработчики выполняются в цикле событий, поэтому
+# размер пространства (base ** length) и число точек функции ограничены
+MAX_ALPHABET_SIZE = 1024
+MAX_COMBINATION_LENGTH = 64
+MAX_FUNCTION_POINTS = 10 ** 9
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    """Ошибка запроса с HTTP-кодом"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """Разобранный HTTP-запрос"""
+
+    __slots__ = ("method", "path", "query", "version", "headers", "body")
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str], body: bytes):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Чтение одного запроса (None — клиент закрыл соединение)"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HttpError(400, "Неполный запрос")
+    except asyncio.LimitOverrunError:
+        raise HttpError(400, "Слишком длинные заголовки")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HttpError(400, "Некорректная строка запроса")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    body = b""
+    length = headers.get("content-length")
+    if length:
+        if not length.isdigit():
+            raise HttpError(400, "Некорректный Content-Length")
+        if int(length) > MAX_BODY_SIZE:
+            raise HttpError(413, "Слишком большое тело запроса")
+        body = await reader.readexactly(int(length))
+    return Request(method, target, version, headers, body)
+
+
+def _param(query: Dict[str, str], name: str, cast, default):
+    if name not in query:
+        return default
+    try:
+        return cast(query[name])
+    except ValueError:
+        raise HttpError(400, f"Некорректный параметр {name}")
+
+
+def _encode_strings(batch: list, fmt: str) -> bytes:
+    if fmt == "binary":
+        return b"".join(item.encode("utf-8") + b"\0" for item in batch)
+    return "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in batch).encode("utf-8")
+
+
+def _encode_floats(values, fmt: str) -> bytes:
+    if fmt == "binary":
+        return values.astype("<f8", copy=False).tobytes()
+    # Значения NaN и бесконечности не представимы в JSON
+    return "".join((repr(v) if math.isfinite(v) else "null") + "\n" for v in values.tolist()).encode("ascii")
+
+
+class GeneratorServer:
+    """
+    HTTP/1.1 сервер с потоковой выдачей результатов генераторов.
+
+    Соединения поддерживают keep-alive; одновременно обрабатывается не
+    больше max_concurrent запросов, остальные сразу получают 503.
+    Вычисления выполняются пакетами в пуле потоков (см. async_generators),
+    запись в сокет ждет drain(), поэтому медленный клиент притормаживает
+    генерацию, а не накапливает ответ в памяти. Кэши модуля expressions
+    общие для всех клиентов процесса.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.batch_size = batch_size
+        self._active = 0
+        self._server = None
+        self._routes = {
+            "/letters": self._letters,
+            "/function": self._function,
+            "/cities": self._cities,
+        }
+
+    async def start(self) -> None:
+        """Запуск сервера (при port=0 порт выбирается системой)"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_SIZE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def __aenter__(self) -> "GeneratorServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HttpError as e:
+                    await self._send_error(writer, e.status, str(e), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(request, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, request: Request, writer: asyncio.StreamWriter) -> bool:
+        """Обработка запроса; возвращает, можно ли продолжать соединение"""
+        keep_alive = request.keep_alive
+        if request.path == "/stats":
+            import instrumentation
+            body = instrumentation.dump_stats().encode("utf-8")
+            await self._send(writer, 200, body, "application/json", keep_alive)
+            return keep_alive
+
+        handler = self._routes.get(request.path)
+        if handler is None:
+            await self._send_error(writer, 404, "Неизвестный путь", keep_alive)
+            return keep_alive
+        if request.method not in ("GET", "POST"):
+            await self._send_error(writer, 405, "Поддерживаются GET и POST", keep_alive)
+            return keep_alive
+        if self._active >= self.max_concurrent:
+            await self._send_error(writer, 503, "Сервер занят", keep_alive)
+            return keep_alive
+
+        # Слот освобождается при любом исходе: ответе с ошибкой, завершении
+        # потока или исключении обработчика
+        self._active += 1
+        try:
+            try:
+                fmt = request.query.get("format", "ndjson")
+                if fmt not in ("ndjson", "binary"):
+                    raise HttpError(400, "Формат должен быть ndjson или binary")
+                try:
+                    content_type, chunks = handler(request, fmt)
+                except GeneratorException as e:
+                    raise HttpError(400, str(e))
+                except (ValueError, OverflowError, UnicodeDecodeError) as e:
+                    raise HttpError(400, f"Некорректные параметры: {e}")
+            except HttpError as e:
+                await self._send_error(writer, e.status, str(e), keep_alive)
+                return keep_alive
+            return await self._stream(writer, content_type, chunks, keep_alive)
+        finally:
+            self._active -= 1
+
+    async def _stream(self, writer: asyncio.StreamWriter, content_type: str,
+                      chunks: AsyncIterator[bytes], keep_alive: bool) -> bool:
+        """Отправка ответа с Transfer-Encoding: chunked"""
+        writer.write(self._head(200, content_type, keep_alive, chunked=True))
+        try:
+            async for data in chunks:
+                if data:
+                    writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    await writer.drain()
+        except GeneratorException:
+            # Заголовок уже отправлен: обрываем соединение без завершающего блока,
+            # чтобы клиент увидел неполный ответ
+            return False
+        finally:
+            await chunks.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return keep_alive
+
+    def _head(self, status: int, content_type: str, keep_alive: bool,
+              chunked: bool = False, length: int = 0) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}"]
+        lines.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        if status == 503:
+            lines.append("Retry-After: 1")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+                    content_type: str, keep_alive: bool) -> None:
+        writer.write(self._head(status, content_type, keep_alive, length=len(body)) + body)
+        await writer.drain()
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str,
+                          keep_alive: bool) -> None:
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        await self._send(writer, status, body, "application/json", keep_alive)
+
+    async def _encoded(self, iterable, encode, fmt: str, batch_size: int) -> AsyncIterator[bytes]:
+        from async_generators import aiterate_batches
+
+        batches = aiterate_batches(iterable, batch_size)
+        try:
+            async for batch in batches:
+                yield encode(batch, fmt)
+        finally:
+            await batches.aclose()
+
+    def _letters(self, request: Request, fmt: str) -> Tuple[str, AsyncIterator[bytes]]:
+        from combinations import CombinationSpace
+
+        query = request.query
+        alphabet = query.get("alphabet", "abcdefghijklmnopqrstuvwxyz")
+        length = _param(query, "length", int, 2)
+        if len(alphabet) > MAX_ALPHABET_SIZE:
+            raise HttpError(400, f"Алфавит длиннее {MAX_ALPHABET_SIZE} символов")
+        if length > MAX_COMBINATION_LENGTH:
+            raise HttpError(400, f"Длина сочетания больше {MAX_COMBINATION_LENGTH}")
+        space = CombinationSpace(alphabet, length)
+        count = _param(query, "count", int, None)
+        items = space if count is None else space[:max(count, 0)]
+        return self._content_type(fmt), self._encoded(items, _encode_strings, fmt, self.batch_size)
+
+    def _function(self, request: Request, fmt: str) -> Tuple[str, AsyncIterator[bytes]]:
+        from vectorized import function_chunks, function_point_count
+
+        query = request.query
+        a = _param(query, "a", float, -5.0)
+        b = _param(query, "b", float, 7.0)
+        step = _param(query, "step", float, 0.01)
+        expression = query.get("expression")
+        if function_point_count(a, b, step) > MAX_FUNCTION_POINTS:
+            raise HttpError(400, f"Больше {MAX_FUNCTION_POINTS} точек")
+        if expression is not None:
+            from expressions import compile_expression
+            compile_expression(expression)
+        chunks = function_chunks(a, b, step, self.batch_size * 16, expression)
+
+        def encode(batch, fmt):
+            return b"".join(_encode_floats(values, fmt) for values in batch)
+
+        return self._content_type(fmt), self._encoded(chunks, encode, fmt, 1)
+
+    def _cities(self, request: Request, fmt: str) -> Tuple[str, AsyncIterator[bytes]]:
+        from cities import filter_long_cities_stream
+
+        text = request.body.decode("utf-8") if request.method == "POST" else request.query.get("text", "")
+        if not text.strip():
+            raise HttpError(400, "Строка с городами не может быть пустой")
+        min_length = _param(request.query, "min_length", int, 5)
+        cities = filter_long_cities_stream(io.StringIO(text), min_length)
+        return self._content_type(fmt), self._encoded(cities, _encode_strings, fmt, self.batch_size)
+
+    @staticmethod
+    def _content_type(fmt: str) -> str:
+        return "application/octet-stream" if fmt == "binary" else "application/x-ndjson"
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          max_concurrent: int = DEFAULT_MAX_CONCURRENT) -> int:
+    """Запуск сервиса до прерывания с клавиатуры"""
+    server = GeneratorServer(host, port, max_concurrent)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP-сервис генераторов")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="адрес (по умолчанию только localhost)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="порт")
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT,
+                        help="максимум одновременных запросов")
+    args = parser.parse_args(argv)
+    return serve(args.host, args.port, args.max_concurrent)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
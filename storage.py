@@ -0,0 +1,92 @@
+"""
+Потоковая запись таблиц значений функции в файлы, отображаемые в память
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from generators import GeneratorException
+from vectorized import DEFAULT_CHUNK_SIZE, function_chunks, function_point_count
+
+
+FORMAT_NPY = "npy"
+FORMAT_RAW = "raw"
+RAW_DTYPE = np.dtype("<f8")
+
+
+def _resolve_format(path: str, fmt: Optional[str]) -> str:
+    """Формат файла: явно заданный или по расширению (.npy — NumPy, иначе сырые float64)"""
+    if fmt is None:
+        fmt = FORMAT_NPY if str(path).lower().endswith(".npy") else FORMAT_RAW
+    if fmt not in (FORMAT_NPY, FORMAT_RAW):
+        raise GeneratorException(f"Неизвестный формат файла: {fmt}")
+    return fmt
+
+
+def write_function_table(path: str, a: float, b: float, step: float = 0.01,
+                         expression: Optional[str] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         fmt: Optional[str] = None) -> int:
+    """
+    Вычисление значений функции на [a, b] блоками с записью прямо в файл.
+
+    Файл создается сразу нужного размера и отображается в память; каждый блок
+    записывается в свой срез и сбрасывается на диск, поэтому в памяти находится
+    не больше одного блока, а не вся таблица.
+
+    Args:
+        path: путь к файлу
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        expression: пользовательское выражение от x
+        chunk_size: количество точек в блоке
+        fmt: "npy" (с заголовком NumPy) или "raw" (float64 little-endian без заголовка)
+
+    Returns:
+        Количество записанных значений
+    """
+    fmt = _resolve_format(path, fmt)
+    count = function_point_count(a, b, step)
+    chunks = function_chunks(a, b, step, chunk_size, expression)
+
+    if fmt == FORMAT_NPY:
+        table = np.lib.format.open_memmap(path, mode="w+", dtype=RAW_DTYPE, shape=(count,))
+    else:
+        table = np.memmap(path, dtype=RAW_DTYPE, mode="w+", shape=(count,))
+
+    try:
+        start = 0
+        for chunk in chunks:
+            stop = start + len(chunk)
+            table[start:stop] = chunk
+            table.flush()
+            start = stop
+    except Exception:
+        del table
+        os.remove(path)
+        raise
+    del table
+    return count
+
+
+def read_function_table(path: str, fmt: Optional[str] = None) -> np.memmap:
+    """
+    Открытие таблицы без копирования: срезы читаются с диска по требованию.
+
+    Args:
+        path: путь к файлу
+        fmt: "npy" или "raw" (по умолчанию — по расширению)
+
+    Returns:
+        Массив только для чтения, отображенный в память
+    """
+    fmt = _resolve_format(path, fmt)
+    try:
+        if fmt == FORMAT_NPY:
+            return np.load(path, mmap_mode="r")
+        return np.memmap(path, dtype=RAW_DTYPE, mode="r")
+    except (OSError, ValueError) as e:
+        raise GeneratorException(f"Ошибка чтения таблицы: {e}")
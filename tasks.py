@@ -0,0 +1,73 @@
+"""
+Кооперативная отмена долгих вычислений
+"""
+
+import threading
+from itertools import islice
+from typing import Generator, Iterable, TypeVar
+
+from generators import GeneratorException
+
+
+T = TypeVar("T")
+DEFAULT_CHECK_INTERVAL = 1024
+
+
+class TaskCancelled(GeneratorException):
+    """Вычисление остановлено через CancelToken"""
+    pass
+
+
+class CancelToken:
+    """
+    Флаг отмены, который проверяет выполняющийся код.
+
+    Поток интерфейса вызывает cancel(), рабочий поток между пакетами
+    вызывает raise_if_cancelled() и завершает работу штатно, без
+    принудительной остановки потока.
+    """
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрос отмены"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Исключение TaskCancelled, если была запрошена отмена"""
+        if self._event.is_set():
+            raise TaskCancelled("Операция отменена")
+
+
+def cancellable(iterable: Iterable[T], token: CancelToken,
+                check_interval: int = DEFAULT_CHECK_INTERVAL) -> Generator[T, None, None]:
+    """
+    Обертка над генератором с проверкой отмены между пакетами.
+
+    Токен проверяется один раз на check_interval элементов, а не на каждый
+    элемент, поэтому накладные расходы почти нулевые.
+
+    Args:
+        iterable: любой генератор или итератор
+        token: токен отмены
+        check_interval: размер пакета между проверками
+
+    Yields:
+        Элементы исходного генератора
+    """
+    if check_interval <= 0:
+        raise GeneratorException("Интервал проверки должен быть положительным")
+    iterator = iter(iterable)
+    while True:
+        token.raise_if_cancelled()
+        batch = list(islice(iterator, check_interval))
+        if not batch:
+            return
+        yield from batch
@@ -0,0 +1,115 @@
+"""
+Тесты однопроходных агрегатов
+"""
+
+import pickle
+import random
+import statistics
+import pytest
+from generators import GeneratorException, filter_long_cities, function_generator, letter_combinations
+from aggregations import (
+    Count, FirstK, TopK, Summary, Histogram, QuantileSketch, Aggregate, Reducer, aggregate, merge_all,
+)
+
+
+CITIES = "Москва Казань Санкт-Петербург Уфа Владивосток Сочи Екатеринбург Новосибирск"
+
+
+def test_aggregate_single_pass():
+    """Все агрегаты за один проход по генератору"""
+    result = aggregate(
+        filter_long_cities(CITIES),
+        count=Count(),
+        first=FirstK(3),
+        longest=TopK(2, key=len),
+        lengths=Summary(key=len),
+        histogram=Histogram(),
+    )
+    cities = list(filter_long_cities(CITIES))
+    assert result["count"] == len(cities)
+    assert result["first"] == cities[:3]
+    assert result["longest"] == ["Санкт-Петербург", "Екатеринбург"]
+    assert result["lengths"]["max"] == 15
+    assert result["lengths"]["mean"] == pytest.approx(statistics.mean(map(len, cities)))
+    assert sum(result["histogram"].values()) == len(cities)
+
+
+def test_topk_ties_prefer_earlier():
+    top = TopK(2, key=len).update(["aa", "bb", "cc", "d"])
+    assert top.result() == ["aa", "bb"]
+    assert TopK(0).update([1, 2]).result() == []
+
+
+def test_summary_function_generator():
+    """Статистики значений функции совпадают с точными"""
+    values = list(function_generator(-5, 7))
+    summary = Summary().update(function_generator(-5, 7)).result()
+    assert summary["count"] == len(values)
+    assert summary["min"] == min(values) and summary["max"] == max(values)
+    assert summary["mean"] == pytest.approx(statistics.fmean(values))
+    assert summary["std"] == pytest.approx(statistics.pstdev(values))
+    assert Summary().result()["mean"] is None
+
+
+def test_histogram_bins():
+    histogram = Histogram(key=float, bin_width=0.5).update([0.1, 0.4, 0.6, 2.2])
+    assert histogram.result() == {0.0: 2, 0.5: 1, 2.0: 1}
+    with pytest.raises(GeneratorException):
+        Histogram(bin_width=0)
+
+
+def test_quantile_sketch_accuracy_and_memory():
+    """Ошибка ранга мала, а память ограничена"""
+    rng = random.Random(1)
+    values = [rng.random() for _ in range(100_000)]
+    sketch = QuantileSketch(k=200, quantiles=(0.1, 0.5, 0.9)).update(values)
+    ordered = sorted(values)
+    for q, estimate in sketch.result().items():
+        rank = ordered.index(estimate) / len(values)
+        assert abs(rank - q) < 0.02
+    assert sum(len(level) for level in sketch._levels) < 200 * 12
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merge_shards_equals_single_pass():
+    """Агрегаты шардов объединяются в порядке шардов"""
+    items = list(letter_combinations())
+    shards = [items[i:i + 100] for i in range(0, len(items), 100)]
+
+    def factory():
+        return Aggregate(count=Count(), first=FirstK(5), top=TopK(3),
+                         summary=Summary(key=len), quantiles=QuantileSketch(k=64, key=ord_sum))
+
+    # Агрегаты передаются между процессами через pickle
+    parts = [pickle.loads(pickle.dumps(factory().update(shard))) for shard in shards]
+    merged = merge_all(parts).result()
+    single = factory().update(items).result()
+    assert merged["count"] == single["count"] == 676
+    assert merged["first"] == single["first"]
+    assert merged["top"] == single["top"] == ["zz", "zy", "zx"]
+    assert merged["summary"] == single["summary"]
+    assert abs(merged["quantiles"][0.5] - single["quantiles"][0.5]) <= 2
+
+    with pytest.raises(GeneratorException):
+        Count().merge(FirstK(1))
+    with pytest.raises(GeneratorException):
+        merge_all([])
+
+
+def ord_sum(value):
+    return sum(map(ord, value))
+
+
+def test_incomplete_reducer():
+    """Агрегат без обязательных методов не создается"""
+    class NoMerge(Reducer):
+        def add(self, item):
+            pass
+
+        def result(self):
+            return None
+
+    with pytest.raises(TypeError):
+        NoMerge()
+    with pytest.raises(TypeError):
+        Reducer()
@@ -0,0 +1,87 @@
+"""
+Тесты асинхронных генераторов
+"""
+
+import asyncio
+from contextlib import aclosing
+import pytest
+from generators import letter_combinations, function_generator, filter_long_cities, GeneratorException
+from async_generators import (
+    aiterate_batches,
+    async_letter_combinations,
+    async_function_generator,
+    async_filter_long_cities,
+)
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+@pytest.mark.parametrize("offload", [True, False])
+def test_async_matches_sync(offload):
+    """Асинхронные версии выдают те же элементы"""
+    assert asyncio.run(_collect(async_letter_combinations(100, offload=offload))) == list(letter_combinations())
+    values = asyncio.run(_collect(async_function_generator(-5, 7, 0.01, batch_size=64, offload=offload)))
+    assert values == list(function_generator(-5, 7, 0.01))
+    cities = "Москва Казань Уфа Владивосток"
+    assert asyncio.run(_collect(async_filter_long_cities(cities, 1))) == list(filter_long_cities(cities))
+
+
+def test_backpressure_and_close():
+    """Не больше max_pending пакетов вперед, генератор закрывается при выходе"""
+    produced = []
+    closed = []
+
+    def source():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.append(True)
+
+    async def main():
+        async with aclosing(aiterate_batches(source(), batch_size=10, max_pending=2)) as batches:
+            async for batch in batches:
+                await asyncio.sleep(0.05)
+                assert len(produced) <= 10 * 4
+                break
+
+    asyncio.run(main())
+    assert closed == [True]
+    assert len(produced) < 1000
+
+
+def test_cancellation():
+    """Отмена задачи-потребителя"""
+    closed = []
+
+    def endless():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.append(True)
+
+    async def consume():
+        async for _ in aiterate_batches(endless(), batch_size=100):
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert closed == [True]
+
+
+def test_errors_propagate():
+    """Исключения генератора доходят до потребителя"""
+    with pytest.raises(GeneratorException):
+        asyncio.run(_collect(async_function_generator(5, 0, 1)))
+    with pytest.raises(GeneratorException):
+        asyncio.run(_collect(aiterate_batches([], batch_size=0)))
@@ -0,0 +1,41 @@
+"""
+Тесты набора измерений производительности
+"""
+
+import pytest
+from generators import GeneratorException
+from benchmarks import run_benchmarks, compare, save_baseline, load_baseline, main
+
+
+def test_run_small_benchmarks():
+    """Малые входы всех измерений"""
+    results = run_benchmarks(repeat=1, max_size=1000)
+    assert set(results) == {
+        "letter_combinations", "letter_combinations_threaded", "function_generator",
+        "function_values", "filter_long_cities", "get_first_n_items",
+    }
+    assert results["letter_combinations"]["676"]["items"] == 676
+    assert results["function_generator"]["1000"]["items"] == 1000
+    assert results["function_values"]["1000"]["items"] == 1000
+    with pytest.raises(GeneratorException):
+        run_benchmarks(["nonexistent"])
+
+
+def test_compare_threshold():
+    """Регрессия фиксируется только выше порога"""
+    baseline = {"results": {"a": {"10": {"best": 1.0}}}}
+    assert compare({"a": {"10": {"best": 1.1}}}, baseline, 0.2) == []
+    assert len(compare({"a": {"10": {"best": 1.5}}}, baseline, 0.2)) == 1
+    assert compare({"b": {"10": {"best": 9.0}}}, baseline, 0.2) == []
+
+
+def test_baseline_roundtrip_and_gate(tmp_path, capsys):
+    """Сохранение baseline и проверка регрессий"""
+    path = str(tmp_path / "baseline.json")
+    assert load_baseline(path) is None
+    assert main(["letter_combinations", "--baseline", path, "--save", "--repeat", "1"]) == 0
+    baseline = load_baseline(path)
+    assert "letter_combinations" in baseline["results"]
+    baseline["results"]["letter_combinations"]["676"]["best"] = 1e-12
+    save_baseline(path, baseline["results"])
+    assert main(["letter_combinations", "--baseline", path, "--repeat", "1"]) == 1
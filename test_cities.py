@@ -0,0 +1,100 @@
+"""
+Тесты потоковой фильтрации городов
+"""
+
+import io
+import sys
+import pytest
+from generators import filter_long_cities, GeneratorException
+from cities import (
+    iter_city_tokens,
+    filter_long_cities_stream,
+    filter_long_cities_mmap,
+    filter_long_cities_parallel,
+    split_byte_ranges,
+)
+
+
+CITIES = "Москва Казань  Санкт-Петербург\nУфа\tВладивосток Сочи   Екатеринбург Омск\n"
+
+
+@pytest.mark.parametrize("buffer_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_tokens_across_buffer_boundaries(buffer_size):
+    """Слова на границах блоков склеиваются"""
+    tokens = list(iter_city_tokens(io.StringIO(CITIES), buffer_size))
+    assert tokens == CITIES.split()
+
+
+def test_stream_matches_filter(tmp_path):
+    """Совпадение с filter_long_cities для файла и файлового объекта"""
+    expected = list(filter_long_cities(CITIES))
+    path = tmp_path / "cities.txt"
+    path.write_text(CITIES, encoding="utf-8")
+    assert list(filter_long_cities_stream(str(path), buffer_size=5)) == expected
+    assert list(filter_long_cities_stream(io.StringIO(CITIES), buffer_size=4)) == expected
+
+
+def test_stream_stdin(monkeypatch):
+    """Чтение из stdin"""
+    monkeypatch.setattr(sys, "stdin", io.StringIO(CITIES))
+    assert list(filter_long_cities_stream(min_length=7)) == ["Санкт-Петербург", "Владивосток", "Екатеринбург"]
+
+
+def test_mmap_matches_filter(tmp_path):
+    """Фильтрация через отображение в память"""
+    path = tmp_path / "cities.txt"
+    path.write_text(CITIES, encoding="utf-8")
+    assert list(filter_long_cities_mmap(str(path))) == list(filter_long_cities(CITIES))
+    empty = tmp_path / "empty.txt"
+    empty.write_text("", encoding="utf-8")
+    assert list(filter_long_cities_mmap(str(empty))) == []
+
+
+def test_missing_file():
+    """Несуществующий файл"""
+    with pytest.raises(GeneratorException):
+        list(filter_long_cities_stream("/nonexistent/cities.txt"))
+    with pytest.raises(GeneratorException):
+        list(filter_long_cities_mmap("/nonexistent/cities.txt"))
+
+
+def test_invalid_utf8(tmp_path):
+    """Файл не в UTF-8: одинаковая ошибка для потокового и mmap-чтения"""
+    path = tmp_path / "bad.txt"
+    path.write_bytes("Москва Владивосток".encode("cp1251"))
+    for reader in (filter_long_cities_stream, filter_long_cities_mmap):
+        with pytest.raises(GeneratorException, match="UTF-8"):
+            list(reader(str(path)))
+
+
+def test_byte_ranges_aligned():
+    """Границы диапазонов не разрезают слова"""
+    data = CITIES.encode("utf-8")
+    ranges = split_byte_ranges(data, 5)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+    tokens = [t for start, stop in ranges for t in data[start:stop].split()]
+    assert tokens == data.split()
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_parallel_preserves_order(tmp_path, workers):
+    """Параллельная фильтрация сохраняет исходный порядок"""
+    text = CITIES * 200
+    path = tmp_path / "cities.txt"
+    path.write_text(text, encoding="utf-8")
+    result = filter_long_cities_parallel(str(path), workers=workers, range_size=256)
+    assert list(result) == list(filter_long_cities(text))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unicode_whitespace(tmp_path, workers):
+    """Разделители как у str.split(): пробелы Unicode и \\x1c-\\x1f"""
+    text = "Москва\u00a0Санкт-Петербург\u2003Уфа\x1cВладивосток\u3000Екатеринбург Сочи Омск\n" * 50
+    path = tmp_path / "cities.txt"
+    path.write_text(text, encoding="utf-8")
+    expected = list(filter_long_cities(text))
+    assert "Санкт-Петербург" in expected
+    assert list(filter_long_cities_mmap(str(path))) == expected
+    assert list(filter_long_cities_parallel(str(path), workers=workers, range_size=64)) == expected
+    assert list(filter_long_cities_stream(io.StringIO(text))) == expected
@@ -0,0 +1,44 @@
+"""
+Тесты индекса городов по длине
+"""
+
+import pytest
+from generators import filter_long_cities, GeneratorException
+from city_index import CityLengthIndex
+
+
+CITIES = "Москва Казань Санкт-Петербург Уфа Владивосток Сочи Омск Екатеринбург Самара Тула"
+
+
+def test_longer_than_matches_filter():
+    """Запрос "длиннее 5" совпадает с filter_long_cities по составу"""
+    index = CityLengthIndex.from_text(CITIES)
+    assert len(index) == 10
+    assert sorted(index.longer_than(5)) == sorted(filter_long_cities(CITIES))
+    assert index.count_longer_than(5) == 6
+    assert index.count_longer_than(100) == 0
+    assert list(index.longer_than(11)) == ["Екатеринбург", "Санкт-Петербург"]
+
+
+def test_between_and_histogram():
+    """Диапазон длин и гистограмма"""
+    index = CityLengthIndex.from_text(CITIES)
+    assert list(index.between(3, 4)) == ["Уфа", "Сочи", "Омск", "Тула"]
+    assert index.count_between(6, 6) == 3
+    assert list(index.between(7, 10)) == []
+    assert index.histogram() == {3: 1, 4: 3, 6: 3, 11: 1, 12: 1, 15: 1}
+
+
+def test_incremental_add_remove():
+    """Добавление и удаление"""
+    index = CityLengthIndex(["Москва", "Казань", "Москва"])
+    index.add("Тверь")
+    index.remove("Москва")
+    assert list(index.between(6, 6)) == ["Казань", "Москва"]
+    index.remove("Тверь")
+    assert "Тверь" not in index
+    assert index.histogram() == {6: 2}
+    with pytest.raises(GeneratorException):
+        index.remove("Тверь")
+    with pytest.raises(GeneratorException):
+        index.add("Нижний Новгород")
@@ -0,0 +1,70 @@
+"""
+Тесты консольного режима
+"""
+
+import io
+import subprocess
+import sys
+import numpy as np
+import pytest
+from generators import letter_combinations, function_generator, filter_long_cities
+from cli import main
+
+
+def test_letters_text(capsysbinary):
+    """Сочетания в текстовом виде в stdout"""
+    assert main(["letters", "--count", "3"]) == 0
+    assert capsysbinary.readouterr().out == b"aa\nab\nac\n"
+
+
+def test_letters_csv_file(tmp_path):
+    """Сочетания в CSV-файл"""
+    path = tmp_path / "letters.csv"
+    assert main(["letters", "--format", "csv", "-o", str(path)]) == 0
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "index,combination"
+    assert lines[1:] == [f"{i},{c}" for i, c in enumerate(letter_combinations())]
+
+
+def test_function_binary_and_text(tmp_path):
+    """Значения функции в двоичном и текстовом виде"""
+    expected = list(function_generator(-5, 7, 0.01))
+    path = tmp_path / "f.bin"
+    assert main(["function", "--format", "binary", "--chunk-size", "100", "-o", str(path)]) == 0
+    np.testing.assert_allclose(np.fromfile(path, dtype="<f8"), expected, atol=1e-6)
+    path = tmp_path / "f.txt"
+    assert main(["function", "-a", "0", "-b", "2", "--step", "1", "--expression", "x*x", "-o", str(path)]) == 0
+    assert [float(v) for v in path.read_text().split()] == [0.0, 1.0, 4.0]
+
+
+def test_cities_stdin(monkeypatch, capsysbinary):
+    """Фильтр городов из stdin в двоичном виде"""
+    text = "Москва Казань Уфа Владивосток Сочи"
+    monkeypatch.setattr(sys, "stdin", io.StringIO(text))
+    assert main(["cities", "--format", "binary"]) == 0
+    out = capsysbinary.readouterr().out
+    assert out.split(b"\0")[:-1] == [c.encode("utf-8") for c in filter_long_cities(text)]
+
+
+def test_cities_unique(monkeypatch, capsys):
+    """Повторы названий выводятся один раз"""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("Москва Казань Москва Владивосток Казань"))
+    assert main(["cities", "--unique"]) == 0
+    assert capsys.readouterr().out.split() == ["Москва", "Казань", "Владивосток"]
+
+
+def test_errors(capsys):
+    """Ошибки параметров"""
+    assert main(["function", "-a", "5", "-b", "0"]) == 1
+    assert "Ошибка" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["unknown"])
+
+
+def test_headless_does_not_import_pyside():
+    """Консольный режим не загружает PySide6"""
+    code = ("import sys, main; sys.argv = ['main.py', 'letters', '--count', '1'];"
+            "main.main(); assert 'PySide6' not in sys.modules, 'PySide6 imported'")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "aa\n"
@@ -0,0 +1,105 @@
+"""
+Тесты пространства сочетаний
+"""
+
+import random
+import pytest
+from generators import letter_combinations, GeneratorException
+from combinations import CombinationSpace, letter_combinations_parallel
+
+
+def test_space_matches_letter_combinations():
+    """Совпадение с исходным генератором"""
+    space = CombinationSpace()
+    assert len(space) == 676
+    assert list(space) == list(letter_combinations())
+
+
+def test_space_getitem_and_rank():
+    """Доступ по индексу и ранг"""
+    space = CombinationSpace("abc", 3)
+    assert len(space) == 27
+    assert space[0] == "aaa"
+    assert space[5] == "abc"
+    assert space[-1] == "ccc"
+    assert space.rank("abc") == 5
+    assert space.unrank(space.rank("cab")) == "cab"
+    with pytest.raises(IndexError):
+        space[27]
+
+
+def test_space_large_random_access():
+    """Большое пространство без перебора"""
+    space = CombinationSpace(length=6)
+    assert len(space) == 26 ** 6
+    assert space[-1] == "zzzzzz"
+    assert space[space.rank("python")] == "python"
+    assert "python" in space
+    assert "PYTHON" not in space
+
+
+def test_space_slicing():
+    """Срезы возвращают ленивые представления"""
+    space = CombinationSpace("ab", 3)
+    full = list(space)
+    assert list(space[2:6]) == full[2:6]
+    assert list(space[::3]) == full[::3]
+    assert list(space[::-1]) == full[::-1]
+    view = space[4:]
+    assert view[0] == "baa"
+    assert view.index("bab") == 1
+    with pytest.raises(ValueError):
+        view.index("aaa")
+
+
+def test_space_sample():
+    """Выборка без повторений"""
+    space = CombinationSpace(length=5)
+    items = space.sample(100, random.Random(1))
+    assert len(items) == len(set(items)) == 100
+    assert all(item in space for item in items)
+    with pytest.raises(GeneratorException):
+        CombinationSpace("ab", 1).sample(3)
+
+
+def test_space_beyond_ssize_t():
+    """Пространство больше 2**63: итерация, срезы и выборка без len()"""
+    space = CombinationSpace(length=14)
+    assert space.size == space.total == 26 ** 14
+    with pytest.raises(OverflowError):
+        len(space)
+    assert next(iter(space)) == "a" * 14
+    tail = space[-2:]
+    assert tail.size == 2 and list(tail) == ["z" * 13 + "y", "z" * 14]
+    items = space.sample(3, random.Random(2))
+    assert len(set(items)) == 3 and all(item in space for item in items)
+    assert space[::-1].size == space.size
+    assert list(CombinationSpace("ab", 2)[::-1]) == ["bb", "ba", "ab", "aa"]
+    assert len(CombinationSpace("abc", 2)[5:2]) == 0
+
+
+def test_space_invalid_params():
+    """Неверные параметры"""
+    with pytest.raises(GeneratorException):
+        CombinationSpace("")
+    with pytest.raises(GeneratorException):
+        CombinationSpace("aa")
+    with pytest.raises(GeneratorException):
+        CombinationSpace("ab", 0)
+
+
+def test_parallel_order_and_count():
+    """Параллельная генерация сохраняет порядок"""
+    result = letter_combinations_parallel(100, workers=2, shard_size=30)
+    assert result == list(letter_combinations())[:100]
+    space = CombinationSpace("abcd", 4)
+    assert letter_combinations_parallel(1000, "abcd", 4, workers=3) == list(space)
+
+
+def test_parallel_edge():
+    """Крайние случаи параллельной генерации"""
+    assert letter_combinations_parallel(0) == []
+    assert letter_combinations_parallel(-5) == []
+    assert len(letter_combinations_parallel(1000, workers=1)) == 676
+    with pytest.raises(GeneratorException):
+        letter_combinations_parallel(10, workers=2, shard_size=0)
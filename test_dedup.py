@@ -0,0 +1,66 @@
+"""
+Тесты удаления повторов и оценки числа различных элементов
+"""
+
+import pickle
+import pytest
+from generators import GeneratorException, filter_long_cities
+from dedup import BloomFilter, HyperLogLog, deduplicate
+from aggregations import Aggregate, Count, merge_all
+
+
+def test_deduplicate_exact():
+    """Первые вхождения в исходном порядке"""
+    text = "Москва Казань Москва Владивосток Казань Москва"
+    assert list(deduplicate(filter_long_cities(text))) == ["Москва", "Казань", "Владивосток"]
+    assert list(deduplicate([])) == []
+    with pytest.raises(GeneratorException):
+        list(deduplicate([1], exact_limit=-1))
+
+
+def test_deduplicate_switches_to_bloom():
+    """После порога повторы отбрасываются фильтром Блума"""
+    items = [f"city{i % 5000}" for i in range(20000)]
+    result = list(deduplicate(items, exact_limit=100, capacity=10000, error_rate=0.001))
+    assert result[:100] == [f"city{i}" for i in range(100)]
+    assert len(set(result)) == len(result)
+    # Ложные срабатывания могут отбросить лишь несколько новых названий
+    assert 4990 <= len(result) <= 5000
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    assert bloom.add("Москва") is True
+    assert bloom.add("Москва") is False
+    assert "Москва" in bloom and "Казань" not in bloom
+    other = BloomFilter(1000, 0.01)
+    other.add("Казань")
+    assert "Казань" in bloom.merge(other)
+    with pytest.raises(GeneratorException):
+        bloom.merge(BloomFilter(10, 0.01))
+    with pytest.raises(GeneratorException):
+        BloomFilter(0)
+
+
+def test_hyperloglog_estimate():
+    """Оценка в пределах нескольких стандартных ошибок"""
+    small = HyperLogLog().update(["a", "b", "a"])
+    assert small.result() == 2
+    hll = HyperLogLog(precision=12).update(f"city{i}" for i in range(50000))
+    assert abs(hll.estimate() - 50000) < 50000 * 0.05
+    with pytest.raises(GeneratorException):
+        HyperLogLog(precision=3)
+
+
+def test_hyperloglog_merge_across_workers():
+    """Состояния рабочих процессов объединяются без потери точности"""
+    shards = [[f"city{i}" for i in range(start, start + 20000)] for start in (0, 10000, 20000)]
+    parts = [pickle.loads(pickle.dumps(Aggregate(count=Count(), distinct=HyperLogLog()).update(shard)))
+             for shard in shards]
+    merged = merge_all(parts).result()
+    assert merged["count"] == 60000
+    assert abs(merged["distinct"] - 40000) < 40000 * 0.05
+    single = HyperLogLog().update(item for shard in shards for item in shard)
+    assert single.result() == merged["distinct"]
+    with pytest.raises(GeneratorException):
+        HyperLogLog(10).merge(HyperLogLog(12))
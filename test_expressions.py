@@ -0,0 +1,69 @@
+"""
+Тесты компиляции выражений
+"""
+
+import math
+import numpy as np
+import pytest
+from generators import function_generator, GeneratorException
+from expressions import (
+    compile_expression,
+    normalize_expression,
+    clear_expression_cache,
+    DEFAULT_EXPRESSION,
+)
+from vectorized import function_values
+
+
+def test_default_expression_matches_generator():
+    """Выражение по умолчанию совпадает с исходной функцией"""
+    expected = list(function_generator(-5, 7, 0.01))
+    assert list(function_generator(-5, 7, 0.01, DEFAULT_EXPRESSION)) == pytest.approx(expected)
+    np.testing.assert_allclose(function_values(-5, 7, 0.01, DEFAULT_EXPRESSION), expected, atol=1e-6)
+
+
+def test_scalar_and_vector_kernels():
+    """Скалярное и векторное ядра"""
+    kernel = compile_expression("sin(x) / (1 + x**2) + pi")
+    assert kernel(0.5) == pytest.approx(math.sin(0.5) / 1.25 + math.pi)
+    x = np.linspace(-3, 3, 7)
+    np.testing.assert_allclose(kernel.vector(x), [kernel(v) for v in x])
+    np.testing.assert_array_equal(compile_expression("2").vector(x), np.full(7, 2.0))
+
+
+def test_cache_by_normalized_text():
+    """Кэш по нормализованному тексту"""
+    clear_expression_cache()
+    assert normalize_expression("x*2+1") == normalize_expression(" x * 2 + 1 ")
+    assert compile_expression("x*2+1") is compile_expression("x * 2 + 1")
+
+
+@pytest.mark.parametrize("text", [
+    "", "x +", "__import__('os')", "x.real", "y + 1", "lambda: 1",
+    "sin(x, 2)", "'a' * 3", "[x]", "x if x else 1",
+    "9**9**9", "x + 2 ** 9 ** 9", "1" + "0" * 400,
+])
+def test_invalid_expressions(text):
+    """Недопустимые выражения"""
+    with pytest.raises(GeneratorException):
+        compile_expression(text)
+
+
+def test_domain_errors_match_vector():
+    """Вне области определения оба ядра дают NaN/±inf, а не исключение"""
+    assert list(function_generator(-1, 1, 1, "log(x)")) == [pytest.approx(math.nan, nan_ok=True), -math.inf, 0.0]
+    for text in ["log(x)", "sqrt(x)", "1 / x", "x ** 0.5", "exp(1000 * x)"]:
+        kernel = compile_expression(text)
+        x = np.array([-1.0, 0.0, 1.0])
+        np.testing.assert_array_equal([kernel(v) for v in x.tolist()], kernel.vector(x))
+
+
+def test_float_arithmetic_only():
+    """floor/ceil и целый x не приводят к длинной арифметике целых чисел"""
+    kernel = compile_expression("floor(x) ** floor(x)")
+    for x in [200.0, 3e6, 200]:
+        assert kernel(x) == math.inf
+        assert kernel.vector(np.array([float(x)]))[0] == math.inf
+    assert list(function_generator(0, 2, 1, "ceil(x)")) == [0.0, 1.0, 2.0]
+    assert all(type(v) is float for v in function_generator(0, 2, 1, "ceil(x) + x ** x"))
+    assert list(function_generator(2990000, 3000000, 10000, "floor(x) ** floor(x)")) == [math.inf, math.inf]
@@ -136,3 +136,11 @@ def test_generator_exception():
     assert str(exc) == "test"
     assert isinstance(exc, Exception)
 
+
+
+def test_function_generator_expression():
+    """Пользовательское выражение"""
+    values = list(function_generator(1, 3, 1, "x ** 2 - 1"))
+    assert values == pytest.approx([0.0, 3.0, 8.0])
+    with pytest.raises(GeneratorException):
+        next(function_generator(0, 1, 1, "__import__('os')"))
@@ -0,0 +1,73 @@
+"""
+Тесты инструментирования генераторов
+"""
+
+import json
+import pytest
+import instrumentation
+from generators import (
+    letter_combinations,
+    letter_combinations_threaded,
+    function_generator,
+    get_first_n_items,
+    GeneratorException,
+)
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset_stats()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset_stats()
+
+
+def test_disabled_records_nothing():
+    """В выключенном состоянии статистика не собирается"""
+    instrumentation.disable()
+    instrumentation.reset_stats()
+    assert len(list(letter_combinations())) == 676
+    assert instrumentation.get_stats() == {}
+
+
+def test_generator_stats(enabled):
+    """Счетчики генераторов и обычных функций"""
+    list(letter_combinations())
+    list(letter_combinations())
+    letter_combinations_threaded(10)
+    stats = instrumentation.get_stats()
+    assert stats["letter_combinations"]["calls"] == 2
+    assert stats["letter_combinations"]["items"] == 2 * 676
+    assert stats["letter_combinations"]["active_time"] > 0
+    assert stats["letter_combinations"]["items_per_sec"] > 0
+    assert stats["letter_combinations_threaded"]["items"] == 10
+
+
+def test_partial_and_failed_generators(enabled):
+    """Незавершенный и упавший генераторы тоже учитываются"""
+    assert get_first_n_items(function_generator(0, 10, 1), 3) == pytest.approx([-2.0, 3.1, 8.4])
+    with pytest.raises(GeneratorException):
+        list(function_generator(5, 0, 1))
+    stats = instrumentation.get_stats()["function_generator"]
+    assert stats["calls"] == 2
+    assert stats["items"] == 3
+    assert stats["errors"] == 1
+
+
+def test_dump_stats(enabled, tmp_path):
+    """Машиночитаемый вывод"""
+    list(letter_combinations())
+    path = tmp_path / "stats.json"
+    text = instrumentation.dump_stats(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data == json.loads(text)
+    assert data["stats"]["letter_combinations"]["items"] == 676
+    assert "letter_combinations" in instrumentation.format_summary()
+
+
+def test_record_timing():
+    """Разовые замеры попадают в дамп"""
+    instrumentation.record_timing("startup.test", 0.25)
+    assert instrumentation.get_timings()["startup.test"] == 0.25
+    assert json.loads(instrumentation.dump_stats())["timings"]["startup.test"] == 0.25
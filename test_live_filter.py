@@ -0,0 +1,68 @@
+"""
+Тесты инкрементальной фильтрации городов
+"""
+
+import random
+import pytest
+from generators import GeneratorException, filter_long_cities
+from live_filter import IncrementalCityFilter
+
+
+def reference(text):
+    return list(filter_long_cities(text)) if text.strip() else []
+
+
+def test_initial_text():
+    """Начальный текст разбирается как в filter_long_cities"""
+    text = "Москва Казань Санкт-Петербург Уфа Владивосток Сочи"
+    live = IncrementalCityFilter(text)
+    assert list(live.iter_matches()) == reference(text)
+    assert live.count == 4
+    assert live.token_count == 6
+    assert live.first(2) == ["Москва", "Казань"]
+
+
+def test_edits_merge_and_split_tokens():
+    """Правки, склеивающие и разделяющие названия"""
+    live = IncrementalCityFilter("Уфа Омск Тула")
+    assert live.count == 0
+    live.edit(3, 1, "")          # "УфаОмск Тула"
+    assert list(live.iter_matches()) == ["УфаОмск"]
+    live.edit(7, 0, "\n")        # вставка перед пробелом
+    assert live.text == "УфаОмск\n Тула"
+    assert live.count == 1
+    live.edit(3, 0, " ")         # разделение
+    assert live.count == 0 and live.token_count == 3
+    with pytest.raises(GeneratorException):
+        live.edit(100, 1, "")
+
+
+def test_set_text_random_edits():
+    """Случайные правки совпадают с полным пересчетом"""
+    rng = random.Random(7)
+    alphabet = "абвгдежз  \t"
+    text = "".join(rng.choice(alphabet) for _ in range(5000))
+    live = IncrementalCityFilter(text)
+    for _ in range(300):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.randrange(20))
+        inserted = "".join(rng.choice(alphabet) for _ in range(rng.randrange(10)))
+        text = text[:start] + inserted + text[end:]
+        live.set_text(text)
+        assert live.text == text
+    expected = reference(text)
+    assert live.count == len(expected)
+    assert list(live.iter_matches()) == expected
+    assert live.first(3) == expected[:3]
+
+
+def test_large_text_prefix_suffix():
+    """Правка в середине большого текста"""
+    cities = ["Владивосток", "Уфа"] * 50000
+    text = " ".join(cities)
+    live = IncrementalCityFilter(text)
+    iterator = live.iter_matches()
+    middle = len(text) // 2
+    live.set_text(text[:middle] + " Новосибирск " + text[middle:])
+    assert live.count == len(reference(live.text))
+    assert next(iterator) == "Владивосток"
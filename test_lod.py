@@ -0,0 +1,62 @@
+"""
+Тесты прореживания для графиков
+"""
+
+import numpy as np
+import pytest
+from generators import GeneratorException
+from vectorized import function_values
+from lod import minmax_decimate, FunctionTileCache, TILE_BUCKETS
+
+
+def test_minmax_decimate():
+    """Минимум и максимум по столбцам"""
+    mins, maxs = minmax_decimate(np.array([1, 5, 2, 8, 3, 0]), 3)
+    assert mins.tolist() == [1, 2, 0]
+    assert maxs.tolist() == [5, 8, 3]
+    mins, maxs = minmax_decimate(np.arange(3.0), 10)
+    assert len(mins) == 3
+    with pytest.raises(GeneratorException):
+        minmax_decimate(np.arange(3.0), 0)
+
+
+def test_query_matches_bruteforce():
+    """Экстремумы по столбцам совпадают с полным перебором"""
+    a, b, step = -50, 50, 0.001
+    tiles = FunctionTileCache(a, b, step, "sin(x) * x")
+    values = function_values(a, b, step, "sin(x) * x")
+    xs, mins, maxs, missing = tiles.query(a, b, 200)
+    assert missing == []
+    assert len(xs) == 200
+    assert np.nanmin(mins) == pytest.approx(values.min())
+    assert np.nanmax(maxs) == pytest.approx(values.max())
+    assert not np.isnan(mins).any()
+
+
+def test_zoomed_in_uses_raw_samples():
+    """При сильном приближении используются исходные точки (уровень 0)"""
+    tiles = FunctionTileCache(0, 10, 0.01)
+    assert tiles.level_for(0, 1, 500) == 0
+    xs, mins, maxs, _ = tiles.query(0, 1, 500)
+    filled = ~np.isnan(mins)
+    # Последняя точка x = 1 лежит на правой границе окна
+    assert filled.sum() == 100
+    np.testing.assert_allclose(mins[filled], function_values(0, 1, 0.01)[:100])
+
+
+def test_incremental_refinement_and_parent_merge():
+    """Без вычислений — пропуски или грубые тайлы, затем уточнение"""
+    tiles = FunctionTileCache(0, 100, 0.001)
+    level = tiles.level_for(0, 100, 100)
+    _, mins, _, missing = tiles.query(0, 100, 100, compute=False)
+    assert np.isnan(mins).all() and missing
+    for tile_level, index in missing:
+        tiles.compute_tile(tile_level, index)
+    _, refined, _, missing = tiles.query(0, 100, 100, compute=False)
+    assert missing == [] and not np.isnan(refined).any()
+
+    # Тайл уровнем выше строится из двух уже вычисленных дочерних
+    parent = tiles.compute_tile(level + 1, 0)
+    assert len(parent[0]) == min(-(-tiles.count // (2 << level)), TILE_BUCKETS)
+    _, coarse_mins, _, _ = tiles.query(0, 50, 100, compute=False)
+    assert not np.isnan(coarse_mins).all()
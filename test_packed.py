@@ -0,0 +1,69 @@
+"""
+Тесты компактного хранения строк
+"""
+
+import pickle
+import sys
+import pytest
+from generators import GeneratorException, letter_combinations, letter_combinations_threaded
+from packed import PackedStrings
+
+
+def test_sequence_behaviour():
+    """Поведение как у списка строк"""
+    items = ["ab", "cd", "ef", "gh"]
+    packed = PackedStrings.from_strings(items)
+    assert len(packed) == 4
+    assert packed[0] == "ab" and packed[-1] == "gh"
+    assert list(packed) == items
+    assert packed == items and items == packed
+    assert packed[1:3] == ["cd", "ef"]
+    assert packed[::2] == ["ab", "ef"]
+    assert packed[::-1] == items[::-1]
+    assert "ef" in packed and "bc" not in packed and 5 not in packed
+    assert packed.index("gh") == 3
+    assert packed.count("cd") == 1
+    with pytest.raises(IndexError):
+        packed[4]
+    with pytest.raises(ValueError):
+        packed.index("zz")
+
+
+def test_slices_share_buffer():
+    """Срез с шагом 1 не копирует буфер"""
+    packed = PackedStrings(b"aabbccdd", 2)
+    part = packed[1:3]
+    assert part._view.obj is packed._view.obj
+    assert part.nbytes == 4
+    assert part.index("cc") == 1
+    assert "aa" not in part
+
+
+def test_unicode_and_validation():
+    """Кодировка с фиксированной шириной символа и проверка аргументов"""
+    packed = PackedStrings.from_strings(["Омск", "Тула"], encoding="utf-32-le")
+    assert packed.width == 16
+    assert list(packed) == ["Омск", "Тула"]
+    assert "Тула" in packed
+    with pytest.raises(GeneratorException):
+        PackedStrings.from_strings(["ab", "abc"])
+    with pytest.raises(GeneratorException):
+        PackedStrings(b"abc", 2)
+    with pytest.raises(GeneratorException):
+        PackedStrings(b"ab", 2, encoding="utf-8")
+
+
+def test_pickle_roundtrip():
+    packed = PackedStrings(b"xxyyzz", 2)[1:]
+    assert pickle.loads(pickle.dumps(packed)) == ["yy", "zz"]
+
+
+def test_threaded_combinations_packed():
+    """Многопоточная генерация: порядок и компактность"""
+    result = letter_combinations_threaded(676)
+    assert isinstance(result, PackedStrings)
+    assert list(result) == list(letter_combinations())
+    assert result.nbytes == 676 * 2
+    as_list = list(result)
+    list_bytes = sys.getsizeof(as_list) + sum(sys.getsizeof(s) for s in as_list)
+    assert list_bytes > 10 * result.nbytes
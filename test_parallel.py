@@ -0,0 +1,36 @@
+"""
+Тесты упорядоченного пула процессов
+"""
+
+import os
+import pytest
+from generators import GeneratorException
+from parallel import ordered_map, resolve_workers
+
+
+def square(value):
+    return value * value
+
+
+def test_resolve_workers():
+    assert resolve_workers(None) == (os.cpu_count() or 1)
+    assert resolve_workers(3) == 3
+    for workers in (0, -1):
+        with pytest.raises(GeneratorException):
+            resolve_workers(workers)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_ordered_map_preserves_order(workers):
+    """Результаты в порядке аргументов при любом числе процессов"""
+    arguments = [(i,) for i in range(20)]
+    assert list(ordered_map(square, arguments, workers)) == [i * i for i in range(20)]
+
+
+def test_ordered_map_early_close():
+    """Досрочное закрытие генератора не ждет все задания"""
+    results = ordered_map(square, [(i,) for i in range(100)], workers=2)
+    assert next(results) == 0
+    results.close()
+    with pytest.raises(GeneratorException):
+        list(ordered_map(square, [(1,)], workers=0))
@@ -0,0 +1,62 @@
+"""
+Тесты ленивых конвейеров
+"""
+
+import operator
+import pytest
+from generators import letter_combinations, function_generator, filter_long_cities, GeneratorException
+from pipeline import Stream
+
+
+def test_stream_chain():
+    """Цепочка map/filter/skip/take"""
+    result = (Stream(letter_combinations())
+              .filter(lambda s: s[0] == s[1])
+              .map(str.upper)
+              .skip(2)
+              .take(3)
+              .to_list())
+    assert result == ["CC", "DD", "EE"]
+
+
+def test_stream_slice_fusion():
+    """Соседние skip/take сливаются и дают тот же результат"""
+    stream = Stream(range(100)).skip(10).take(50).skip(5).take(10)
+    assert len(stream._stages) == 1
+    assert stream.to_list() == list(range(100))[10:60][5:15]
+    assert Stream(range(10)).take(3).take(5).to_list() == [0, 1, 2]
+    assert Stream(range(10)).take(5).skip(7).to_list() == []
+
+
+def test_stream_is_reusable_description():
+    """Стадии не изменяют исходный Stream"""
+    base = Stream(range(10))
+    assert base.take(2).to_list() == [0, 1]
+    assert base.map(str).take(1).to_list() == ["0"]
+
+
+def test_stream_batch_and_reduce():
+    """Пакеты и свертка"""
+    assert Stream(range(7)).batch(3).to_list() == [[0, 1, 2], [3, 4, 5], [6]]
+    assert Stream(function_generator(1, 3, 1)).reduce(operator.add) == pytest.approx(25.4)
+    assert Stream([]).reduce(operator.add, 0) == 0
+    with pytest.raises(GeneratorException):
+        Stream([]).reduce(operator.add)
+    with pytest.raises(GeneratorException):
+        Stream(range(3)).batch(0)
+
+
+def test_stream_terminals():
+    """count и first"""
+    cities = "Москва Казань Уфа Владивосток"
+    assert Stream(filter_long_cities(cities)).count() == 3
+    assert Stream(filter_long_cities(cities)).first() == "Москва"
+    assert Stream([]).first(None) is None
+    assert Stream([]).count() == 0
+
+
+def test_stream_distinct():
+    """Стадия удаления повторов"""
+    stream = Stream(["b", "a", "b", "c", "a"]).distinct().take(2)
+    assert stream.to_list() == ["b", "a"]
+    assert Stream([1, 2, 1, 3]).distinct(exact_limit=1).to_list() == [1, 2, 3]
@@ -0,0 +1,132 @@
+"""
+Тесты постоянного кэша результатов
+"""
+
+import multiprocessing
+import numpy as np
+import pytest
+from generators import filter_long_cities, GeneratorException
+from vectorized import function_values
+from result_cache import (
+    ResultCache,
+    cached_function_values,
+    cached_filter_long_cities,
+    code_version,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_roundtrip_floats_and_strings(cache):
+    """Сохранение и чтение чисел и строк"""
+    assert cache.get("f", {"a": 1}) is None
+    cache.put("f", {"a": 1}, np.arange(5, dtype=float))
+    np.testing.assert_array_equal(cache.get("f", {"a": 1}), np.arange(5))
+    cache.put("c", {"t": "x"}, ["Москва", "Казань"])
+    assert cache.get("c", {"t": "x"}) == ["Москва", "Казань"]
+    assert cache.get("c", {"t": "y"}) is None
+    assert cache.get("c", {"t": "x"}, version="other") is None
+
+
+def test_get_or_compute_calls_once(cache):
+    """Повторный запрос не вычисляет результат заново"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return function_values(-5, 7, 0.01)
+
+    first = cache.get_or_compute("function_values", {"a": -5}, compute)
+    second = cache.get_or_compute("function_values", {"a": -5}, compute)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first, second)
+
+
+def test_eviction_by_size(tmp_path):
+    """Вытеснение давно не использованных записей"""
+    rng = np.random.default_rng(0)
+    blocks = [rng.random(200) for _ in range(5)]
+    probe = ResultCache(str(tmp_path / "probe.sqlite"))
+    probe.put("f", {}, blocks[0])
+    entry_size = probe.stats()["bytes"]
+
+    cache = ResultCache(str(tmp_path / "small.sqlite"), max_bytes=int(entry_size * 3.5))
+    for i, block in enumerate(blocks):
+        cache.put("f", {"i": i}, block)
+        cache.get("f", {"i": 0})  # запись 0 остается самой свежей
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    assert cache.get("f", {"i": 0}) is not None
+    assert cache.get("f", {"i": 1}) is None
+    assert cache.get("f", {"i": 4}) is not None
+    assert cache.invalidate("f") == 3
+    assert cache.stats() == {"entries": 0, "bytes": 0}
+    with pytest.raises(GeneratorException):
+        ResultCache(str(tmp_path / "bad.sqlite"), max_bytes=0)
+
+
+def test_cached_helpers(cache):
+    """Кэшированные функция и фильтр"""
+    values = cached_function_values(-5, 7, 0.01, "x * 2", cache=cache)
+    np.testing.assert_array_equal(values, function_values(-5, 7, 0.01, "x * 2"))
+    np.testing.assert_array_equal(cached_function_values(-5, 7, 0.01, "x*2", cache=cache), values)
+    assert cache.stats()["entries"] == 1
+    text = "Москва Казань Уфа Владивосток"
+    assert cached_filter_long_cities(text, cache) == list(filter_long_cities(text))
+    assert cached_filter_long_cities(text, cache) == list(filter_long_cities(text))
+    assert len(code_version(function_values)) == 16
+
+
+def test_cached_function_values_progress(cache):
+    """Вычисление блоками с прогрессом; прерванное вычисление не кэшируется"""
+    calls = []
+    values = cached_function_values(0, 9, 1, "x + 1", cache=cache,
+                                    progress=lambda done, total: calls.append((done, total)), chunk_size=4)
+    np.testing.assert_array_equal(values, np.arange(1.0, 11.0))
+    assert calls == [(4, 10), (8, 10), (10, 10)]
+
+    def cancel(done, total):
+        raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError):
+        cached_function_values(0, 9, 1, "x + 2", cache=cache, progress=cancel, chunk_size=4)
+    assert cache.stats()["entries"] == 1
+
+
+def test_expression_version(cache, monkeypatch):
+    """Изменение модуля выражений дает новый ключ для выражений, но не для f(x) по умолчанию"""
+    import result_cache
+
+    cached_function_values(0, 1, 0.5, "x", cache=cache)
+    cached_function_values(0, 1, 0.5, cache=cache)
+    original = result_cache.code_version
+    monkeypatch.setattr(result_cache, "code_version",
+                        lambda func: "changed" if func.__module__ == "expressions" else original(func))
+    cached_function_values(0, 1, 0.5, "x", cache=cache)
+    cached_function_values(0, 1, 0.5, cache=cache)
+    assert cache.stats()["entries"] == 3
+
+
+def _writer(path, worker):
+    cache = ResultCache(path)
+    for i in range(20):
+        cache.put("w", {"worker": worker, "i": i}, [float(i)] * 10)
+        assert cache.get("w", {"worker": worker, "i": i}) is not None
+    cache.close()
+
+
+def test_multiprocess_writers(tmp_path):
+    """Одновременная запись из нескольких процессов"""
+    path = str(tmp_path / "shared.sqlite")
+    ResultCache(path).close()
+    processes = [multiprocessing.Process(target=_writer, args=(path, w)) for w in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+    assert all(process.exitcode == 0 for process in processes)
+    assert ResultCache(path).stats()["entries"] == 80
@@ -0,0 +1,141 @@
+"""
+Тесты HTTP-сервиса генераторов (localhost)
+"""
+
+import asyncio
+import json
+import numpy as np
+import pytest
+from generators import letter_combinations, function_generator, filter_long_cities
+from server import GeneratorServer
+
+
+async def _request(reader, writer, path, method="GET", body=b"", close=False):
+    """Один запрос в открытом соединении; возвращает (код, заголовки, тело)"""
+    headers = f"Host: localhost\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        headers += "Connection: close\r\n"
+    writer.write(f"{method} {path} HTTP/1.1\r\n{headers}\r\n".encode("utf-8") + body)
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    response_headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+    if response_headers.get("transfer-encoding") == "chunked":
+        data = b""
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            data += chunk[:-2]
+    else:
+        data = await reader.readexactly(int(response_headers["content-length"]))
+    return status, response_headers, data
+
+
+def _run(coro_factory, **options):
+    async def main():
+        async with GeneratorServer(port=0, **options) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            try:
+                return await coro_factory(server, reader, writer)
+            finally:
+                writer.close()
+    return asyncio.run(main())
+
+
+def test_keep_alive_multiple_requests():
+    """Несколько запросов в одном соединении"""
+    async def scenario(server, reader, writer):
+        status, headers, data = await _request(reader, writer, "/letters")
+        assert status == 200
+        assert headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in data.splitlines()] == list(letter_combinations())
+
+        status, _, data = await _request(reader, writer, "/function?a=0&b=3&step=1&format=binary")
+        assert status == 200
+        assert np.frombuffer(data, "<f8").tolist() == pytest.approx(list(function_generator(0, 3, 1)))
+
+        text = "Москва Казань Уфа Владивосток"
+        status, headers, data = await _request(reader, writer, "/cities", "POST", text.encode("utf-8"), close=True)
+        assert status == 200
+        assert headers["connection"] == "close"
+        assert [json.loads(line) for line in data.splitlines()] == list(filter_long_cities(text))
+    _run(scenario)
+
+
+def test_expression_and_errors():
+    """Ошибки параметров возвращаются до начала потока"""
+    async def scenario(server, reader, writer):
+        status, _, data = await _request(reader, writer, "/function?a=0&b=2&step=1&expression=x*x")
+        assert [float(v) for v in data.split()] == [0.0, 1.0, 4.0]
+        for path in ("/function?a=5&b=0", "/function?expression=y", "/letters?length=x",
+                     "/cities", "/letters?format=xml"):
+            status, _, data = await _request(reader, writer, path)
+            assert status == 400, path
+            assert "error" in json.loads(data)
+        status, _, _ = await _request(reader, writer, "/unknown")
+        assert status == 404
+    _run(scenario)
+
+
+def test_concurrency_limit():
+    """Запросы сверх лимита получают 503"""
+    async def scenario(server, reader, writer):
+        # Бесконечно длинный поток, который никто не читает, занимает единственный слот
+        writer.write(b"GET /letters?length=6 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        await asyncio.sleep(0.2)
+        reader2, writer2 = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            status, headers, _ = await _request(reader2, writer2, "/letters?count=1")
+            assert status == 503
+            assert headers["retry-after"] == "1"
+        finally:
+            writer2.close()
+    _run(scenario, max_concurrent=1)
+
+
+def test_handler_errors_release_slots():
+    """Ошибки обработчиков дают 400 и не занимают слоты навсегда"""
+    async def scenario(server, reader, writer):
+        bad_requests = [
+            ("/function?a=nan", "GET", b""),
+            ("/function?b=inf", "GET", b""),
+            ("/cities", "POST", "Москва Владивосток".encode("cp1251")),
+        ]
+        for path, method, body in bad_requests * 2:
+            status, _, data = await _request(reader, writer, path, method, body)
+            assert status == 400, path
+            assert "error" in json.loads(data)
+        assert server._active == 0
+        status, _, data = await _request(reader, writer, "/letters?count=2")
+        assert status == 200
+        assert [json.loads(line) for line in data.splitlines()] == ["aa", "ab"]
+    _run(scenario, max_concurrent=2)
+
+
+def test_oversized_parameters():
+    """Слишком большие пространство и число точек отклоняются с 400 без блокировки цикла событий"""
+    async def scenario(server, reader, writer):
+        other_reader, other_writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            for path in ["/letters?length=3000000", "/letters?alphabet=" + "".join(map(chr, range(0x400, 0x900))),
+                         "/function?a=0&b=1e6&step=1e-6"]:
+                results = await asyncio.wait_for(asyncio.gather(
+                    _request(reader, writer, path),
+                    _request(other_reader, other_writer, "/letters?count=2"),
+                ), timeout=5)
+                assert results[0][0] == 400, path
+                assert "error" in json.loads(results[0][2])
+                assert results[1][0] == 200
+        finally:
+            other_writer.close()
+    _run(scenario)
@@ -0,0 +1,35 @@
+"""
+Тесты записи таблиц значений функции
+"""
+
+import numpy as np
+import pytest
+from generators import GeneratorException
+from vectorized import function_values
+from storage import write_function_table, read_function_table
+
+
+@pytest.mark.parametrize("name", ["table.npy", "table.f64"])
+def test_write_and_read_roundtrip(tmp_path, name):
+    """Запись блоками и чтение без копирования"""
+    path = str(tmp_path / name)
+    count = write_function_table(path, -5, 7, 0.01, chunk_size=100)
+    table = read_function_table(path)
+    assert isinstance(table, np.memmap)
+    assert not table.flags.writeable
+    assert len(table) == count == 1201
+    np.testing.assert_array_equal(table, function_values(-5, 7, 0.01))
+    np.testing.assert_array_equal(table[100:110], function_values(-5, 7, 0.01)[100:110])
+
+
+def test_write_expression(tmp_path):
+    """Запись пользовательского выражения"""
+    path = str(tmp_path / "square.npy")
+    write_function_table(path, 0, 3, 1, expression="x ** 2")
+    np.testing.assert_array_equal(read_function_table(path), [0, 1, 4, 9])
+
+
+def test_invalid_format(tmp_path):
+    """Неизвестный формат"""
+    with pytest.raises(GeneratorException):
+        write_function_table(str(tmp_path / "t.bin"), 0, 1, 1, fmt="csv")
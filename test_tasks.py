@@ -0,0 +1,46 @@
+"""
+Тесты кооперативной отмены
+"""
+
+import threading
+import pytest
+from generators import letter_combinations, GeneratorException
+from tasks import CancelToken, TaskCancelled, cancellable
+
+
+def test_token_states():
+    """Состояния токена"""
+    token = CancelToken()
+    assert not token.cancelled
+    token.raise_if_cancelled()
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(TaskCancelled):
+        token.raise_if_cancelled()
+    assert issubclass(TaskCancelled, GeneratorException)
+
+
+def test_cancellable_passthrough():
+    """Без отмены элементы не меняются"""
+    token = CancelToken()
+    assert list(cancellable(letter_combinations(), token, 100)) == list(letter_combinations())
+
+
+def test_cancellable_stops_between_batches():
+    """Отмена из другого потока срабатывает на границе пакета"""
+    token = CancelToken()
+    seen = []
+
+    def endless():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    with pytest.raises(TaskCancelled):
+        for item in cancellable(endless(), token, check_interval=10):
+            seen.append(item)
+            if item == 25:
+                threading.Thread(target=token.cancel).start()
+                threading.Event().wait(0.01)
+    assert len(seen) == 30
@@ -0,0 +1,49 @@
+"""
+Тесты главного окна
+"""
+
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+from ui.main_window import GeneratorApp
+
+
+def rows(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_letters_rows_without_numbers(qtbot):
+    """Сочетания отображаются без номеров после многопоточного и обычного запуска"""
+    window = GeneratorApp()
+    qtbot.addWidget(window)
+    window.tabs.setCurrentIndex(0)
+
+    for use_threading in (True, False):
+        window.generate_letters(5, use_threading)
+        qtbot.waitUntil(lambda: not window.tasks["letters"].running)
+        assert rows(window.model_letters) == ["aa", "ab", "ac", "ad", "ae"]
+
+
+def test_cities_rows_from_task_result(qtbot, monkeypatch):
+    """Список городов берется из результата задачи, текст повторно не разбирается"""
+    import generators
+
+    window = GeneratorApp()
+    qtbot.addWidget(window)
+    window.tabs.setCurrentIndex(2)
+    window.input_cities.setText("Москва Казань Санкт-Петербург Уфа Владивосток")
+    window.check_live_cities.setChecked(False)
+    window.filter_cities()
+    qtbot.waitUntil(lambda: not window.tasks["cities"].running)
+    assert rows(window.model_cities) == ["1. Москва", "2. Казань", "3. Санкт-Петербург", "4. Владивосток"]
+
+    def rescan(*args):
+        raise AssertionError("повторный разбор текста")
+
+    monkeypatch.setattr(generators, "filter_long_cities", rescan)
+    window.display_cities_result({"count": 1, "first": ["Москва"], "longest": ["Москва"],
+                                  "lengths": {"mean": 6.0}, "cities": ["Москва"]})
+    assert rows(window.model_cities) == ["1. Москва"]
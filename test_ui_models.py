@@ -0,0 +1,82 @@
+"""
+Тесты ленивой модели списка
+"""
+
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+from ui.models import LazyListModel
+
+
+def record(signal):
+    """Аргументы синхронно отправленных сигналов"""
+    calls = []
+    signal.connect(lambda *args: calls.append(args))
+    return calls
+
+
+def rows(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_fetch_more_batches(qtbot):
+    """Итератор догружается пакетами до исчерпания"""
+    model = LazyListModel(batch_size=3)
+    model.set_iterator(range(7), lambda row, value: str(value))
+    assert model.rowCount() == 3 and model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 6 and model.canFetchMore()
+    inserted = record(model.rowsInserted)
+    model.fetchMore()
+    assert [args[1:] for args in inserted] == [(6, 6)]
+    assert rows(model) == [str(v) for v in range(7)]
+    assert not model.canFetchMore()
+
+
+def test_fetch_more_exact_multiple_and_limit(qtbot):
+    """Длина, кратная пакету: признак конца — пустой пакет; limit обрезает источник"""
+    model = LazyListModel(batch_size=3)
+    model.set_iterator(iter(range(6)))
+    model.fetchMore()
+    assert model.rowCount() == 6 and model.canFetchMore()
+    with qtbot.assertNotEmitted(model.rowsInserted):
+        model.fetchMore()
+    assert not model.canFetchMore()
+
+    model.set_iterator(range(100), limit=4)
+    model.fetchMore()
+    assert model.rowCount() == 4 and not model.canFetchMore()
+
+
+def test_fetch_error_signal(qtbot):
+    """Ошибка источника передается сигналом и останавливает догрузку"""
+    def failing():
+        yield 1
+        raise ValueError("сбой")
+
+    model = LazyListModel(batch_size=5)
+    errors = record(model.error)
+    model.set_iterator(failing())
+    assert errors == [("сбой",)]
+    assert not model.canFetchMore()
+
+
+def test_append_rows(qtbot):
+    """append_rows добавляет строки в режиме списка и игнорируется для последовательности"""
+    model = LazyListModel()
+    inserted = record(model.rowsInserted)
+    model.append_rows(["aa", "ab"])
+    assert [args[1:] for args in inserted] == [(0, 1)]
+    assert rows(model) == ["1. aa", "2. ab"]
+    with qtbot.assertNotEmitted(model.rowsInserted):
+        model.append_rows([])
+
+    model.set_sequence(range(10), lambda row, value: f"#{value}")
+    with qtbot.assertNotEmitted(model.rowsInserted):
+        model.append_rows(["x"])
+    assert model.rowCount() == 10
+    assert model.data(model.index(9)) == "#9"
+    assert not model.canFetchMore()
@@ -0,0 +1,41 @@
+"""
+Тесты графика функции
+"""
+
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+from generators import GeneratorException
+from lod import FunctionTileCache
+from ui.plot_widget import FunctionPlotWidget
+from ui.workers import TaskRunner
+
+
+def test_failed_tile_not_resubmitted(qtbot, monkeypatch):
+    """Тайл с ошибкой вычисляется один раз, ошибка передается сигналом"""
+    calls = []
+
+    def failing(self, level, index, token=None):
+        calls.append((level, index))
+        raise GeneratorException("ошибка тайла")
+
+    monkeypatch.setattr(FunctionTileCache, "compute_tile", failing)
+    runner = TaskRunner()
+    widget = FunctionPlotWidget(runner)
+    qtbot.addWidget(widget)
+    widget.resize(200, 100)
+    errors = []
+    widget.error.connect(errors.append)
+    widget.set_function(-5, 7, 0.01)
+    widget.show()
+
+    qtbot.waitUntil(lambda: bool(errors))
+    qtbot.wait(200)
+    runner.pool.waitForDone()
+    qtbot.wait(50)
+    assert len(calls) == len(set(calls)) == len(widget.failed)
+    assert errors and set(errors) == {"ошибка тайла"}
+    assert widget.error_message == "ошибка тайла"
@@ -0,0 +1,84 @@
+"""
+Тесты отправки прогресса и результатов из рабочего потока
+"""
+
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+import ui.workers
+from ui.workers import TaskReporter, TaskRunner, TaskSignals
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def reporter(monkeypatch, qtbot):
+    clock = Clock()
+    monkeypatch.setattr(ui.workers.time, "monotonic", clock)
+    signals = TaskSignals()
+    emitted = {"progress": [], "chunk": []}
+    signals.progress.connect(emitted["progress"].append)
+    signals.chunk.connect(emitted["chunk"].append)
+    return TaskReporter(signals), clock, emitted
+
+
+def test_progress_throttling(reporter):
+    """Прогресс: только при смене процента и не чаще EMIT_INTERVAL, 100% — всегда"""
+    reporter, clock, emitted = reporter
+    clock.now = 1.0
+    reporter.progress(1, 100)
+    reporter.progress(1, 100)
+    clock.now += TaskReporter.EMIT_INTERVAL / 2
+    reporter.progress(2, 100)
+    assert emitted["progress"] == [1]
+    clock.now += TaskReporter.EMIT_INTERVAL
+    reporter.progress(3, 100)
+    reporter.progress(100, 100)
+    assert emitted["progress"] == [1, 3, 100]
+    reporter.progress(5, 0)
+    assert emitted["progress"] == [1, 3, 100]
+
+
+def test_items_batching(reporter):
+    """Элементы отправляются пакетами по размеру или по времени, остаток — в flush"""
+    reporter, clock, emitted = reporter
+    reporter.items(list(range(10)))
+    assert emitted["chunk"] == []
+    reporter.items(list(range(TaskReporter.CHUNK_SIZE)))
+    assert [len(chunk) for chunk in emitted["chunk"]] == [TaskReporter.CHUNK_SIZE + 10]
+    reporter.items([1])
+    clock.now += TaskReporter.EMIT_INTERVAL
+    reporter.items([2])
+    assert emitted["chunk"][-1] == [1, 2]
+    reporter.items([3])
+    reporter.flush()
+    reporter.flush()
+    assert emitted["chunk"][-1] == [3] and len(emitted["chunk"]) == 3
+
+
+def test_runner_result_and_cancel(qtbot):
+    """Результат и отмена задачи в пуле"""
+    runner = TaskRunner()
+    handle = runner.create(lambda token, reporter, value: value * 2, 21)
+    with qtbot.waitSignal(handle.signals.result) as blocker:
+        runner.submit(handle)
+    assert blocker.args == [42]
+
+    def endless(token, reporter):
+        while True:
+            token.raise_if_cancelled()
+
+    handle = runner.create(endless)
+    with qtbot.waitSignal(handle.signals.cancelled, timeout=5000):
+        runner.submit(handle)
+        handle.cancel()
+    assert runner.shutdown()
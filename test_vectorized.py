@@ -0,0 +1,91 @@
+"""
+Тесты векторизованного генератора функции
+"""
+
+import numpy as np
+import pytest
+from generators import function_generator, GeneratorException
+from vectorized import (
+    function_values,
+    function_chunks,
+    function_point_count,
+    function_chunks_parallel,
+    function_values_shared,
+)
+
+
+@pytest.mark.parametrize("a, b, step", [(0, 1, 1), (1, 3, 1), (-5, 7, 0.01), (0, 100, 0.001)])
+def test_values_match_generator(a, b, step):
+    """Совпадение с поэлементным генератором"""
+    expected = list(function_generator(a, b, step))
+    values = function_values(a, b, step)
+    assert len(values) == len(expected) == function_point_count(a, b, step)
+    np.testing.assert_allclose(values, expected, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("a, b, step", [(0, 1000, 0.001), (0, 1e4, 0.01)])
+def test_values_match_generator_error_bound(a, b, step):
+    """10^6 точек: отличие от генератора в пределах n*eps*max|x|*max|f'(x)|"""
+    expected = np.fromiter(function_generator(a, b, step), dtype=np.float64)
+    values = function_values(a, b, step)
+    assert len(values) == len(expected) == 1_000_001
+    x_max = max(abs(a), abs(b))
+    derivative_max = 0.2 * x_max + 5
+    bound = len(values) * np.finfo(np.float64).eps * x_max * derivative_max
+    assert np.max(np.abs(values - expected)) <= bound
+
+
+def test_point_count_half_step_boundaries():
+    """Число точек совпадает с генератором, кроме границ в полшага (там ±1)"""
+    rng = np.random.default_rng(0)
+    assert len(list(function_generator(59.59, 75.44, 0.1))) - function_point_count(59.59, 75.44, 0.1) == 1
+    mismatches = 0
+    for _ in range(3000):
+        a = round(float(rng.uniform(-100, 100)), 2)
+        b = round(a + float(rng.uniform(0, 50)), 2)
+        difference = len(list(function_generator(a, b, 0.1))) - function_point_count(a, b, 0.1)
+        if difference:
+            mismatches += 1
+            assert abs(difference) == 1
+            assert abs((b - a) / 0.1 % 1 - 0.5) < 1e-6
+    assert mismatches > 0
+
+
+def test_chunks_concatenate_to_values():
+    """Блоки в сумме дают весь диапазон"""
+    chunks = list(function_chunks(-5, 7, 0.01, chunk_size=300))
+    assert [len(c) for c in chunks] == [300, 300, 300, 300, 1]
+    np.testing.assert_array_equal(np.concatenate(chunks), function_values(-5, 7, 0.01))
+
+
+def test_invalid_params():
+    """Неверные параметры"""
+    with pytest.raises(GeneratorException):
+        function_values(5, 0, 1)
+    with pytest.raises(GeneratorException):
+        function_values(0, 5, 0)
+    with pytest.raises(GeneratorException):
+        list(function_chunks(0, 5, 1, chunk_size=0))
+    for params in [(0, float("inf"), 1), (float("nan"), 1, 1), (0, 1, float("nan")), (0, 1, float("inf"))]:
+        with pytest.raises(GeneratorException):
+            function_point_count(*params)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_chunks_reproducible(workers):
+    """Результат не зависит от числа процессов"""
+    chunks = list(function_chunks_parallel(-5, 7, 0.001, chunk_size=1000, workers=workers))
+    assert [len(c) for c in chunks] == [len(c) for c in function_chunks(-5, 7, 0.001, 1000)]
+    np.testing.assert_array_equal(np.concatenate(chunks), function_values(-5, 7, 0.001))
+
+
+def test_shared_values():
+    """Запись шардов в разделяемую память"""
+    with function_values_shared(0, 10, 0.001, chunk_size=997, workers=2, expression="x * 2") as table:
+        np.testing.assert_array_equal(table.array, function_values(0, 10, 0.001, "x * 2"))
+
+
+def test_parallel_invalid_expression():
+    """Ошибка выражения до запуска процессов"""
+    with pytest.raises(GeneratorException):
+        list(function_chunks_parallel(0, 1, 0.1, workers=2, expression="y"))
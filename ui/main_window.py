@@ -4,58 +4,100 @@
 
 from PySide6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
-    QHBoxLayout, QPushButton, QTextEdit, QLineEdit, 
-    QLabel, QGroupBox, QProgressBar, QMessageBox
+    QHBoxLayout, QPushButton, QListView, QLineEdit, 
+    QLabel, QGroupBox, QProgressBar, QMessageBox, QCheckBox
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
+from itertools import islice
+from typing import Optional, Tuple
 import time
 
-from generators import (
-    letter_combinations, 
-    function_generator, 
-    filter_long_cities,
-    letter_combinations_threaded,
-    get_first_n_items
-)
+# NumPy, выражения, кэш результатов и модули вкладок загружаются при первом
+# использовании (при создании вкладки или запуске задачи), а не при открытии
+# окна; легкий модуль generators загружается сразу (ui.workers -> tasks)
+import instrumentation
+from ui.models import LazyListModel, value_formatter
+from ui.workers import TaskRunner
+
+
+FUNCTION_RANGE = (-5, 7, 0.01)
+# График строится по более частой сетке на том же отрезке (12 млн точек):
+# на экран попадают только min/max по столбцам пикселей (см. lod.py)
+PLOT_STEP = 1e-6
+BATCH_SIZE = 256
+LIVE_FILTER_DELAY_MS = 150
 
 
-class GenerationThread(QThread):
-    """Поток для генерации сочетаний букв"""
-    progress = Signal(int)
-    result = Signal(list)
-    error = Signal(str)
+def letters_task(token, reporter, count: int, use_threading: bool):
+    """Генерация сочетаний букв (выполняется в пуле потоков)"""
+    from generators import letter_combinations, letter_combinations_threaded
+    from pipeline import Stream
     
-    def __init__(self, count: int, use_threading: bool = False):
-        super().__init__()
-        self.count = count
-        self.use_threading = use_threading
+    if use_threading:
+        # Многопоточная генерация: упакованный результат передается в интерфейс
+        # одной ссылкой, строки создаются только для видимых строк списка
+        packed = letter_combinations_threaded(count)
+        reporter.progress(1, 1)
+        return packed
     
-    def run(self):
-        try:
-            if self.use_threading:
-                # Многопоточная генерация
-                for i in range(10):
-                    time.sleep(0.01)  # Имитация работы
-                    self.progress.emit((i + 1) * 10)
-                result = letter_combinations_threaded(self.count)
-            else:
-                # Однопоточная генерация
-                gen = letter_combinations()
-                result = []
-                for i in range(self.count):
-                    result.append(next(gen))
-                    self.progress.emit(int((i + 1) / self.count * 100))
-            
-            self.result.emit(result)
-            
-        except Exception as e:
-            self.error.emit(str(e))
+    # Однопоточная генерация
+    items = islice(letter_combinations(), count)
+    done = 0
+    for batch in Stream(items).batch(BATCH_SIZE):
+        token.raise_if_cancelled()
+        reporter.items(batch)
+        done += len(batch)
+        reporter.progress(done, count)
+
+
+def function_task(token, reporter, count: int, expression: str):
+    """Первые count значений функции и статистики по всему диапазону (выполняется в пуле потоков)"""
+    from aggregations import QuantileSketch, Summary, aggregate
+    from result_cache import cached_function_values
+    
+    # Таблица для фиксированного диапазона вкладки берется из постоянного кэша
+    # и вычисляется только при первом запуске с данным выражением
+    a, b, step = FUNCTION_RANGE
+
+    def progress(done: int, total: int) -> None:
+        token.raise_if_cancelled()
+        reporter.progress(done, total)
+
+    values = cached_function_values(a, b, step, expression, progress=progress, chunk_size=BATCH_SIZE)
+    token.raise_if_cancelled()
+    stats = aggregate(values.tolist(), summary=Summary(), median=QuantileSketch(quantiles=(0.5,)))
+    reporter.progress(1, 1)
+    return values[:count], stats
+
+
+def cities_summary_task(token, reporter, cities_text: str) -> dict:
+    """
+    Найденные города, их число, первые и самые длинные за один проход фильтра
+    (выполняется в пуле потоков)
+    """
+    from aggregations import Count, FirstK, Summary, TopK, aggregate
+    from generators import filter_long_cities
+    from tasks import cancellable
+    
+    # Список найденных городов передается в модель, чтобы интерфейс
+    # не разбирал текст повторно в своем потоке
+    cities = list(cancellable(filter_long_cities(cities_text), token))
+    summary = aggregate(cities, count=Count(), first=FirstK(3), longest=TopK(3, key=len), lengths=Summary(key=len))
+    summary["cities"] = cities
+    return summary
 
 
 class GeneratorApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, started_at: Optional[float] = None):
+        """
+        Args:
+            started_at: момент запуска процесса (time.perf_counter()) для замера
+                времени до появления окна
+        """
         super().__init__()
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.first_shown = False
         self.setWindowTitle("Генераторы Python - Вариант 2")
         self.setGeometry(100, 100, 900, 700)
         
@@ -79,33 +121,96 @@ class GeneratorApp(QMainWindow):
             QPushButton:hover {
                 background-color: #45a049;
             }
-            QTextEdit {
+            QListView {
                 font-family: 'Courier New';
                 font-size: 12px;
             }
         """)
         
+        self.task_runner = TaskRunner(parent=self)
+        self.tasks = {}
+        self.task_buttons = {}
+        self.task_controls = {}
+        self.letters_total = 0
+        
         self.init_ui()
-        self.generation_thread = None
+        self.init_status_bar()
     
     def init_ui(self):
-        """Инициализация интерфейса"""
-        tabs = QTabWidget()
-        
-        # Вкладка 1: Сочетания букв
-        tab1 = self.create_letters_tab()
-        
-        # Вкладка 2: Функция
-        tab2 = self.create_function_tab()
-        
-        # Вкладка 3: Города
-        tab3 = self.create_cities_tab()
-        
-        tabs.addTab(tab1, "🔤 Сочетания букв")
-        tabs.addTab(tab2, "📈 Функция")
-        tabs.addTab(tab3, "🏙️ Фильтр городов")
+        """Инициализация интерфейса: содержимое вкладок создается при первом открытии"""
+        self.tabs = QTabWidget()
+        self.tab_builders = [
+            ("letters", "🔤 Сочетания букв", self.create_letters_tab),
+            ("function", "📈 Функция", self.create_function_tab),
+            ("cities", "🏙️ Фильтр городов", self.create_cities_tab),
+        ]
+        self.built_tabs = set()
+        
+        for _, title, _ in self.tab_builders:
+            container = QWidget()
+            container_layout = QVBoxLayout()
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            container.setLayout(container_layout)
+            self.tabs.addTab(container, title)
+        
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.tabs.currentIndex())
+        
+        self.setCentralWidget(self.tabs)
+    
+    def ensure_tab(self, index: int):
+        """Создание содержимого вкладки при первом обращении"""
+        if index < 0 or index in self.built_tabs:
+            return
         
-        self.setCentralWidget(tabs)
+        name, _, builder = self.tab_builders[index]
+        started = time.perf_counter()
+        self.tabs.widget(index).layout().addWidget(builder())
+        self.built_tabs.add(index)
+        instrumentation.record_timing(f"startup.tab.{name}", time.perf_counter() - started)
+    
+    def showEvent(self, event):
+        """Замер времени до первого отображения окна"""
+        super().showEvent(event)
+        if not self.first_shown:
+            self.first_shown = True
+            QTimer.singleShot(0, self.record_first_window)
+    
+    def record_first_window(self):
+        """Сохранение времени запуска (после первой отрисовки окна)"""
+        elapsed = time.perf_counter() - self.started_at
+        instrumentation.record_timing("startup.first_window", elapsed)
+        self.statusBar().showMessage(f"Окно открыто за {elapsed * 1000:.0f} мс", 5000)
+    
+    def init_status_bar(self):
+        """Строка состояния с панелью статистики генераторов"""
+        self.check_instrumentation = QCheckBox("Статистика генераторов")
+        self.check_instrumentation.setChecked(instrumentation.is_enabled())
+        self.check_instrumentation.toggled.connect(self.toggle_instrumentation)
+        self.statusBar().addPermanentWidget(self.check_instrumentation)
+        
+        self.label_instrumentation = QLabel()
+        self.statusBar().addPermanentWidget(self.label_instrumentation, 1)
+        
+        self.instrumentation_timer = QTimer(self)
+        self.instrumentation_timer.setInterval(1000)
+        self.instrumentation_timer.timeout.connect(self.update_instrumentation)
+        self.toggle_instrumentation(instrumentation.is_enabled())
+    
+    def toggle_instrumentation(self, enabled: bool):
+        """Включение и выключение сбора статистики"""
+        if enabled:
+            instrumentation.enable()
+            self.instrumentation_timer.start()
+            self.update_instrumentation()
+        else:
+            instrumentation.disable()
+            self.instrumentation_timer.stop()
+            self.label_instrumentation.clear()
+    
+    def update_instrumentation(self):
+        """Обновление панели статистики"""
+        self.label_instrumentation.setText(instrumentation.format_summary())
     
     def create_letters_tab(self) -> QWidget:
         """Создание вкладки с сочетаниями букв"""
@@ -145,18 +250,21 @@ class GeneratorApp(QMainWindow):
         
         control_layout.addLayout(btn_layout)
         
-        # Прогресс-бар
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setVisible(False)
-        control_layout.addWidget(self.progress_bar)
+        # Прогресс-бар и отмена
+        self.progress_bar, self.btn_cancel_letters = self.create_task_controls(
+            "letters", control_layout, [self.btn_generate_50, self.btn_generate_all, self.btn_threaded]
+        )
         
         control_group.setLayout(control_layout)
         layout.addWidget(control_group)
         
         # Поле вывода
-        self.text_output_letters = QTextEdit()
-        self.text_output_letters.setReadOnly(True)
-        layout.addWidget(self.text_output_letters)
+        self.label_letters_summary = QLabel()
+        layout.addWidget(self.label_letters_summary)
+        
+        self.model_letters = LazyListModel()
+        self.model_letters.set_formatter(value_formatter)
+        layout.addWidget(self.create_result_view(self.model_letters))
         
         tab.setLayout(layout)
         return tab
@@ -167,19 +275,32 @@ class GeneratorApp(QMainWindow):
         layout = QVBoxLayout()
         
         # Заголовок
-        title = QLabel("Генератор значений функции f(x) = 0.1x² + 5x - 2")
+        title = QLabel("Генератор значений функции f(x)")
         title.setFont(QFont("Arial", 14, QFont.Bold))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
         # Описание
-        desc = QLabel("Диапазон: x ∈ [-5, 7], шаг: 0.01")
+        desc = QLabel("Диапазон: x ∈ [-5, 7], шаг: 0.01. По умолчанию f(x) = 0.1x² + 5x - 2; "
+                      "допустимы +, -, *, /, **, %, функции sin, cos, exp, log, sqrt и др., константы pi, e")
+        desc.setWordWrap(True)
         layout.addWidget(desc)
         
         # Группа управления
         control_group = QGroupBox("Параметры")
         control_layout = QVBoxLayout()
         
+        expr_layout = QHBoxLayout()
+        expr_layout.addWidget(QLabel("f(x) ="))
+        
+        from expressions import DEFAULT_EXPRESSION
+        
+        self.input_expression = QLineEdit(DEFAULT_EXPRESSION)
+        self.input_expression.setPlaceholderText("Например: sin(x) / (1 + x**2)")
+        expr_layout.addWidget(self.input_expression)
+        
+        control_layout.addLayout(expr_layout)
+        
         param_layout = QHBoxLayout()
         param_layout.addWidget(QLabel("Количество значений:"))
         
@@ -194,17 +315,37 @@ class GeneratorApp(QMainWindow):
         self.btn_generate_function.clicked.connect(self.generate_function_values)
         control_layout.addWidget(self.btn_generate_function)
         
+        self.progress_function, self.btn_cancel_function = self.create_task_controls(
+            "function", control_layout, [self.btn_generate_function]
+        )
+        
         control_group.setLayout(control_layout)
         layout.addWidget(control_group)
         
-        # Поле вывода
-        self.text_output_function = QTextEdit()
-        self.text_output_function.setReadOnly(True)
-        layout.addWidget(self.text_output_function)
+        # График и поле вывода
+        from ui.plot_widget import FunctionPlotWidget
+        
+        self.plot_function = FunctionPlotWidget(self.task_runner)
+        self.plot_function.setToolTip("Колесо мыши — масштаб, перетаскивание — сдвиг, двойной щелчок — весь диапазон")
+        self.plot_function.error.connect(
+            lambda message: self.statusBar().showMessage(f"Ошибка графика: {message}", 5000))
+        self.update_function_plot(DEFAULT_EXPRESSION)
+        layout.addWidget(self.plot_function, 2)
+        
+        self.label_function_stats = QLabel()
+        layout.addWidget(self.label_function_stats)
+        
+        self.model_function = LazyListModel()
+        layout.addWidget(self.create_result_view(self.model_function), 1)
         
         tab.setLayout(layout)
         return tab
     
+    def update_function_plot(self, expression: str):
+        """Перестроение графика для выражения"""
+        a, b, _ = FUNCTION_RANGE
+        self.plot_function.set_function(a, b, PLOT_STEP, expression)
+    
     def create_cities_tab(self) -> QWidget:
         """Создание вкладки с фильтром городов"""
         tab = QWidget()
@@ -228,9 +369,23 @@ class GeneratorApp(QMainWindow):
         
         self.input_cities = QLineEdit()
         self.input_cities.setPlaceholderText("Например: Москва Казань Санкт-Петербург Уфа Владивосток")
+        self.input_cities.setMaxLength(2 ** 31 - 1)  # вставка длинных списков без обрезки до 32767 символов
         self.input_cities.setText("Москва Казань Санкт-Петербург Уфа Владивосток Сочи")
         input_layout.addWidget(self.input_cities)
         
+        # Живой режим: после паузы в наборе разбирается только измененный участок
+        self.check_live_cities = QCheckBox("Обновлять при вводе")
+        self.check_live_cities.setChecked(True)
+        self.check_live_cities.toggled.connect(self.on_cities_text_changed)
+        input_layout.addWidget(self.check_live_cities)
+        
+        self.cities_filter = None
+        self.timer_live_cities = QTimer(self)
+        self.timer_live_cities.setSingleShot(True)
+        self.timer_live_cities.setInterval(LIVE_FILTER_DELAY_MS)
+        self.timer_live_cities.timeout.connect(self.update_live_cities)
+        self.input_cities.textChanged.connect(self.on_cities_text_changed)
+        
         input_group.setLayout(input_layout)
         layout.addWidget(input_group)
         
@@ -239,44 +394,112 @@ class GeneratorApp(QMainWindow):
         self.btn_filter_cities.clicked.connect(self.filter_cities)
         layout.addWidget(self.btn_filter_cities)
         
+        self.progress_cities, self.btn_cancel_cities = self.create_task_controls(
+            "cities", layout, [self.btn_filter_cities]
+        )
+        
         # Поле вывода
-        self.text_output_cities = QTextEdit()
-        self.text_output_cities.setReadOnly(True)
-        layout.addWidget(self.text_output_cities)
+        self.label_cities_summary = QLabel()
+        layout.addWidget(self.label_cities_summary)
+        
+        self.model_cities = LazyListModel()
+        layout.addWidget(self.create_result_view(self.model_cities))
         
         tab.setLayout(layout)
         return tab
     
+    def create_result_view(self, model: LazyListModel) -> QListView:
+        """Список результатов: строки запрашиваются у модели только для видимой области"""
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        view.setLayoutMode(QListView.Batched)
+        view.setBatchSize(model.batch_size)
+        return view
+    
+    def create_task_controls(self, name: str, layout, buttons: list) -> Tuple[QProgressBar, QPushButton]:
+        """Прогресс-бар и кнопка отмены для задачи вкладки"""
+        controls_layout = QHBoxLayout()
+        
+        progress_bar = QProgressBar()
+        progress_bar.setVisible(False)
+        controls_layout.addWidget(progress_bar)
+        
+        btn_cancel = QPushButton("Отмена")
+        btn_cancel.setVisible(False)
+        btn_cancel.clicked.connect(lambda: self.cancel_task(name))
+        controls_layout.addWidget(btn_cancel)
+        
+        layout.addLayout(controls_layout)
+        self.task_buttons[name] = buttons
+        self.task_controls[name] = (progress_bar, btn_cancel)
+        return progress_bar, btn_cancel
+    
+    def start_task(self, name: str, fn, *args, on_result=None, on_chunk=None) -> bool:
+        """Запуск задачи вкладки в пуле потоков (не более одной на вкладку)"""
+        handle = self.tasks.get(name)
+        if handle and handle.running:
+            return False
+        
+        # Блокировка кнопок
+        for button in self.task_buttons[name]:
+            button.setEnabled(False)
+        
+        # Показ прогресс-бара и кнопки отмены
+        progress_bar, btn_cancel = self.task_controls[name]
+        progress_bar.setValue(0)
+        progress_bar.setVisible(True)
+        btn_cancel.setEnabled(True)
+        btn_cancel.setVisible(True)
+        
+        handle = self.task_runner.create(fn, *args)
+        handle.signals.progress.connect(progress_bar.setValue)
+        if on_result is not None:
+            handle.signals.result.connect(on_result)
+        if on_chunk is not None:
+            handle.signals.chunk.connect(on_chunk)
+        handle.signals.error.connect(self.display_error)
+        handle.signals.cancelled.connect(lambda: self.statusBar().showMessage("Операция отменена", 3000))
+        handle.signals.finished.connect(lambda: self.on_task_finished(name))
+        self.tasks[name] = handle
+        self.task_runner.submit(handle)
+        return True
+    
+    def cancel_task(self, name: str):
+        """Запрос отмены задачи вкладки"""
+        handle = self.tasks.get(name)
+        if handle and handle.running:
+            handle.cancel()
+            self.task_controls[name][1].setEnabled(False)
+    
     def generate_letters(self, count: int, use_threading: bool):
         """Генерация сочетаний букв"""
-        if self.generation_thread and self.generation_thread.isRunning():
+        handle = self.tasks.get("letters")
+        if handle and handle.running:
             return
         
-        # Блокировка кнопок
-        self.btn_generate_50.setEnabled(False)
-        self.btn_generate_all.setEnabled(False)
-        self.btn_threaded.setEnabled(False)
-        
-        # Показ прогресс-бара
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        
-        # Создание потока
-        self.generation_thread = GenerationThread(count, use_threading)
-        self.generation_thread.progress.connect(self.progress_bar.setValue)
-        self.generation_thread.result.connect(self.display_letters_result)
-        self.generation_thread.error.connect(self.display_error)
-        self.generation_thread.finished.connect(self.on_generation_finished)
-        self.generation_thread.start()
-    
-    def display_letters_result(self, result):
-        """Отображение результата генерации букв"""
-        if len(result) <= 50:
-            text = "\n".join(result)
-        else:
-            text = "\n".join(result[:50]) + f"\n\n... и еще {len(result) - 50} сочетаний"
+        # Очистка предыдущего результата
+        self.letters_total = 0
+        self.label_letters_summary.clear()
+        self.model_letters.clear()
         
-        self.text_output_letters.setText(f"Всего сгенерировано: {len(result)} сочетаний\n\n{text}")
+        self.start_task("letters", letters_task, count, use_threading,
+                        on_chunk=self.display_letters_result,
+                        on_result=self.display_letters_packed)
+    
+    def display_letters_result(self, chunk):
+        """Отображение очередного пакета сочетаний букв"""
+        self.letters_total += len(chunk)
+        self.model_letters.append_rows(chunk)
+        self.label_letters_summary.setText(f"Всего сгенерировано: {self.letters_total} сочетаний")
+    
+    def display_letters_packed(self, packed):
+        """Отображение результата многопоточной генерации без копирования строк"""
+        if packed is None:
+            return
+        self.letters_total = len(packed)
+        self.model_letters.set_sequence(packed, value_formatter)
+        self.label_letters_summary.setText(f"Всего сгенерировано: {self.letters_total} сочетаний")
     
     def generate_function_values(self):
         """Генерация значений функции"""
@@ -285,21 +508,34 @@ class GeneratorApp(QMainWindow):
             if count <= 0:
                 raise ValueError("Количество должно быть положительным")
             
-            gen = function_generator(-5, 7, 0.01)
-            values = get_first_n_items(gen, count)
+            expression = self.input_expression.text().strip()
+            if not expression:
+                raise ValueError("Введите выражение f(x)")
             
-            # Форматирование вывода
-            formatted_values = []
-            for i, value in enumerate(values, 1):
-                formatted_values.append(f"{i:3d}. {value:10.4f}")
+            from expressions import compile_expression
             
-            self.text_output_function.setText("\n".join(formatted_values))
+            compile_expression(expression)  # проверка выражения до генерации
+            self.update_function_plot(expression)
+            
+            # Значения вычисляются в пуле потоков
+            self.start_task("function", function_task, count, expression,
+                            on_result=self.display_function_values)
             
         except ValueError as e:
             QMessageBox.warning(self, "Ошибка", f"Некорректный ввод: {e}")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка генерации: {e}")
     
+    def display_function_values(self, result):
+        """Отображение значений функции (строки форматируются только при отрисовке) и статистик"""
+        values, stats = result
+        self.model_function.set_sequence(values, lambda row, value: f"{row + 1:3d}. {value:10.4f}")
+        summary = stats["summary"]
+        self.label_function_stats.setText(
+            f"На всем диапазоне: min {summary['min']:.4f}, max {summary['max']:.4f}, "
+            f"среднее {summary['mean']:.4f}, медиана ≈ {stats['median'][0.5]:.4f}"
+        )
+    
     def filter_cities(self):
         """Фильтрация городов"""
         try:
@@ -307,54 +543,68 @@ class GeneratorApp(QMainWindow):
             if not cities_text:
                 raise ValueError("Введите названия городов")
             
-            filtered = filter_long_cities(cities_text)
-            cities_list = list(filtered)
-            
-            if not cities_list:
-                self.text_output_cities.setText("Нет городов длиной более 5 символов")
-                return
-            
-            # Получаем первые три города
-            result = []
-            filtered = filter_long_cities(cities_text)  # Создаем новый генератор
-            for i in range(min(3, len(cities_list))):
-                try:
-                    result.append(next(filtered))
-                except StopIteration:
-                    break
-            
-            output = f"Найдено городов > 5 символов: {len(cities_list)}\n\n"
-            output += "Первые три города:\n"
-            output += "\n".join([f"{i+1}. {city}" for i, city in enumerate(result)])
-            
-            self.text_output_cities.setText(output)
+            self.start_task("cities", cities_summary_task, cities_text,
+                            on_result=self.display_cities_result)
             
         except ValueError as e:
             QMessageBox.warning(self, "Ошибка", str(e))
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Ошибка фильтрации: {e}")
     
-    def on_generation_finished(self):
-        """Завершение генерации"""
-        # Разблокировка кнопок
-        self.btn_generate_50.setEnabled(True)
-        self.btn_generate_all.setEnabled(True)
-        self.btn_threaded.setEnabled(True)
+    def display_cities_result(self, summary: dict):
+        """Отображение результата фильтрации городов"""
+        count = summary["count"]
+        if not count:
+            self.label_cities_summary.setText("Нет городов длиной более 5 символов")
+            self.model_cities.clear()
+            return
+        
+        self.label_cities_summary.setText(
+            f"Найдено городов > 5 символов: {count} (первые: {', '.join(summary['first'])}; "
+            f"самые длинные: {', '.join(summary['longest'])}; "
+            f"средняя длина: {summary['lengths']['mean']:.1f})"
+        )
+        self.model_cities.set_sequence(summary["cities"])
+    
+    def on_cities_text_changed(self, *args):
+        """Перезапуск отложенного обновления при каждом изменении текста"""
+        if self.check_live_cities.isChecked():
+            self.timer_live_cities.start()
+    
+    def update_live_cities(self):
+        """Инкрементальное обновление результата по текущему тексту"""
+        from live_filter import IncrementalCityFilter
+        
+        if self.cities_filter is None:
+            self.cities_filter = IncrementalCityFilter()
+        self.cities_filter.set_text(self.input_cities.text())
+        
+        count = self.cities_filter.count
+        if not count:
+            self.label_cities_summary.setText("Нет городов длиной более 5 символов")
+            self.model_cities.clear()
+            return
         
-        # Скрытие прогресс-бара
-        self.progress_bar.setVisible(False)
+        first = ", ".join(self.cities_filter.first(3))
+        self.label_cities_summary.setText(f"Найдено городов > 5 символов: {count} (первые: {first})")
+        self.model_cities.set_iterator(self.cities_filter.iter_matches())
+    
+    def on_task_finished(self, name: str):
+        """Завершение задачи вкладки"""
+        # Разблокировка кнопок
+        for button in self.task_buttons[name]:
+            button.setEnabled(True)
         
-        # Очистка потока
-        self.generation_thread = None
+        # Скрытие прогресс-бара и кнопки отмены
+        progress_bar, btn_cancel = self.task_controls[name]
+        progress_bar.setVisible(False)
+        btn_cancel.setVisible(False)
     
     def display_error(self, error_msg):
         """Отображение ошибки"""
         QMessageBox.critical(self, "Ошибка", error_msg)
-        self.on_generation_finished()
     
     def closeEvent(self, event):
-        """Обработка закрытия окна"""
-        if self.generation_thread and self.generation_thread.isRunning():
-            self.generation_thread.terminate()
-            self.generation_thread.wait()
-        event.accept()
\ No newline at end of file
+        """Обработка закрытия окна: отмена задач и ожидание их штатного завершения"""
+        self.task_runner.shutdown()
+        event.accept()
@@ -0,0 +1,123 @@
+"""
+Модели данных для ленивого отображения больших результатов
+"""
+
+from itertools import islice
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+
+
+def default_formatter(row: int, value: Any) -> str:
+    """Форматирование строки по умолчанию: номер и значение"""
+    return f"{row + 1}. {value}"
+
+
+def value_formatter(row: int, value: Any) -> str:
+    """Форматирование строки без номера: только значение"""
+    return value
+
+
+class LazyListModel(QAbstractListModel):
+    """
+    Модель списка, которая не строит весь текст результата заранее.
+
+    Два режима источника:
+    - последовательность с произвольным доступом (CombinationSpace, массив
+      NumPy, memmap): строки не хранятся, rowCount равен длине, текст
+      строки формируется только при отрисовке;
+    - итератор/генератор: элементы догружаются пакетами через
+      canFetchMore/fetchMore по мере прокрутки.
+
+    Кроме того, строки можно добавлять извне через append_rows
+    (например, из сигналов рабочего потока).
+    """
+
+    error = Signal(str)
+
+    def __init__(self, batch_size: int = 1000, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self._formatter: Callable[[int, Any], str] = default_formatter
+        self._sequence: Optional[Sequence] = None
+        self._rows: list = []
+        self._iterator = None
+
+    def clear(self) -> None:
+        """Очистка модели"""
+        self.beginResetModel()
+        self._sequence = None
+        self._rows = []
+        self._iterator = None
+        self.endResetModel()
+
+    def set_sequence(self, sequence: Sequence,
+                     formatter: Optional[Callable[[int, Any], str]] = None) -> None:
+        """Источник с произвольным доступом (строки не копируются)"""
+        self.beginResetModel()
+        self._formatter = formatter or default_formatter
+        self._sequence = sequence
+        self._rows = []
+        self._iterator = None
+        self.endResetModel()
+
+    def set_iterator(self, iterable: Iterable, formatter: Optional[Callable[[int, Any], str]] = None,
+                     limit: Optional[int] = None) -> None:
+        """Источник-генератор; первые batch_size строк загружаются сразу"""
+        self.beginResetModel()
+        self._formatter = formatter or default_formatter
+        self._sequence = None
+        self._rows = []
+        iterator = iter(iterable)
+        self._iterator = islice(iterator, limit) if limit is not None else iterator
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_formatter(self, formatter: Optional[Callable[[int, Any], str]]) -> None:
+        self._formatter = formatter or default_formatter
+
+    def append_rows(self, rows: list) -> None:
+        """Добавление готовых строк в конец"""
+        if not rows or self._sequence is not None:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._sequence is not None:
+            return len(self._sequence)
+        return len(self._rows)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._iterator is not None
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid() or self._iterator is None:
+            return
+        try:
+            batch = list(islice(self._iterator, self.batch_size))
+        except Exception as e:
+            self._iterator = None
+            self.error.emit(str(e))
+            return
+        if len(batch) < self.batch_size:
+            self._iterator = None
+        self.append_rows(batch)
+
+    def value(self, row: int) -> Any:
+        """Исходное значение строки"""
+        if self._sequence is not None:
+            return self._sequence[row]
+        return self._rows[row]
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = index.row()
+        if not 0 <= row < self.rowCount():
+            return None
+        return self._formatter(row, self.value(row))
@@ -0,0 +1,181 @@
+"""
+График функции с адаптивной детализацией
+"""
+
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+from PySide6.QtCore import QPointF, Qt, Signal
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QWidget
+
+from lod import FunctionTileCache
+from ui.workers import TaskHandle, TaskRunner
+
+
+ZOOM_FACTOR = 1.25
+
+
+def tile_task(token, reporter, tiles: FunctionTileCache, level: int, index: int) -> Tuple[int, int]:
+    """Вычисление одного тайла (выполняется в пуле потоков)"""
+    tiles.compute_tile(level, index, token)
+    return level, index
+
+
+class FunctionPlotWidget(QWidget):
+    """
+    График f(x), который запрашивает только нужные для отрисовки точки.
+
+    На каждый столбец пикселей рисуется отрезок от минимума до максимума
+    функции в этом столбце (см. lod.FunctionTileCache). Отрисовка берет
+    только готовые тайлы: недостающие заменяются более грубыми из кэша
+    и вычисляются по одному в пуле потоков, после чего график
+    перерисовывается. Тайл, вычисление которого завершилось ошибкой,
+    больше не запрашивается (до смены функции), а ошибка передается
+    сигналом error и выводится на графике. Колесо мыши — масштаб,
+    перетаскивание — сдвиг, двойной щелчок — исходный масштаб.
+    """
+
+    error = Signal(str)
+
+    def __init__(self, task_runner: TaskRunner, parent=None):
+        super().__init__(parent)
+        self.task_runner = task_runner
+        self.tiles: Optional[FunctionTileCache] = None
+        self.view = (0.0, 1.0)
+        self.missing: List[Tuple[int, int]] = []
+        self.failed: Set[Tuple[int, int]] = set()
+        self.error_message: Optional[str] = None
+        self.handle: Optional[TaskHandle] = None
+        self.drag_x: Optional[float] = None
+        self.setMinimumHeight(220)
+        self.setMouseTracking(False)
+
+    def set_function(self, a: float, b: float, step: float, expression: Optional[str] = None):
+        """Новая функция и диапазон; вид сбрасывается на весь диапазон"""
+        self.cancel_refine()
+        self.tiles = FunctionTileCache(a, b, step, expression)
+        self.failed = set()
+        self.error_message = None
+        self.view = (float(a), float(b))
+        self.update()
+
+    def set_view(self, x0: float, x1: float):
+        """Видимый диапазон по x (ограничен диапазоном функции)"""
+        if self.tiles is None:
+            return
+        a, b = self.tiles.a, self.tiles.b
+        span = min(max(x1 - x0, self.tiles.step * 4), b - a)
+        x0 = min(max(x0, a), b - span)
+        self.view = (x0, x0 + span)
+        self.cancel_refine()
+        self.update()
+
+    def cancel_refine(self):
+        """Отмена вычисления тайла для устаревшего вида"""
+        if self.handle is not None and self.handle.running:
+            self.handle.cancel()
+        self.handle = None
+
+    def refine(self):
+        """Запуск вычисления следующего недостающего тайла (кроме тайлов с ошибкой)"""
+        if self.tiles is None:
+            return
+        if self.handle is not None and self.handle.running:
+            return
+        pending = [tile for tile in self.missing if tile not in self.failed]
+        if not pending:
+            return
+        level, index = pending[0]
+        handle = self.task_runner.create(tile_task, self.tiles, level, index)
+        handle.signals.error.connect(lambda message: self.tile_failed(level, index, message))
+        handle.signals.finished.connect(self.update)
+        self.handle = self.task_runner.submit(handle)
+
+    def tile_failed(self, level: int, index: int, message: str):
+        """Ошибка вычисления тайла: тайл исключается из запросов, ошибка передается сигналом"""
+        self.failed.add((level, index))
+        self.error_message = message
+        self.error.emit(message)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        width = self.width()
+        if self.tiles is None or width <= 0:
+            return
+
+        x0, x1 = self.view
+        xs, mins, maxs, self.missing = self.tiles.query(x0, x1, width, compute=False)
+        if self.missing:
+            self.refine()
+        filled = ~np.isnan(mins) & ~np.isnan(maxs)
+        if not filled.any():
+            text = f"Ошибка: {self.error_message}" if self.error_message else "Вычисление…"
+            painter.drawText(self.rect(), Qt.AlignCenter, text)
+            return
+
+        y0 = float(np.min(mins[filled]))
+        y1 = float(np.max(maxs[filled]))
+        if y1 - y0 < 1e-12:
+            y0, y1 = y0 - 1, y1 + 1
+        margin = (y1 - y0) * 0.05
+        y0, y1 = y0 - margin, y1 + margin
+        height = self.height()
+
+        def to_y(value):
+            return (y1 - value) / (y1 - y0) * height
+
+        # Оси, если попадают в окно
+        painter.setPen(QPen(self.palette().mid().color()))
+        if y0 < 0 < y1:
+            painter.drawLine(QPointF(0, to_y(0)), QPointF(width, to_y(0)))
+        if x0 < 0 < x1:
+            axis_x = -x0 / (x1 - x0) * width
+            painter.drawLine(QPointF(axis_x, 0), QPointF(axis_x, height))
+
+        # Отрезок min..max в каждом столбце и соединение соседних столбцов
+        columns = np.flatnonzero(filled)
+        top = to_y(maxs[columns])
+        bottom = to_y(mins[columns])
+        path = QPainterPath()
+        path.moveTo(float(columns[0]) + 0.5, float(bottom[0]))
+        for column, y_top, y_bottom in zip(columns.tolist(), top.tolist(), bottom.tolist()):
+            x = column + 0.5
+            path.lineTo(x, y_bottom)
+            path.lineTo(x, y_top)
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(QPen(QColor(30, 110, 200), 1))
+        painter.drawPath(path)
+
+        painter.setPen(QPen(self.palette().text().color()))
+        painter.drawText(4, 14, f"x ∈ [{x0:.6g}, {x1:.6g}]  f ∈ [{y0 + margin:.6g}, {y1 - margin:.6g}]")
+        if self.error_message:
+            painter.drawText(4, 30, f"Ошибка: {self.error_message}")
+
+    def wheelEvent(self, event):
+        if self.tiles is None:
+            return
+        x0, x1 = self.view
+        factor = 1 / ZOOM_FACTOR if event.angleDelta().y() > 0 else ZOOM_FACTOR
+        anchor = x0 + event.position().x() / max(self.width(), 1) * (x1 - x0)
+        self.set_view(anchor - (anchor - x0) * factor, anchor + (x1 - anchor) * factor)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_x = event.position().x()
+
+    def mouseMoveEvent(self, event):
+        if self.drag_x is None or self.tiles is None:
+            return
+        x0, x1 = self.view
+        shift = (self.drag_x - event.position().x()) / max(self.width(), 1) * (x1 - x0)
+        self.drag_x = event.position().x()
+        self.set_view(x0 + shift, x1 + shift)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_x = None
+
+    def mouseDoubleClickEvent(self, event):
+        if self.tiles is not None:
+            self.set_view(self.tiles.a, self.tiles.b)
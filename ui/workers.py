@@ -0,0 +1,153 @@
+"""
+Выполнение задач вкладок в пуле потоков с кооперативной отменой
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from tasks import CancelToken, TaskCancelled
+
+
+class TaskSignals(QObject):
+    """Сигналы задачи (доставляются в поток интерфейса через очередь событий)"""
+    progress = Signal(int)
+    chunk = Signal(list)
+    result = Signal(object)
+    error = Signal(str)
+    cancelled = Signal()
+    finished = Signal()
+
+
+class TaskReporter:
+    """
+    Отправка прогресса и промежуточных результатов из рабочего потока.
+
+    Сигналы отправляются не чаще, чем раз в CHUNK_SIZE элементов
+    или EMIT_INTERVAL секунд, чтобы не переполнять очередь событий Qt.
+    """
+
+    CHUNK_SIZE = 10000
+    EMIT_INTERVAL = 0.05
+
+    def __init__(self, signals: TaskSignals):
+        self._signals = signals
+        self._pending = []
+        self._last_chunk = time.monotonic()
+        self._last_progress = 0.0
+        self._percent = -1
+
+    def progress(self, done: int, total: int) -> None:
+        """Прогресс done из total (сигнал — только при изменении процента)"""
+        percent = min(int(done / total * 100), 100) if total > 0 else 100
+        if percent == self._percent:
+            return
+        now = time.monotonic()
+        if percent < 100 and now - self._last_progress < self.EMIT_INTERVAL:
+            return
+        self._percent = percent
+        self._last_progress = now
+        self._signals.progress.emit(percent)
+
+    def items(self, items: list) -> None:
+        """Промежуточные результаты; передаются в интерфейс пакетами"""
+        self._pending.extend(items)
+        now = time.monotonic()
+        if len(self._pending) >= self.CHUNK_SIZE or now - self._last_chunk >= self.EMIT_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Отправка накопленных результатов"""
+        if self._pending:
+            self._signals.chunk.emit(self._pending)
+            self._pending = []
+        self._last_chunk = time.monotonic()
+
+
+class Task(QRunnable):
+    """
+    Задача для QThreadPool.
+
+    Функция вызывается как fn(token, reporter, *args); она должна
+    периодически вызывать token.raise_if_cancelled(). Возвращаемое
+    значение передается сигналом result.
+    """
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, token: CancelToken, signals: TaskSignals):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.token = token
+        self.signals = signals
+
+    def run(self):
+        reporter = TaskReporter(self.signals)
+        try:
+            result = self.fn(self.token, reporter, *self.args)
+            self.token.raise_if_cancelled()
+            reporter.flush()
+            self.signals.result.emit(result)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskHandle:
+    """Задача пула: сигналы и отмена"""
+
+    def __init__(self, signals: TaskSignals, token: CancelToken):
+        self.signals = signals
+        self.token = token
+        self.task = None
+        self.running = False
+        signals.finished.connect(self._on_finished)
+
+    def _on_finished(self):
+        self.running = False
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+
+class TaskRunner(QObject):
+    """Пул потоков для задач всех вкладок"""
+
+    def __init__(self, max_threads: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._handles = []
+
+    def create(self, fn: Callable[..., Any], *args) -> TaskHandle:
+        """
+        Подготовка задачи fn(token, reporter, *args) без запуска.
+
+        Сигналы нужно подключить до submit(), иначе быстрая задача может
+        завершиться раньше, чем к ним подключатся обработчики.
+        """
+        handle = TaskHandle(TaskSignals(), CancelToken())
+        handle.task = Task(fn, args, handle.token, handle.signals)
+        return handle
+
+    def submit(self, handle: TaskHandle) -> TaskHandle:
+        """Запуск подготовленной задачи в пуле"""
+        self._handles = [h for h in self._handles if h.running]
+        self._handles.append(handle)
+        handle.running = True
+        self.pool.start(handle.task)
+        handle.task = None
+        return handle
+
+    def cancel_all(self) -> None:
+        for handle in self._handles:
+            handle.cancel()
+
+    def shutdown(self, timeout_ms: int = 5000) -> bool:
+        """Отмена всех задач и ожидание их завершения"""
+        self.cancel_all()
+        return self.pool.waitForDone(timeout_ms)
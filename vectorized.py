@@ -0,0 +1,257 @@
+"""
+Векторизованные (NumPy) версии генератора значений функции
+"""
+
+import math
+from multiprocessing import shared_memory
+from typing import Generator, List, Optional, Tuple
+
+import numpy as np
+
+from generators import GeneratorException
+from parallel import ordered_map, resolve_workers
+
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _validate_range(a: float, b: float, step: float) -> None:
+    """Проверка параметров диапазона (те же правила, что у function_generator)"""
+    if not all(map(math.isfinite, (a, b, step))):
+        raise GeneratorException("Некорректные параметры: a, b и шаг должны быть конечными числами")
+    if a > b:
+        raise GeneratorException("Некорректные параметры: Начальное значение a должно быть меньше или равно b")
+    if step <= 0:
+        raise GeneratorException("Некорректные параметры: Шаг должен быть положительным")
+
+
+def function_point_count(a: float, b: float, step: float = 0.01) -> int:
+    """
+    Количество точек x = a + i*step на отрезке [a, b].
+
+    Граница включается с допуском в половину шага, как в function_generator.
+    Генератор сравнивает с b + step/2 накопленный x, а здесь (b - a)/step
+    округляется до целого, поэтому, когда (b - a)/step ровно на полшага
+    от целого (например, (59.59, 75.44, 0.1)), число точек может
+    отличаться от генератора на единицу в любую сторону.
+    """
+    _validate_range(a, b, step)
+    return int(np.floor((b - a) / step + 0.5)) + 1
+
+
+def function_x(a: float, step: float, start: int, stop: int) -> np.ndarray:
+    """Значения x для индексов [start, stop): x вычисляется от индекса, без накопления"""
+    x = np.arange(start, stop, dtype=np.float64)
+    x *= step
+    x += a
+    return x
+
+
+def evaluate_function(x: np.ndarray) -> np.ndarray:
+    """
+    f(x) = 0.1*x^2 + 5*x - 2 для массива x.
+
+    Схема Горнера: (0.1*x + 5)*x - 2, без лишних временных массивов.
+    """
+    y = x * 0.1
+    y += 5
+    y *= x
+    y -= 2
+    return y
+
+
+def _kernel(expression: Optional[str]):
+    """Векторное ядро: f(x) по умолчанию или скомпилированное выражение"""
+    if expression is None:
+        return evaluate_function
+    from expressions import compile_expression
+    return compile_expression(expression).vector
+
+
+def function_values(a: float, b: float, step: float = 0.01,
+                    expression: Optional[str] = None) -> np.ndarray:
+    """
+    Все значения функции на [a, b] одним массивом.
+
+    Значения совпадают с function_generator(a, b, step) по количеству точек
+    (кроме диапазонов, где (b - a)/step ровно на полшага от целого, — там
+    возможно расхождение на одну точку, см. function_point_count),
+    а по величине — с точностью до погрешности накопления x в генераторе.
+    Там x получается n сложениями, и его ошибка растет до ~n*eps*|x|,
+    поэтому отличие не превышает n * eps * max|x| * max|f'(x)|
+    (eps = 2.2e-16); например, ~5e-5 для (0, 1000, 0.001) и ~5e-3 для
+    (0, 1e4, 0.01), по 10^6 точек. Значения здесь точнее, так как x = a + i*step.
+
+    Args:
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        expression: пользовательское выражение от x (см. expressions.py)
+
+    Returns:
+        Массив float64
+    """
+    kernel = _kernel(expression)
+    count = function_point_count(a, b, step)
+    return kernel(function_x(a, step, 0, count))
+
+
+def function_chunks(a: float, b: float, step: float = 0.01,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    expression: Optional[str] = None) -> Generator[np.ndarray, None, None]:
+    """
+    Значения функции на [a, b] блоками фиксированного размера.
+
+    Args:
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        chunk_size: количество точек в блоке (последний блок может быть короче)
+        expression: пользовательское выражение от x (см. expressions.py)
+
+    Yields:
+        Массивы float64 длиной не более chunk_size
+    """
+    if chunk_size <= 0:
+        raise GeneratorException("Размер блока должен быть положительным")
+    kernel = _kernel(expression)
+    count = function_point_count(a, b, step)
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        yield kernel(function_x(a, step, start, stop))
+
+
+def _shard_bounds(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Детерминированное разбиение индексов [0, count) на шарды"""
+    if chunk_size <= 0:
+        raise GeneratorException("Размер блока должен быть положительным")
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _evaluate_shard(a: float, step: float, start: int, stop: int,
+                    expression: Optional[str]) -> np.ndarray:
+    """Вычисление одного шарда (выполняется в процессе-исполнителе)"""
+    return _kernel(expression)(function_x(a, step, start, stop))
+
+
+def function_chunks_parallel(a: float, b: float, step: float = 0.01,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             workers: Optional[int] = None,
+                             expression: Optional[str] = None) -> Generator[np.ndarray, None, None]:
+    """
+    Значения функции на [a, b], вычисляемые шардами в пуле процессов.
+
+    Шард — это диапазон индексов [start, stop), x = a + i*step вычисляется
+    от индекса, поэтому результат побитово совпадает с function_chunks
+    при любом числе процессов. Блоки отдаются строго по порядку; в работе
+    одновременно не больше 2*workers шардов, чтобы медленный потребитель
+    не накапливал готовые результаты в памяти.
+
+    Args:
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        chunk_size: количество точек в шарде
+        workers: число процессов (по умолчанию os.cpu_count())
+        expression: пользовательское выражение от x
+
+    Yields:
+        Массивы float64 в порядке возрастания x
+    """
+    count = function_point_count(a, b, step)
+    bounds = _shard_bounds(count, chunk_size)
+    workers = resolve_workers(workers)
+    if expression is not None:
+        from expressions import normalize_expression
+        normalize_expression(expression)  # ошибки выражения — до запуска процессов
+
+    arguments = [(a, step, start, stop, expression) for start, stop in bounds]
+    yield from ordered_map(_evaluate_shard, arguments, workers)
+
+
+def _fill_shard(name: str, count: int, a: float, step: float, start: int, stop: int,
+                expression: Optional[str]) -> None:
+    """Запись шарда прямо в общий буфер (выполняется в процессе-исполнителе)"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        target = np.ndarray((count,), dtype=np.float64, buffer=shm.buf)
+        target[start:stop] = _evaluate_shard(a, step, start, stop, expression)
+        del target
+    finally:
+        shm.close()
+
+
+class SharedFunctionTable:
+    """
+    Таблица значений функции в разделяемой памяти.
+
+    Владелец освобождает память через close() или блок with.
+    """
+
+    __slots__ = ("shm", "array")
+
+    def __init__(self, count: int):
+        self.shm = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+        self.array = np.ndarray((count,), dtype=np.float64, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        """Освобождение разделяемой памяти"""
+        if self.array is None:
+            return
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedFunctionTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def function_values_shared(a: float, b: float, step: float = 0.01,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           workers: Optional[int] = None,
+                           expression: Optional[str] = None) -> SharedFunctionTable:
+    """
+    Вычисление значений функции на [a, b] в заранее выделенную разделяемую память.
+
+    Процессы пишут каждый свой шард прямо в общий буфер, без пересылки
+    результатов через pickle.
+
+    Args:
+        a: начальное значение x
+        b: конечное значение x
+        step: шаг изменения x
+        chunk_size: количество точек в шарде
+        workers: число процессов (по умолчанию os.cpu_count())
+        expression: пользовательское выражение от x
+
+    Returns:
+        SharedFunctionTable; массив значений — в атрибуте array
+    """
+    count = function_point_count(a, b, step)
+    bounds = _shard_bounds(count, chunk_size)
+    workers = resolve_workers(workers)
+    if expression is not None:
+        from expressions import normalize_expression
+        normalize_expression(expression)
+
+    table = SharedFunctionTable(count)
+    try:
+        if workers == 1 or len(bounds) == 1:
+            for start, stop in bounds:
+                table.array[start:stop] = _evaluate_shard(a, step, start, stop, expression)
+            return table
+
+        arguments = [(table.name, count, a, step, start, stop, expression) for start, stop in bounds]
+        for _ in ordered_map(_fill_shard, arguments, workers):
+            pass
+        return table
+    except BaseException:
+        table.close()
+        raise